@@ -0,0 +1,4 @@
+"""
+Benchmarks for the market data bot. Run from the repository root, e.g.
+python -m benchmarks.startup
+"""
@@ -0,0 +1,159 @@
+"""
+Offline end-to-end benchmark of main() against local stand-ins
+
+Every upstream (CryptoCompare, VCB, SJC, vnstock quotes and the Telegram Bot
+API) is replaced by a stub with configurable latency, error rate and payload
+size, so runs are repeatable and never touch live services. Each watchlist
+size runs in a fresh interpreter because configuration is read at import.
+
+Usage:
+    python -m benchmarks.full_run
+    python -m benchmarks.full_run --sizes 5,100,1000 --latency-ms 80 --error-rate 0.02
+    python -m benchmarks.full_run --sizes 100 --repeat 3 --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_child(args):
+    """Benchmark one watchlist size inside this (fresh) interpreter"""
+    from .stubs import StubProfile, StubServer, install_fake_vnstock
+
+    def profile(scale: float = 1.0):
+        return StubProfile(
+            latency_ms=args.latency_ms * scale,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            payload_bytes=args.payload_bytes
+        )
+
+    server = StubServer(crypto=profile(), telegram=profile()).start()
+    vnstock_calls = install_fake_vnstock(history=profile(), board=profile(), vcb=profile(), sjc=profile())
+
+    size = args.size
+    data_dir = tempfile.mkdtemp(prefix='bench-')
+    os.environ.update({
+        'STOCK_PRICE': 'true', 'VNINDEX': 'true', 'GOLD_PRICE': 'true',
+        'EXCHANGE_RATE': 'true', 'CRYPTO_PRICE': 'true',
+        'STOCK': ','.join(f"S{i:04d}" for i in range(size)),
+        'CRYPTO': ','.join(f"C{i:04d}" for i in range(size)),
+        'EXCHANGE': 'USD,EUR,JPY',
+        'TELEGRAM_ENABLED': 'true' if not args.no_telegram else 'false',
+        'TOKEN': '123:stub', 'CHAT_ID': '1001',
+        'CRYPTOCOMPARE_URL': server.url,
+        'TELEGRAM_API_URL': f"{server.url}/bot",
+        'DATA_DIR': data_dir,
+        'RUN_MODE': 'once',
+        'HTTP_SERVER_ENABLED': 'false',
+    })
+
+    import main
+    from services.core.data_collector import DataCollector
+
+    stages = {}
+
+    def timed(name, func):
+        def wrapper(*a, **kw):
+            start = time.perf_counter()
+            try:
+                return func(*a, **kw)
+            finally:
+                stages[name] = stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+        return wrapper
+
+    fetch_one = DataCollector._fetch_one
+
+    def timed_fetch(self, name, service, service_config):
+        return timed(f"fetch:{name}", fetch_one)(self, name, service, service_config)
+
+    DataCollector._fetch_one = timed_fetch
+    DataCollector.collect_all = timed('collect', DataCollector.collect_all)
+    main.format_combined_message = timed('format', main.format_combined_message)
+    main.send_to_telegram = timed('send', main.send_to_telegram)
+    main.send_to_chats = timed('send', main.send_to_chats)
+
+    # Keep the bot's console output out of the measurements
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        start = time.perf_counter()
+        main.main()
+        total_ms = (time.perf_counter() - start) * 1000
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    server.stop()
+    print(json.dumps({
+        'size': size,
+        'total_ms': total_ms,
+        'stages': stages,
+        'requests': {**server.requests, **{f"vnstock:{k}": v for k, v in vnstock_calls.items()}},
+    }))
+
+def run_size(args, size: int):
+    """Spawn a fresh interpreter for one watchlist size and parse its result"""
+    command = [
+        sys.executable, '-m', 'benchmarks.full_run', '--child', '--size', str(size),
+        '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+        '--error-rate', str(args.error_rate), '--payload-bytes', str(args.payload_bytes),
+    ]
+    if args.no_telegram:
+        command.append('--no-telegram')
+
+    output = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"benchmark for {size} symbols failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def print_report(size: int, samples):
+    """Median total and per-stage timings for one size"""
+    total = statistics.median(sample['total_ms'] for sample in samples)
+    print(f"\n{size} symbols - total {total:,.0f} ms (median of {len(samples)})")
+
+    stage_names = sorted({name for sample in samples for name in sample['stages']})
+    for name in stage_names:
+        values = [sample['stages'].get(name, 0.0) for sample in samples]
+        print(f"  {name:<20} {statistics.median(values):>10,.1f} ms")
+
+    requests = samples[-1]['requests']
+    if requests:
+        print("  upstream calls: " + ', '.join(f"{key}={value}" for key, value in sorted(requests.items())))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5,100,1000', help='comma-separated watchlist sizes')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per size')
+    parser.add_argument('--latency-ms', type=float, default=50, help='latency of every stub call')
+    parser.add_argument('--jitter-ms', type=float, default=10, help='random extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability a stub call fails')
+    parser.add_argument('--payload-bytes', type=int, default=0, help='padding added to each stub record')
+    parser.add_argument('--no-telegram', action='store_true', help='skip the Telegram stage')
+    parser.add_argument('--json', help='also write raw results to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, default=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    results = {}
+    for size in (int(value) for value in args.sizes.split(',')):
+        samples = [run_size(args, size) for _ in range(args.repeat)]
+        results[size] = samples
+        print_report(size, samples)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Startup benchmark: interpreter + import time of main.py and time to first fetch
+
+Every measurement runs in a fresh interpreter so module caches do not hide
+import cost. Exits with status 1 when the median import time exceeds the
+budget, so it can gate CI.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget-ms 400
+    python -m benchmarks.startup --fetch gold      # also time the first fetch (hits the network)
+    python -m benchmarks.startup --importtime 15   # show the slowest imports
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+first_fetch = None
+if sys.argv[1]:
+    collector = main.build_collector()
+    collector.enable_service(sys.argv[1])
+    collector.collect_all(main.SERVICE_CONFIGS, only=[sys.argv[1]])
+    first_fetch = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_fetch_ms': first_fetch,
+    'heavy_modules': sorted(m for m in ('vnstock', 'pandas', 'telegram', 'httpx') if m in sys.modules),
+}))
+"""
+
+def run_child(fetch: str):
+    """Run one cold start and return its measurements"""
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, fetch or ''],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # The bot prints progress lines; the measurements are the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+def slowest_imports(limit: int):
+    """Parse `python -X importtime` output for the slowest cumulative imports"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  self_us |  cumulative_us |   package.module"
+        _, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), module.strip()))
+
+    return sorted(rows, reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='cold starts to measure')
+    parser.add_argument('--budget-ms', type=float, default=400, help='fail if median import time exceeds this')
+    parser.add_argument('--fetch', default='', help='service to fetch once after import (gold, stock, ...)')
+    parser.add_argument('--importtime', type=int, default=0, help='list the N slowest imports')
+    args = parser.parse_args()
+
+    samples = [run_child(args.fetch) for _ in range(args.runs)]
+    import_ms = statistics.median(sample['import_ms'] for sample in samples)
+
+    print(f"Import main.py: median {import_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"Heavy modules loaded at import: {', '.join(samples[0]['heavy_modules']) or 'none'}")
+
+    if args.fetch:
+        fetch_ms = statistics.median(sample['first_fetch_ms'] for sample in samples)
+        print(f"Time to first '{args.fetch}' fetch: median {fetch_ms:.1f} ms")
+
+    if args.importtime:
+        print("\nSlowest imports (cumulative):")
+        for cumulative_us, module in slowest_imports(args.importtime):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    if import_ms > args.budget_ms:
+        print(f"\nFAIL: import time {import_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Local stand-ins for every upstream the bot talks to
+
+- StubServer: HTTP server speaking enough of the CryptoCompare
+  `pricemultifull` endpoint and the Telegram Bot API
+- CryptoStreamStub: WebSocket stand-in for the CryptoCompare streaming API
+- install_fake_vnstock(): replaces the `vnstock` package in sys.modules with
+  fakes for quote history, price board, `vcb_exchange_rate` and
+  `sjc_gold_price`
+
+Latency, error rate and payload size are configurable per upstream through
+StubProfile so a benchmark can model slow or flaky sources.
+"""
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+class StubProfile:
+    """How one stand-in behaves"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 payload_bytes: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        # Extra padding per record, to model verbose upstream payloads
+        self.payload_bytes = payload_bytes
+
+    def delay(self):
+        """Sleep for the configured latency"""
+        latency = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+    def padding(self) -> str:
+        return 'x' * self.payload_bytes
+
+def _price_for(symbol: str) -> float:
+    """Deterministic pseudo price so runs are comparable"""
+    return 10 + (sum(ord(c) for c in symbol) * 37) % 990
+
+class StubServer:
+    """Threaded HTTP stand-in for CryptoCompare and the Telegram Bot API"""
+
+    def __init__(self, crypto: Optional[StubProfile] = None, telegram: Optional[StubProfile] = None):
+        self.crypto = crypto or StubProfile()
+        self.telegram = telegram or StubProfile()
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._message_id = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str):
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def start(self) -> 'StubServer':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self._dispatch()
+
+            def do_POST(self):
+                self._dispatch()
+
+            def _dispatch(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                if parts.path == '/data/pricemultifull':
+                    status, payload = stub._pricemultifull(parse_qs(parts.query))
+                elif parts.path.startswith('/bot'):
+                    status, payload = stub._telegram(parts.path, body, self.headers.get('Content-Type', ''))
+                else:
+                    status, payload = 404, {'error': 'not found'}
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def _pricemultifull(self, query):
+        self.count('cryptocompare')
+        self.crypto.delay()
+        if self.crypto.should_fail():
+            return 503, {'Response': 'Error', 'Message': 'stub failure'}
+
+        fsyms = query.get('fsyms', [''])[0].split(',')
+        tsyms = query.get('tsyms', ['USD'])[0].split(',')
+        raw = {}
+        for fsym in filter(None, fsyms):
+            price = _price_for(fsym)
+            raw[fsym] = {
+                tsym: {
+                    'FROMSYMBOL': fsym, 'TOSYMBOL': tsym, 'PRICE': price,
+                    'CHANGEPCT24HOUR': (price % 7) - 3.5, 'OPEN24HOUR': price * 0.98,
+                    'LASTUPDATE': int(time.time()), 'PADDING': self.crypto.padding()
+                }
+                for tsym in tsyms
+            }
+        return 200, {'RAW': raw}
+
+    def _telegram(self, path: str, body: bytes, content_type: str):
+        # Paths look like /bot<token>/<method>
+        method = path.rsplit('/', 1)[-1]
+        self.count(f'telegram:{method}')
+        self.telegram.delay()
+        if self.telegram.should_fail():
+            return 429, {'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                         'parameters': {'retry_after': 1}}
+
+        params = {}
+        if body and 'json' in content_type:
+            params = json.loads(body)
+        elif body:
+            params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+        if method == 'getMe':
+            return 200, {'ok': True, 'result': {'id': 1, 'is_bot': True, 'first_name': 'Stub', 'username': 'stub_bot'}}
+
+        if method in ('sendMessage', 'editMessageText'):
+            with self._lock:
+                self._message_id += 1
+                message_id = int(params.get('message_id') or self._message_id)
+            chat_id = params.get('chat_id', 0)
+            return 200, {'ok': True, 'result': {
+                'message_id': message_id, 'date': int(time.time()),
+                'chat': {'id': int(chat_id) if str(chat_id).lstrip('-').isdigit() else 0, 'type': 'private'},
+                'text': params.get('text', '')
+            }}
+
+        # pinChatMessage, deleteWebhook, getUpdates and friends
+        return 200, {'ok': True, 'result': [] if method == 'getUpdates' else True}
+
+def install_fake_vnstock(history: Optional[StubProfile] = None, board: Optional[StubProfile] = None,
+                         vcb: Optional[StubProfile] = None, sjc: Optional[StubProfile] = None,
+                         history_days: int = 30):
+    """Replace the vnstock package with offline fakes. Requires pandas."""
+    import pandas as pd
+
+    history = history or StubProfile()
+    board = board or StubProfile()
+    vcb = vcb or StubProfile()
+    sjc = sjc or StubProfile()
+    calls: Dict[str, int] = {}
+
+    def count(key: str):
+        calls[key] = calls.get(key, 0) + 1
+
+    def history_frame(symbol: str, start: str, end: str, interval: str):
+        count('history')
+        history.delay()
+        if history.should_fail():
+            raise ConnectionError(f"stub history failure for {symbol}")
+
+        end_day = datetime.strptime(end[:10], '%Y-%m-%d')
+        start_day = max(datetime.strptime(start[:10], '%Y-%m-%d'), end_day - timedelta(days=history_days))
+        days = [day for day in pd.date_range(start_day, end_day) if day.weekday() < 5]
+        base = _price_for(symbol)
+        return pd.DataFrame({
+            'time': days,
+            'open': [base] * len(days),
+            'high': [base * 1.02] * len(days),
+            'low': [base * 0.98] * len(days),
+            'close': [base * (1 + 0.001 * i) for i in range(len(days))],
+            'volume': [100000 + len(history.padding())] * len(days),
+        })
+
+    def price_board(symbols):
+        count('price_board')
+        board.delay()
+        if board.should_fail():
+            raise ConnectionError("stub price board failure")
+
+        columns = pd.MultiIndex.from_tuples([('listing', 'symbol'), ('listing', 'ref_price'), ('match', 'match_price')])
+        rows = [[symbol, _price_for(symbol) * 1000, _price_for(symbol) * 1010] for symbol in symbols]
+        return pd.DataFrame(rows, columns=columns)
+
+    class _Quote:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, start, end=None, interval='1D', **kwargs):
+            return history_frame(self.symbol, start, end or datetime.now().strftime('%Y-%m-%d'), interval)
+
+    class _Trading:
+        def price_board(self, symbols_list, **kwargs):
+            return price_board(symbols_list)
+
+    class _Instrument:
+        def __init__(self, symbol):
+            self.quote = _Quote(symbol)
+            self.trading = _Trading()
+
+    class Vnstock:
+        def stock(self, symbol, source='VCI'):
+            return _Instrument(symbol)
+
+        def world_index(self, symbol, source='MSN'):
+            return _Instrument(symbol)
+
+    def vcb_exchange_rate(date=None):
+        count('vcb_exchange_rate')
+        vcb.delay()
+        if vcb.should_fail():
+            raise ConnectionError("stub VCB failure")
+
+        currencies = {'USD': 25_400, 'EUR': 27_500, 'JPY': 168, 'GBP': 32_100, 'AUD': 16_600,
+                      'CNY': 3_500, 'SGD': 19_000, 'KRW': 18, 'THB': 700, 'CHF': 29_000}
+        return pd.DataFrame([
+            {
+                'currency_code': code, 'currency_name': code + vcb.padding(),
+                'buy _cash': f"{rate * 0.99:,.2f}", 'buy _transfer': f"{rate * 0.995:,.2f}",
+                'sell': f"{rate * 1.01:,.2f}", 'date': date
+            }
+            for code, rate in currencies.items()
+        ])
+
+    def sjc_gold_price(**kwargs):
+        count('sjc_gold_price')
+        sjc.delay()
+        if sjc.should_fail():
+            raise ConnectionError("stub SJC failure")
+
+        return pd.DataFrame([
+            {'name': 'Vàng SJC 1L, 10L, 1KG', 'branch': branch + sjc.padding(),
+             'buy_price': 118_500_000 + i * 100_000, 'sell_price': 120_500_000 + i * 100_000}
+            for i, branch in enumerate(['Hồ Chí Minh', 'Hà Nội', 'Đà Nẵng'])
+        ])
+
+    vnstock = types.ModuleType('vnstock')
+    explorer = types.ModuleType('vnstock.explorer')
+    misc = types.ModuleType('vnstock.explorer.misc')
+    vnstock.Vnstock = Vnstock
+    vnstock.explorer = explorer
+    explorer.misc = misc
+    misc.vcb_exchange_rate = vcb_exchange_rate
+    misc.sjc_gold_price = sjc_gold_price
+
+    sys.modules['vnstock'] = vnstock
+    sys.modules['vnstock.explorer'] = explorer
+    sys.modules['vnstock.explorer.misc'] = misc
+    return calls
+
+class CryptoStreamStub:
+    """
+    Local WebSocket stand-in for CryptoCompare's streaming API.
+
+    Accepts SubAdd messages and pushes CCCIAGG ticks for every subscription
+    every `interval` seconds. With `drop_after` set, each connection is
+    closed after that many ticks to exercise reconnect and resubscribe.
+    Run it on an asyncio loop, e.g. utils.async_runner.get_loop().
+    """
+
+    def __init__(self, interval: float = 0.5, drop_after: Optional[int] = None):
+        self.interval = interval
+        self.drop_after = drop_after
+        self.connections = 0
+        self.subscriptions = []
+        self.url = None
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> 'CryptoStreamStub':
+        import websockets
+
+        self._server = await websockets.serve(self._handler, host, port)
+        bound_port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://{host}:{bound_port}"
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handler(self, ws, *args):
+        self.connections += 1
+        subs = []
+        sent = 0
+
+        async def receive():
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get('action') == 'SubAdd':
+                    subs.extend(message.get('subs', []))
+                    self.subscriptions.extend(message.get('subs', []))
+                    await ws.send(json.dumps({'TYPE': '16', 'MESSAGE': 'SUBSCRIBECOMPLETE'}))
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while self.drop_after is None or sent < self.drop_after:
+                await asyncio.sleep(self.interval)
+                for sub in list(subs):
+                    _, _, fsym, tsym = sub.split('~')
+                    price = _price_for(fsym) * random.uniform(0.99, 1.01)
+                    await ws.send(json.dumps({
+                        'TYPE': '5', 'MARKET': 'CCCAGG', 'FROMSYMBOL': fsym, 'TOSYMBOL': tsym,
+                        'PRICE': price, 'OPEN24HOUR': _price_for(fsym) * 0.98, 'LASTUPDATE': int(time.time())
+                    }))
+                    sent += 1
+        finally:
+            receiver.cancel()
+            await ws.close()
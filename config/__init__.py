@@ -0,0 +1,7 @@
+"""
+Configuration package. Environment variables are loaded once, here.
+"""
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
@@ -2,10 +2,6 @@
 Data source specific configurations
 """
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Feature Toggles
 STOCK_PRICE_ENABLED = os.getenv('STOCK_PRICE', 'false').lower() == 'true'
@@ -14,6 +10,11 @@ GOLD_PRICE_ENABLED = os.getenv('GOLD_PRICE', 'false').lower() == 'true'
 EXCHANGE_RATE_ENABLED = os.getenv('EXCHANGE_RATE', 'false').lower() == 'true'
 CRYPTO_PRICE_ENABLED = os.getenv('CRYPTO_PRICE', 'false').lower() == 'true'
 
+# Upstream URLs (override to point at a local stand-in)
+CRYPTOCOMPARE_URL = os.getenv('CRYPTOCOMPARE_URL', 'https://min-api.cryptocompare.com')
+PNJ_GOLD_URL = os.getenv('PNJ_GOLD_URL', 'https://edge-api.pnj.io/ecom-frontend/v1/get-gold-price?zone=00')
+DOJI_GOLD_URL = os.getenv('DOJI_GOLD_URL', 'http://update.giavang.doji.vn/banggia/doji_92411/92411')
+
 # Symbols
 STOCK_SYMBOLS = os.getenv('STOCK', 'VCB,VIC,HPG').split(',')
 GOLD_SYMBOLS = os.getenv('GOLD', 'SJC').split(',')
@@ -22,6 +23,77 @@ EXCHANGE_SYMBOLS = os.getenv('EXCHANGE', 'USD,EUR,JPY').split(',')
 
 # Clean up symbols (remove whitespace)
 STOCK_SYMBOLS = [s.strip() for s in STOCK_SYMBOLS]
-GOLD_SYMBOLS = [s.strip() for s in GOLD_SYMBOLS]
+GOLD_SYMBOLS = [s.strip().upper() for s in GOLD_SYMBOLS if s.strip()]
 CRYPTO_SYMBOLS = [s.strip() for s in CRYPTO_SYMBOLS]
-EXCHANGE_SYMBOLS = [s.strip() for s in EXCHANGE_SYMBOLS]
\ No newline at end of file
+EXCHANGE_SYMBOLS = [s.strip() for s in EXCHANGE_SYMBOLS]
+# Cross rates quoted via VND, e.g. EUR/JPY,USD/EUR
+EXCHANGE_CROSS_PAIRS = [p.strip().upper() for p in os.getenv('EXCHANGE_CROSS', '').split(',') if '/' in p]
+
+# Stock Quote Settings
+# Read latest prices for the whole watchlist from the price board in batches
+STOCK_BULK_QUOTES = os.getenv('STOCK_BULK_QUOTES', 'true').lower() == 'true'
+STOCK_BOARD_BATCH_SIZE = int(os.getenv('STOCK_BOARD_BATCH_SIZE', '50'))
+# Worker threads for the per-symbol history fallback
+STOCK_HISTORY_WORKERS = int(os.getenv('STOCK_HISTORY_WORKERS', '8'))
+
+# Gold Brands
+# Each brand (SJC, PNJ, DOJI, BTMC) is fetched in parallel with its own timeout in seconds
+GOLD_PROVIDER_TIMEOUT = float(os.getenv('GOLD_PROVIDER_TIMEOUT', '8'))
+
+
+# Daemon Poll Intervals (seconds)
+# Stocks and VN-Index are only polled during HOSE trading hours, plus once after the close
+STOCK_POLL_INTERVAL = float(os.getenv('STOCK_POLL_INTERVAL', '60'))
+VNINDEX_POLL_INTERVAL = float(os.getenv('VNINDEX_POLL_INTERVAL', '60'))
+CRYPTO_POLL_INTERVAL = float(os.getenv('CRYPTO_POLL_INTERVAL', '300'))
+EXCHANGE_POLL_INTERVAL = float(os.getenv('EXCHANGE_POLL_INTERVAL', '10800'))
+GOLD_POLL_INTERVAL = float(os.getenv('GOLD_POLL_INTERVAL', '10800'))
+
+# Exchange holidays when the stock market is closed (YYYY-MM-DD, comma-separated)
+MARKET_HOLIDAYS = [d.strip() for d in os.getenv('MARKET_HOLIDAYS', '').split(',') if d.strip()]
+# Minutes after the 15:00 close for one last stock/VN-Index poll with the ATC prices
+MARKET_CLOSE_GRACE_MINUTES = float(os.getenv('MARKET_CLOSE_GRACE_MINUTES', '5'))
+
+
+# Crypto Streaming
+# Keep a live CryptoCompare WebSocket subscription (daemon mode) instead of polling REST
+CRYPTO_STREAM_ENABLED = os.getenv('CRYPTO_STREAM_ENABLED', 'false').lower() == 'true'
+CRYPTO_STREAM_URL = os.getenv('CRYPTO_STREAM_URL', 'wss://streamer.cryptocompare.com/v2')
+CRYPTOCOMPARE_API_KEY = os.getenv('CRYPTOCOMPARE_API_KEY', '')
+# Streamed prices older than this many seconds fall back to REST
+CRYPTO_STREAM_MAX_AGE = float(os.getenv('CRYPTO_STREAM_MAX_AGE', '120'))
+
+# Quote currencies shown for each coin besides VND (USD is always included)
+CRYPTO_QUOTES = [q.strip().upper() for q in os.getenv('CRYPTO_QUOTES', 'USD').split(',') if q.strip()]
+# Symbols per pricemultifull request are limited by the length of the fsyms parameter
+CRYPTO_FSYMS_MAX_LENGTH = int(os.getenv('CRYPTO_FSYMS_MAX_LENGTH', '300'))
+
+# Technical Indicators (stocks and VN-Index)
+INDICATORS_ENABLED = os.getenv('INDICATORS_ENABLED', 'false').lower() == 'true'
+INDICATOR_SMA_PERIODS = [int(p) for p in os.getenv('INDICATOR_SMA_PERIODS', '20,50').split(',') if p.strip()]
+INDICATOR_EMA_PERIODS = [int(p) for p in os.getenv('INDICATOR_EMA_PERIODS', '12,26').split(',') if p.strip()]
+# Indicators appended to each line, e.g. "rsi,macd_hist,sma_20" (all are kept in the collected values)
+INDICATOR_DISPLAY = [f.strip().lower() for f in os.getenv('INDICATOR_DISPLAY', 'rsi,sma_20').split(',') if f.strip()]
+
+# Full-Market Scan (RUN_MODE=scan)
+# Exchanges whose listed stocks are priced
+SCAN_EXCHANGES = [e.strip().upper() for e in os.getenv('SCAN_EXCHANGES', 'HOSE,HNX,UPCOM').split(',') if e.strip()]
+# Worker processes and symbols handed to a worker at a time
+SCAN_WORKERS = int(os.getenv('SCAN_WORKERS', '4'))
+SCAN_SHARD_SIZE = int(os.getenv('SCAN_SHARD_SIZE', '100'))
+# vnstock requests per second across all workers, and the burst allowed on top
+SCAN_RATE_LIMIT = float(os.getenv('SCAN_RATE_LIMIT', '5'))
+SCAN_RATE_BURST = float(os.getenv('SCAN_RATE_BURST', '10'))
+# Seconds the exchange listing is reused (needs the HTTP cache)
+SCAN_UNIVERSE_TTL = float(os.getenv('SCAN_UNIVERSE_TTL', '86400'))
+
+# Intraday Bars (stocks and VN-Index, while the market is open)
+# Pull only new trades (stocks) or 1-minute bars (VN-Index) each poll and aggregate them into bars
+INTRADAY_ENABLED = os.getenv('INTRADAY_ENABLED', 'false').lower() == 'true'
+INTRADAY_TIMEFRAMES = [int(m) for m in os.getenv('INTRADAY_TIMEFRAMES', '1,5,15').split(',') if m.strip()]
+# Bars kept per symbol and timeframe (a full session is about 360 one-minute bars)
+INTRADAY_BUFFER_BARS = int(os.getenv('INTRADAY_BUFFER_BARS', '400'))
+# Trades per intraday request
+INTRADAY_PAGE_SIZE = int(os.getenv('INTRADAY_PAGE_SIZE', '500'))
+# Session fields appended to each line: day_open, day_high, day_low, day_volume, move_5m, move_15m
+INTRADAY_DISPLAY = [f.strip().lower() for f in os.getenv('INTRADAY_DISPLAY', 'day_high,day_low,move_15m').split(',') if f.strip()]
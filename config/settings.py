@@ -2,15 +2,101 @@
 Main configuration settings
 """
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Telegram Config
 TOKEN = os.getenv('TOKEN', '')
 CHAT_ID = os.getenv('CHAT_ID', '')
+# CHAT_ID may list several chats, comma-separated
+CHAT_IDS = [chat_id.strip() for chat_id in CHAT_ID.split(',') if chat_id.strip()]
 TELEGRAM_ENABLED = os.getenv('TELEGRAM_ENABLED', 'false').lower() == 'true'
 
 # Telegram URL
-TELEGRAM_URL = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
\ No newline at end of file
+TELEGRAM_URL = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
+# Bot API base URL (the token is appended); override to use a local Bot API server or stub
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org/bot')
+# JSON file with per-chat sections and watchlists; empty sends one message to CHAT_ID
+SUBSCRIBERS_PATH = os.getenv('SUBSCRIBERS_PATH', '')
+# Keep one pinned message per chat and edit it in place instead of posting each update
+TELEGRAM_DASHBOARD_ENABLED = os.getenv('TELEGRAM_DASHBOARD_ENABLED', 'false').lower() == 'true'
+# Minimum seconds between two edits of the same chat's dashboard
+DASHBOARD_EDIT_INTERVAL = float(os.getenv('DASHBOARD_EDIT_INTERVAL', '10'))
+
+# Collection Settings
+# Fetch all enabled services concurrently instead of one after another
+PARALLEL_COLLECTION = os.getenv('PARALLEL_COLLECTION', 'true').lower() == 'true'
+# Seconds a single service may take before its result is dropped
+SERVICE_TIMEOUT = float(os.getenv('SERVICE_TIMEOUT', '20'))
+# Seconds the whole collection may take before partial results are returned
+COLLECTION_DEADLINE = float(os.getenv('COLLECTION_DEADLINE', '45'))
+
+# Seconds the shared VCB rate table is reused before it is downloaded again
+VCB_RATE_TTL = float(os.getenv('VCB_RATE_TTL', '300'))
+
+# Local Storage
+# Directory for caches and state that persist between runs
+DATA_DIR = os.getenv('DATA_DIR', '.data')
+# Keep daily bars on disk and only download missing or still-open days
+BAR_STORE_ENABLED = os.getenv('BAR_STORE_ENABLED', 'true').lower() == 'true'
+BAR_STORE_PATH = os.getenv('BAR_STORE_PATH', os.path.join(DATA_DIR, 'bars.sqlite3'))
+# Append every run's values to a columnar history (Arrow IPC, partitioned by date)
+SNAPSHOT_STORE_ENABLED = os.getenv('SNAPSHOT_STORE_ENABLED', 'false').lower() == 'true'
+SNAPSHOT_STORE_PATH = os.getenv('SNAPSHOT_STORE_PATH', os.path.join(DATA_DIR, 'snapshots'))
+# Cache upstream responses on disk and revalidate them with ETag/Last-Modified
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', os.path.join(DATA_DIR, 'http_cache.sqlite3'))
+HTTP_CACHE_MAX_MB = float(os.getenv('HTTP_CACHE_MAX_MB', '64'))
+# Seconds a response without Cache-Control/Expires is reused; per host, e.g. "edge-api.pnj.io=300"
+HTTP_CACHE_SOFT_TTL = float(os.getenv('HTTP_CACHE_SOFT_TTL', '30'))
+HTTP_CACHE_SOFT_TTLS = {
+    key.strip(): float(value)
+    for key, value in (item.split('=', 1) for item in os.getenv('HTTP_CACHE_SOFT_TTLS', '').split(',') if '=' in item)
+}
+# Latest full-market scan (RUN_MODE=scan) as JSON
+SCAN_OUTPUT_PATH = os.getenv('SCAN_OUTPUT_PATH', os.path.join(DATA_DIR, 'scan_latest.json'))
+# Last good quotes of each gold brand, shown (marked stale) when a site fails
+GOLD_CACHE_PATH = os.getenv('GOLD_CACHE_PATH', os.path.join(DATA_DIR, 'gold_last_good.json'))
+# Message id and shown text of each chat's dashboard
+DASHBOARD_STATE_PATH = os.getenv('DASHBOARD_STATE_PATH', os.path.join(DATA_DIR, 'dashboard.json'))
+
+# Run Mode
+# 'once' collects and sends a single update, 'daemon' keeps polling each source,
+# 'scan' prices every listed stock (see SCAN_* settings)
+RUN_MODE = os.getenv('RUN_MODE', 'once').lower()
+# Seconds between scheduler checks in daemon mode
+POLL_TICK = float(os.getenv('POLL_TICK', '1'))
+
+# Change Detection
+# Skip sending when nothing moved past its threshold since the last send
+CHANGE_DETECTION_ENABLED = os.getenv('CHANGE_DETECTION_ENABLED', 'false').lower() == 'true'
+# Per-section thresholds in percent, e.g. "stock=0.5,crypto=1,gold=0.2"
+NOTIFY_THRESHOLDS = {
+    key.strip(): float(value)
+    for key, value in (item.split('=', 1) for item in os.getenv('NOTIFY_THRESHOLDS', '').split(',') if '=' in item)
+}
+NOTIFY_DEFAULT_THRESHOLD = float(os.getenv('NOTIFY_DEFAULT_THRESHOLD', '0'))
+# Send anyway after this many minutes without an update (0 disables)
+NOTIFY_HEARTBEAT_MINUTES = float(os.getenv('NOTIFY_HEARTBEAT_MINUTES', '240'))
+# Only include the sections that changed in the message
+NOTIFY_CHANGED_ONLY = os.getenv('NOTIFY_CHANGED_ONLY', 'false').lower() == 'true'
+CHANGE_STATE_PATH = os.getenv('CHANGE_STATE_PATH', os.path.join(DATA_DIR, 'last_sent.json'))
+
+# Telegram Commands
+# Answer /price, /gold, /fx, /crypto and /vnindex in daemon mode (long polling)
+TELEGRAM_COMMANDS_ENABLED = os.getenv('TELEGRAM_COMMANDS_ENABLED', 'false').lower() == 'true'
+# Seconds a command answer is reused for the same symbol
+COMMAND_CACHE_TTL = float(os.getenv('COMMAND_CACHE_TTL', '60'))
+
+# Price Alerts
+# Rules (thresholds, crosses, percent moves, spreads) are read from a JSON file
+ALERTS_ENABLED = os.getenv('ALERTS_ENABLED', 'false').lower() == 'true'
+ALERT_RULES_PATH = os.getenv('ALERT_RULES_PATH', 'alert_rules.json')
+ALERT_STATE_PATH = os.getenv('ALERT_STATE_PATH', os.path.join(DATA_DIR, 'alert_state.json'))
+# Minimum minutes between two alerts from the same rule
+ALERT_COOLDOWN_MINUTES = float(os.getenv('ALERT_COOLDOWN_MINUTES', '60'))
+# Percent a value must move back past a level before the rule can fire again
+ALERT_HYSTERESIS = float(os.getenv('ALERT_HYSTERESIS', '0.5'))
+
+# HTTP Server
+# Serve /metrics (Prometheus), /healthz and /api/snapshot on HTTP_PORT
+HTTP_SERVER_ENABLED = os.getenv('HTTP_SERVER_ENABLED', 'false').lower() == 'true'
+HTTP_PORT = int(os.getenv('HTTP_PORT', '8080'))
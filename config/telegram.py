@@ -1,7 +1,7 @@
 """
 Telegram specific configurations
 """
-from .settings import TOKEN, CHAT_ID, TELEGRAM_URL
+from .settings import TOKEN, CHAT_ID, CHAT_IDS, TELEGRAM_URL
 
 # Re-export telegram configurations for easy access
-__all__ = ['TOKEN', 'CHAT_ID', 'TELEGRAM_URL']
\ No newline at end of file
+__all__ = ['TOKEN', 'CHAT_ID', 'CHAT_IDS', 'TELEGRAM_URL']
\ No newline at end of file
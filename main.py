@@ -3,90 +3,626 @@ Market data notification bot
 Sends single combined message to Telegram in English
 Order: Gold -> Stocks -> VN-Index -> Exchange -> Crypto
 """
+import signal
+import sys
 from services.core.data_collector import DataCollector
-from services.data_sources.stock_service import StockService
-from services.data_sources.gold_service import GoldService
-from services.data_sources.index_service import IndexService
-from services.data_sources.exchange_service import ExchangeService
-from services.data_sources.crypto_service import CryptoService
-from services.telegram.formatter import format_combined_message
-from services.telegram.bot import send_to_telegram
-from config.settings import TELEGRAM_ENABLED
+from services.core.scheduler import PollScheduler
+from utils.market_calendar import MarketCalendar
+from services.telegram.formatter import format_combined_message, format_alert_message
+from services.telegram.bot import send_to_telegram, send_to_chats
+from config.settings import (
+    TELEGRAM_ENABLED, PARALLEL_COLLECTION, SERVICE_TIMEOUT, COLLECTION_DEADLINE,
+    VCB_RATE_TTL, BAR_STORE_ENABLED, BAR_STORE_PATH, RUN_MODE, POLL_TICK,
+    CHANGE_DETECTION_ENABLED, NOTIFY_THRESHOLDS, NOTIFY_DEFAULT_THRESHOLD,
+    NOTIFY_HEARTBEAT_MINUTES, NOTIFY_CHANGED_ONLY, CHANGE_STATE_PATH,
+    HTTP_SERVER_ENABLED, HTTP_PORT, SNAPSHOT_STORE_ENABLED, SNAPSHOT_STORE_PATH,
+    ALERTS_ENABLED, ALERT_RULES_PATH, ALERT_STATE_PATH, ALERT_COOLDOWN_MINUTES, ALERT_HYSTERESIS,
+    TOKEN, TELEGRAM_COMMANDS_ENABLED, COMMAND_CACHE_TTL, CHAT_IDS, SUBSCRIBERS_PATH, GOLD_CACHE_PATH,
+    HTTP_CACHE_ENABLED, HTTP_CACHE_PATH, HTTP_CACHE_MAX_MB, HTTP_CACHE_SOFT_TTL, HTTP_CACHE_SOFT_TTLS,
+    SCAN_OUTPUT_PATH, TELEGRAM_DASHBOARD_ENABLED, DASHBOARD_EDIT_INTERVAL, DASHBOARD_STATE_PATH
+)
 from config.data_sources import (
     STOCK_PRICE_ENABLED, VNINDEX_ENABLED, GOLD_PRICE_ENABLED,
     EXCHANGE_RATE_ENABLED, CRYPTO_PRICE_ENABLED,
-    STOCK_SYMBOLS, CRYPTO_SYMBOLS, EXCHANGE_SYMBOLS
+    STOCK_SYMBOLS, GOLD_SYMBOLS, CRYPTO_SYMBOLS, EXCHANGE_SYMBOLS, EXCHANGE_CROSS_PAIRS,
+    STOCK_BULK_QUOTES, STOCK_BOARD_BATCH_SIZE, STOCK_HISTORY_WORKERS,
+    STOCK_POLL_INTERVAL, VNINDEX_POLL_INTERVAL, CRYPTO_POLL_INTERVAL,
+    EXCHANGE_POLL_INTERVAL, GOLD_POLL_INTERVAL, MARKET_HOLIDAYS, MARKET_CLOSE_GRACE_MINUTES, CRYPTOCOMPARE_URL,
+    CRYPTO_STREAM_ENABLED, CRYPTO_STREAM_URL, CRYPTOCOMPARE_API_KEY, CRYPTO_STREAM_MAX_AGE,
+    CRYPTO_QUOTES, CRYPTO_FSYMS_MAX_LENGTH, INDICATORS_ENABLED, INDICATOR_SMA_PERIODS,
+    INDICATOR_EMA_PERIODS, INDICATOR_DISPLAY, INTRADAY_ENABLED, INTRADAY_TIMEFRAMES, INTRADAY_BUFFER_BARS,
+    INTRADAY_PAGE_SIZE, INTRADAY_DISPLAY, SCAN_EXCHANGES, SCAN_WORKERS, SCAN_SHARD_SIZE, SCAN_RATE_LIMIT,
+    SCAN_RATE_BURST, SCAN_UNIVERSE_TTL, GOLD_PROVIDER_TIMEOUT, PNJ_GOLD_URL, DOJI_GOLD_URL
 )
 
-def main():
-    print("Starting Vietnam market data bot...")
-    
-    # Initialize data collector and services
-    collector = DataCollector()
-    
+# Configure service parameters
+SERVICE_CONFIGS = {
+    'stock': {'symbols': STOCK_SYMBOLS},
+    'exchange': {'currencies': EXCHANGE_SYMBOLS, 'cross_pairs': EXCHANGE_CROSS_PAIRS},
+    'crypto': {'symbols': CRYPTO_SYMBOLS},
+    'gold': {'brands': GOLD_SYMBOLS},
+    'vnindex': {}  # No parameters needed
+}
+
+_response_cache = {}
+
+def get_response_cache():
+    """
+    Disk cache for upstream responses, if enabled.
+
+    Created once per process and installed on the shared HTTP client;
+    vnstock-backed services get it passed in.
+    """
+    if 'cache' not in _response_cache:
+        cache = None
+        if HTTP_CACHE_ENABLED:
+            from utils.api_client import http_client
+            from utils.response_cache import ResponseCache
+            cache = ResponseCache(
+                HTTP_CACHE_PATH,
+                max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024),
+                soft_ttl=HTTP_CACHE_SOFT_TTL,
+                host_ttls=HTTP_CACHE_SOFT_TTLS
+            )
+            http_client.cache = cache
+        _response_cache['cache'] = cache
+    return _response_cache['cache']
+
+def build_collector(with_indicators: bool = True, service_configs=None, with_intraday: bool = True,
+                    with_stream: bool = True, crypto_stream=None):
+    """
+    Create the data collector with every service registered.
+
+    Services are registered lazily: a disabled source never imports its
+    module (or vnstock/pandas behind it). `crypto_stream` shares another
+    collector's WebSocket; with_stream=False never opens one of its own.
+    """
+    collector = DataCollector(
+        parallel=PARALLEL_COLLECTION,
+        service_timeout=SERVICE_TIMEOUT,
+        deadline=COLLECTION_DEADLINE
+    )
+
+    shared = {}
+
+    def bar_store():
+        # Daily bars persist between runs so only new days are downloaded
+        if 'bar_store' not in shared:
+            from utils.bar_store import BarStore
+            shared['bar_store'] = BarStore(BAR_STORE_PATH) if BAR_STORE_ENABLED else None
+        return shared['bar_store']
+
+    def vcb_rates():
+        # Exchange and crypto share one VCB rate table per run
+        if 'vcb_rates' not in shared:
+            from services.data_sources.vcb_rates import VCBRateProvider
+            shared['vcb_rates'] = VCBRateProvider(ttl=VCB_RATE_TTL, response_cache=get_response_cache())
+        return shared['vcb_rates']
+
+    def indicator_factory():
+        # Technical indicators for stocks and the index; numpy is only imported when enabled
+        if not (INDICATORS_ENABLED and with_indicators):
+            return None
+
+        def build(symbols):
+            from services.analytics.indicators import IndicatorEngine
+            return IndicatorEngine(symbols, sma_periods=INDICATOR_SMA_PERIODS, ema_periods=INDICATOR_EMA_PERIODS)
+        return build
+
+    def intraday_feed():
+        # Stocks and the index share one set of intraday bars, fed only while the market is open
+        if not (INTRADAY_ENABLED and with_intraday):
+            return None
+        if 'intraday' not in shared:
+            from services.analytics.intraday import IntradayBars
+            from services.data_sources.intraday_feed import IntradayFeed
+            shared['intraday'] = IntradayFeed(
+                IntradayBars([minutes * 60 for minutes in INTRADAY_TIMEFRAMES], capacity=INTRADAY_BUFFER_BARS),
+                page_size=INTRADAY_PAGE_SIZE,
+                is_open=MarketCalendar(MARKET_HOLIDAYS).is_open
+            )
+        return shared['intraday']
+
+    def gold_service():
+        from services.data_sources.gold_service import GoldService
+        return GoldService(
+            GOLD_SYMBOLS,
+            timeout=GOLD_PROVIDER_TIMEOUT,
+            state_path=GOLD_CACHE_PATH,
+            pnj_url=PNJ_GOLD_URL,
+            doji_url=DOJI_GOLD_URL,
+            response_cache=get_response_cache(),
+            cache_ttl=HTTP_CACHE_SOFT_TTL
+        )
+
+    def stock_service():
+        from services.data_sources.stock_service import StockService
+        return StockService(
+            bulk_quotes=STOCK_BULK_QUOTES,
+            batch_size=STOCK_BOARD_BATCH_SIZE,
+            history_workers=STOCK_HISTORY_WORKERS,
+            bar_store=bar_store(),
+            indicator_factory=indicator_factory(),
+            indicator_fields=INDICATOR_DISPLAY,
+            intraday_feed=intraday_feed(),
+            intraday_fields=INTRADAY_DISPLAY,
+            calendar=MarketCalendar(MARKET_HOLIDAYS)
+        )
+
+    def index_service():
+        from services.data_sources.index_service import IndexService
+        return IndexService(
+            bar_store(),
+            indicator_factory=indicator_factory(),
+            indicator_fields=INDICATOR_DISPLAY,
+            intraday_feed=intraday_feed(),
+            intraday_fields=INTRADAY_DISPLAY
+        )
+
+    def exchange_service():
+        from services.data_sources.exchange_service import ExchangeService
+        return ExchangeService(vcb_rates())
+
+    def crypto_service():
+        from services.data_sources.crypto_service import CryptoService
+        get_response_cache()  # CryptoCompare requests go through the shared response cache
+
+        stream = crypto_stream
+        if stream is None and with_stream and CRYPTO_STREAM_ENABLED:
+            # Live prices from the WebSocket; REST only covers symbols without a fresh tick
+            from services.data_sources.crypto_stream import CryptoStream
+            stream = CryptoStream(
+                (service_configs or SERVICE_CONFIGS)['crypto']['symbols'],
+                url=CRYPTO_STREAM_URL,
+                api_key=CRYPTOCOMPARE_API_KEY,
+                max_age=CRYPTO_STREAM_MAX_AGE,
+                extra_quotes=CRYPTO_QUOTES
+            )
+            stream.start()
+
+        return CryptoService(
+            vcb_rates(),
+            base_url=CRYPTOCOMPARE_URL,
+            stream=stream,
+            quotes=CRYPTO_QUOTES,
+            max_fsyms_length=CRYPTO_FSYMS_MAX_LENGTH
+        )
+
     # Register services with their enabled status
-    collector.register_service('gold', GoldService(), GOLD_PRICE_ENABLED)
-    collector.register_service('stock', StockService(), STOCK_PRICE_ENABLED)
-    collector.register_service('vnindex', IndexService(), VNINDEX_ENABLED)
-    collector.register_service('exchange', ExchangeService(), EXCHANGE_RATE_ENABLED)
-    collector.register_service('crypto', CryptoService(), CRYPTO_PRICE_ENABLED)
-    
-    # Configure service parameters
-    service_configs = {
-        'stock': {'symbols': STOCK_SYMBOLS},
-        'exchange': {'currencies': EXCHANGE_SYMBOLS},
-        'crypto': {'symbols': CRYPTO_SYMBOLS},
-        'gold': {},  # No parameters needed
-        'vnindex': {}  # No parameters needed
+    collector.register_lazy_service('gold', gold_service, GOLD_PRICE_ENABLED)
+    collector.register_lazy_service('stock', stock_service, STOCK_PRICE_ENABLED)
+    collector.register_lazy_service('vnindex', index_service, VNINDEX_ENABLED)
+    collector.register_lazy_service('exchange', exchange_service, EXCHANGE_RATE_ENABLED)
+    collector.register_lazy_service('crypto', crypto_service, CRYPTO_PRICE_ENABLED)
+
+    return collector
+
+def build_change_detector():
+    """Create the change detector used to suppress unchanged updates, if enabled"""
+    if not CHANGE_DETECTION_ENABLED:
+        return None
+
+    from services.core.change_detector import ChangeDetector
+    return ChangeDetector(
+        CHANGE_STATE_PATH,
+        thresholds=NOTIFY_THRESHOLDS,
+        default_threshold=NOTIFY_DEFAULT_THRESHOLD,
+        heartbeat=NOTIFY_HEARTBEAT_MINUTES * 60
+    )
+
+def build_snapshot_store():
+    """Create the columnar history store, if enabled"""
+    if not SNAPSHOT_STORE_ENABLED:
+        return None
+
+    from utils.snapshot_store import SnapshotStore
+    store = SnapshotStore(SNAPSHOT_STORE_PATH)
+    # Fold yesterday's per-run files into one so long range reads stay cheap
+    compact_snapshots(store)
+    return store
+
+def compact_snapshots(store):
+    """Compact the finished days of the history store; never fails the run"""
+    try:
+        rows = store.compact_finished()
+        if rows:
+            print(f"Compacted {rows} snapshot values from finished days")
+    except Exception as e:
+        print(f"Error compacting snapshot history: {e}")
+
+def utc_date():
+    """Today's date in UTC, the snapshot store's partition key"""
+    from datetime import datetime, timezone
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+def record_snapshot(store, values):
+    """Append collected values to the history store; never fails the run"""
+    if store is None or not values:
+        return
+
+    try:
+        rows = store.append(values)
+        print(f"Recorded {rows} values to snapshot history")
+    except Exception as e:
+        print(f"Error recording snapshot: {e}")
+
+def build_alert_engine():
+    """Load the price alert rules, if enabled"""
+    if not ALERTS_ENABLED:
+        return None
+
+    from services.analytics.alerts import AlertEngine
+    try:
+        return AlertEngine.from_file(
+            ALERT_RULES_PATH,
+            state_path=ALERT_STATE_PATH,
+            cooldown=ALERT_COOLDOWN_MINUTES * 60,
+            hysteresis=ALERT_HYSTERESIS
+        )
+    except (OSError, ValueError) as e:
+        print(f"Alerts disabled - cannot load {ALERT_RULES_PATH}: {e}")
+        return None
+
+def dispatch_alerts(engine, values):
+    """Evaluate alert rules on freshly collected values and send what fired"""
+    if engine is None or not values:
+        return
+
+    alerts = engine.evaluate(values)
+    if not alerts:
+        return
+
+    # Rules without a chat go to the default chats
+    by_chat = {}
+    for alert in alerts:
+        by_chat.setdefault(alert.chat_id, []).append(alert.text)
+
+    for chat_id, texts in by_chat.items():
+        print(f"🔔 {len(texts)} alert(s) for {chat_id or 'default chats'}:")
+        for text in texts:
+            print(f"   {text}")
+        if TELEGRAM_ENABLED:
+            send_to_telegram(format_alert_message(texts), chat_ids=[chat_id] if chat_id else None)
+
+def start_command_listener(collector=None):
+    """Answer /price, /gold, /fx and /crypto commands in daemon mode, if enabled"""
+    if not (TELEGRAM_COMMANDS_ENABLED and TOKEN):
+        return None
+
+    from services.telegram.bot import get_delivery
+    from services.telegram.commands import CommandListener, MarketQueryCache
+    from utils.async_runner import run_sync
+
+    # Read the polling collector's crypto stream instead of opening a second WebSocket
+    stream = None
+    if collector is not None and collector.services.get('crypto', {}).get('enabled'):
+        try:
+            stream = collector.get_service('crypto').stream
+        except Exception as e:
+            print(f"Failed to load service 'crypto': {e}")
+
+    # Separate service instances so command lookups never race the scheduled polls
+    lookup_collector = build_collector(with_indicators=False, with_intraday=False,
+                                       with_stream=False, crypto_stream=stream)
+
+    def get_service(name):
+        config = lookup_collector.services.get(name)
+        return lookup_collector.get_service(name) if config and config['enabled'] else None
+
+    listener = CommandListener(MarketQueryCache(get_service, ttl=COMMAND_CACHE_TTL), get_delivery())
+    try:
+        run_sync(listener.start())
+    except Exception as e:
+        print(f"Telegram commands disabled - failed to start: {e}")
+        return None
+    return listener
+
+def start_http_server(snapshots=None):
+    """Serve /metrics, /healthz and the JSON snapshot API on HTTP_PORT, if enabled"""
+    if not HTTP_SERVER_ENABLED:
+        return None
+
+    from services.api.server import ApiServer, health_route, metrics_route
+    server = ApiServer(port=HTTP_PORT)
+    server.add_route('/metrics', metrics_route)
+    server.add_route('/healthz', health_route)
+    if snapshots is not None:
+        from services.api.snapshot import ROUTE
+        server.add_route(ROUTE, snapshots.route)
+        server.add_route(f"{ROUTE}/", snapshots.route)
+    server.start()
+    return server
+
+def build_snapshot_cache():
+    """In-memory JSON snapshot behind /api/snapshot, if the HTTP server is enabled"""
+    if not HTTP_SERVER_ENABLED:
+        return None
+
+    from services.api.snapshot import SnapshotCache
+    enabled = {
+        'gold': GOLD_PRICE_ENABLED, 'stock': STOCK_PRICE_ENABLED, 'vnindex': VNINDEX_ENABLED,
+        'exchange': EXCHANGE_RATE_ENABLED, 'crypto': CRYPTO_PRICE_ENABLED,
     }
-    
-    # Collect all data
-    results = collector.collect_all(service_configs)
-    
-    # Print collected data to console
+    return SnapshotCache(assets=[name for name, is_enabled in enabled.items() if is_enabled])
+
+def print_results(results):
+    """Print collected data to console"""
     print("\n" + "="*60)
     print("COLLECTED MARKET DATA:")
     print("="*60)
-    
+
     if results.get('gold'):
         print(f"🥇 GOLD: {results['gold']}")
-    
+
     if results.get('stock'):
         print("📈 STOCKS:")
         for stock in results['stock']:
             print(f"   {stock}")
-    
+
     if results.get('vnindex'):
         print(f"📊 VN-INDEX: {results['vnindex']}")
-    
+
     if results.get('exchange'):
         print("💱 EXCHANGE:")
         for rate in results['exchange']:
             print(f"   {rate}")
-    
+
     if results.get('crypto'):
         print("₿ CRYPTO:")
         for crypto in results['crypto']:
             print(f"   {crypto}")
-    
+
     print("="*60)
-    
-    # Format and send message to Telegram if enabled
-    message = format_combined_message(
-        results.get('gold'), 
-        results.get('stock'), 
-        results.get('vnindex'), 
-        results.get('exchange'), 
-        results.get('crypto')
-    )
-    
-    if message:
+
+def build_subscribers():
+    """Per-chat watchlists from SUBSCRIBERS_PATH, if configured"""
+    if not SUBSCRIBERS_PATH:
+        return None
+
+    from services.telegram.subscribers import SubscriberRegistry
+    defaults = {
+        'stock': STOCK_SYMBOLS,
+        'crypto': CRYPTO_SYMBOLS,
+        'exchange': EXCHANGE_SYMBOLS + EXCHANGE_CROSS_PAIRS,
+    }
+    try:
+        return SubscriberRegistry.from_file(SUBSCRIBERS_PATH, defaults, CHAT_IDS)
+    except (OSError, ValueError) as e:
+        print(f"Subscribers disabled - cannot load {SUBSCRIBERS_PATH}: {e}")
+        return None
+
+def build_dashboard():
+    """Pinned per-chat dashboard edited in place, if enabled"""
+    if not (TELEGRAM_DASHBOARD_ENABLED and TELEGRAM_ENABLED and TOKEN):
+        return None
+
+    from services.telegram.bot import get_delivery
+    from services.telegram.dashboard import Dashboard
+    return Dashboard(get_delivery(), DASHBOARD_STATE_PATH, interval=DASHBOARD_EDIT_INTERVAL)
+
+def deliver(results, values=None, detector=None, subscribers=None, dashboard=None):
+    """Format and send message to Telegram if enabled"""
+    if dashboard is not None:
+        # Edits replace sends; unchanged chats are skipped by the dashboard itself
+        if subscribers is not None:
+            chat_sections = subscribers.chat_sections(results)
+        else:
+            chat_sections = {chat_id: results for chat_id in CHAT_IDS}
+        dashboard.update(chat_sections)
+        return
+
+    sections = None
+
+    # Skip the send when nothing moved enough since the last one
+    if detector is not None and values is not None:
+        changed = detector.changed_sections(values)
+        heartbeat = detector.heartbeat_due()
+
+        if not changed and not heartbeat:
+            print("No significant changes since last update, skipping send")
+            return
+
+        print(f"Changed sections: {', '.join(changed) or 'none (heartbeat)'}")
+        if NOTIFY_CHANGED_ONLY and not heartbeat:
+            sections = changed
+            results = {name: data for name, data in results.items() if name in changed}
+
+    if subscribers is not None:
+        # One shared collection, cut into each chat's own message
+        messages = subscribers.render(results)
+    else:
+        message = format_combined_message(
+            results.get('gold'),
+            results.get('stock'),
+            results.get('vnindex'),
+            results.get('exchange'),
+            results.get('crypto')
+        )
+        messages = {message: None} if message else {}
+
+    if messages:
         if TELEGRAM_ENABLED:
             print("\nSending combined market update to Telegram...")
-            send_to_telegram(message)
+            outcomes = {}
+            for message, chat_ids in messages.items():
+                outcomes.update(send_to_chats(message, chat_ids=chat_ids))
+
+            # The snapshot is shared, so it is committed once any chat has it; chats
+            # that missed this update (logged above) catch up on the next change or heartbeat
+            if any(outcomes.values()) and detector is not None and values is not None:
+                detector.commit(values, sections)
     else:
         print("No data to send")
-    
+
+def run_once(snapshots=None):
+    """Collect every enabled source once and send a single update"""
+    subscribers = build_subscribers()
+    service_configs = subscribers.service_configs(SERVICE_CONFIGS) if subscribers else SERVICE_CONFIGS
+    collector = build_collector(service_configs=service_configs)
+    detector = build_change_detector()
+    history = build_snapshot_store()
+    alerts = build_alert_engine()
+    dashboard = build_dashboard()
+
+    # Collect all data
+    results = collector.collect_all(service_configs)
+
+    if collector.timed_out:
+        print(f"Partial results - timed out: {', '.join(collector.timed_out)}")
+
+    record_snapshot(history, collector.values)
+    dispatch_alerts(alerts, collector.values)
+    if snapshots is not None:
+        snapshots.publish(results, collector.values)
+
+    print_results(results)
+    deliver(results, collector.values, detector, subscribers, dashboard)
+    if dashboard is not None:
+        dashboard.flush(timeout=60)
+
+def run_daemon(snapshots=None):
+    """Keep services in memory and poll each source on its own schedule"""
+    subscribers = build_subscribers()
+    service_configs = subscribers.service_configs(SERVICE_CONFIGS) if subscribers else SERVICE_CONFIGS
+    collector = build_collector(service_configs=service_configs)
+    calendar = MarketCalendar(MARKET_HOLIDAYS)
+    scheduler = PollScheduler(tick=POLL_TICK)
+    detector = build_change_detector()
+    history = build_snapshot_store()
+    alerts = build_alert_engine()
+    dashboard = build_dashboard()
+    listener = start_command_listener(collector)
+
+    # Latest good value per source, updated as each source is polled
+    latest = {}
+    latest_values = {}
+    # UTC date of the history partition being written; finished days are compacted on rollover
+    history_date = utc_date()
+
+    def poll(names):
+        nonlocal history_date
+        print(f"\nPolling: {', '.join(names)}")
+        results = collector.collect_all(service_configs, only=names)
+        latest.update({name: data for name, data in results.items() if data is not None})
+        latest_values.update(collector.values)
+        record_snapshot(history, collector.values)
+        if history is not None and utc_date() != history_date:
+            history_date = utc_date()
+            compact_snapshots(history)
+        dispatch_alerts(alerts, latest_values)
+        if snapshots is not None:
+            snapshots.publish(results, collector.values)
+        if listener is not None:
+            # Commands for polled symbols are answered without another fetch
+            listener.queries.prime(results)
+
+        # Keep the combined message in the usual section order
+        ordered = {name: latest[name] for name in collector.get_service_names() if name in latest}
+        print_results(ordered)
+        deliver(ordered, latest_values, detector, subscribers, dashboard)
+
+    # Warm snapshot of every source, then hand over to the scheduler
+    poll([name for name, config in collector.services.items() if config['enabled']])
+
+    poll_plan = {
+        'stock': (STOCK_POLL_INTERVAL, calendar.is_open),
+        'vnindex': (VNINDEX_POLL_INTERVAL, calendar.is_open),
+        'crypto': (CRYPTO_POLL_INTERVAL, None),
+        'exchange': (EXCHANGE_POLL_INTERVAL, None),
+        'gold': (GOLD_POLL_INTERVAL, None),
+    }
+    # Polling stops at 15:00 sharp; one more poll after the close picks up the ATC prices
+    closing_polls = {name: calendar.after_close(MARKET_CLOSE_GRACE_MINUTES) for name in ('stock', 'vnindex')}
+    for name, (interval, is_active) in poll_plan.items():
+        if collector.services.get(name, {}).get('enabled'):
+            scheduler.add_job(name, interval, is_active, run_now=False, extra_run=closing_polls.get(name))
+
+    def refresh(names):
+        for name in names:
+            scheduler.request(name)
+
+    if snapshots is not None:
+        # Stale API reads pull the source's next poll forward instead of fetching themselves
+        snapshots.max_age = {name: interval for name, (interval, _) in poll_plan.items()}
+        snapshots.revalidate = refresh
+
+    def shutdown(signum, frame):
+        print("Shutdown requested, finishing current poll...")
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print("Daemon running. Press Ctrl+C to stop.")
+    scheduler.run(poll)
+
+    if dashboard is not None:
+        # The last update may still be waiting out its edit interval
+        dashboard.flush(timeout=DASHBOARD_EDIT_INTERVAL + 30)
+    if listener is not None:
+        from utils.async_runner import run_sync
+        run_sync(listener.stop(), timeout=10)
+
+def run_scan(snapshots=None):
+    """Price every listed stock across worker processes and merge them into one snapshot"""
+    import json
+    import os
+    import time
+    from services.core.scanner import MarketScanner
+    from services.data_sources.universe import load_universe
+
+    symbols = load_universe(SCAN_EXCHANGES, response_cache=get_response_cache(), ttl=SCAN_UNIVERSE_TTL)
+    print(f"Scanning {len(symbols)} symbols on {', '.join(SCAN_EXCHANGES)} with {SCAN_WORKERS} workers...")
+
+    start = time.monotonic()
+    scanner = MarketScanner(
+        workers=SCAN_WORKERS,
+        shard_size=SCAN_SHARD_SIZE,
+        rate=SCAN_RATE_LIMIT,
+        burst=SCAN_RATE_BURST,
+        service_options={
+            'batch_size': STOCK_BOARD_BATCH_SIZE,
+            'history_workers': STOCK_HISTORY_WORKERS,
+            'bar_store_path': BAR_STORE_PATH if BAR_STORE_ENABLED else None,
+        }
+    )
+    lines, values = scanner.scan(symbols)
+    print(f"Priced {len(values)}/{len(symbols)} symbols in {time.monotonic() - start:.1f}s")
+    if scanner.failed:
+        print(f"Failed shards covered {len(scanner.failed)} symbols")
+
+    results = {'stock': lines}
+    all_values = {'stock': values}
+    record_snapshot(build_snapshot_store(), all_values)
+    dispatch_alerts(build_alert_engine(), all_values)
+    if snapshots is not None:
+        snapshots.publish(results, all_values)
+
+    # Too long for a chat message: the merged snapshot goes to disk instead
+    directory = os.path.dirname(SCAN_OUTPUT_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{SCAN_OUTPUT_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'scanned_at': time.time(), 'symbols': values}, f)
+    os.replace(tmp_path, SCAN_OUTPUT_PATH)
+    print(f"Scan snapshot written to {SCAN_OUTPUT_PATH}")
+
+def main():
+    print("Starting Vietnam market data bot...")
+    snapshots = build_snapshot_cache()
+    server = start_http_server(snapshots)
+
+    if RUN_MODE == 'daemon' or '--daemon' in sys.argv:
+        run_daemon(snapshots)
+    elif RUN_MODE == 'scan' or '--scan' in sys.argv:
+        run_scan(snapshots)
+    else:
+        run_once(snapshots)
+
+    if server is not None:
+        server.stop()
+
     print("Vietnam market data bot finished.")
 
 if __name__ == "__main__":
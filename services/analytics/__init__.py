@@ -0,0 +1,8 @@
+"""
+Analytics computed on top of collected market data
+"""
+
+# Indicator fields written to last_values; all of them move with the price
+INDICATOR_FIELD_PREFIXES = ('sma_', 'ema_', 'rsi', 'macd', 'bb_', 'vol_avg')
+# Intraday session fields (range, volume, move within the current bars)
+INTRADAY_FIELD_PREFIXES = ('day_', 'move_')
@@ -0,0 +1,291 @@
+"""
+Price alert rules compiled into a per-symbol index
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+Values = Dict[str, Dict[str, Dict[str, float]]]
+Key = Tuple[str, str]
+
+RULE_TYPES = ('threshold', 'cross', 'pct_move', 'spread')
+
+# Fields a pct_move is measured from, in order of preference: the previous
+# session's close (stocks, VN-Index), then the session open (intraday)
+REFERENCE_FIELDS = ('prev_close', 'day_open')
+
+class AlertRule:
+    """
+    One compiled rule.
+
+    - threshold: value is above/below a level (fires when it gets there)
+    - cross: value crosses a level in a direction (up, down or any);
+      nothing fires until the value has been seen on the other side
+    - pct_move: value moved `pct` percent from the previous close (or
+      session open); without either, from the first value seen that day.
+      It fires once on the way there and re-arms when the move falls back
+    - spread: value minus `factor` times another value is above/below a level
+    """
+    __slots__ = ('id', 'type', 'asset', 'symbol', 'field', 'other', 'factor',
+                 'level', 'targets', 'pct', 'chat_id', 'name')
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.type = spec.get('type')
+        if self.type not in RULE_TYPES:
+            raise ValueError(f"unknown rule type {self.type!r}")
+
+        self.asset = spec['asset']
+        self.symbol = spec['symbol']
+        self.field = spec['field']
+        self.other: Optional[Tuple[str, str, str]] = None
+        self.factor = float(spec.get('factor', 1.0))
+        self.level: Optional[float] = None
+        self.targets: Tuple[str, ...] = ()
+        self.pct: Optional[float] = None
+
+        if self.type == 'pct_move':
+            self.pct = float(spec['pct'])
+        elif self.type == 'cross':
+            self.level = float(spec['level'])
+            direction = spec.get('direction', 'any')
+            self.targets = {'up': ('above',), 'down': ('below',), 'any': ('above', 'below')}[direction]
+        else:
+            if 'above' in spec:
+                self.level, self.targets = float(spec['above']), ('above',)
+            elif 'below' in spec:
+                self.level, self.targets = float(spec['below']), ('below',)
+            else:
+                raise ValueError(f"{self.type} rule needs 'above' or 'below'")
+
+        if self.type == 'spread':
+            other = spec['other']
+            self.other = (other.get('asset', self.asset), other.get('symbol', self.symbol), other['field'])
+
+        self.chat_id = str(spec['chat_id']) if spec.get('chat_id') is not None else None
+        self.id = str(spec.get('id') or self._default_id())
+        self.name = spec.get('name') or self._default_name()
+
+    def _default_id(self) -> str:
+        parts = [self.type, self.asset, self.symbol, self.field, self.level, self.pct, self.targets, self.chat_id]
+        if self.other:
+            parts.append(self.other)
+        return ':'.join(str(part) for part in parts if part is not None)
+
+    def _default_name(self) -> str:
+        if self.type == 'spread':
+            other_asset, other_symbol, other_field = self.other
+            other = other_field if (other_asset, other_symbol) == (self.asset, self.symbol) else f"{other_symbol} {other_field}"
+            return f"{self.symbol} {self.field}-{other} spread"
+        return f"{self.symbol} {self.field}"
+
+    @property
+    def keys(self) -> List[Key]:
+        """Symbols whose changes can affect this rule"""
+        keys = [(self.asset, self.symbol)]
+        if self.other and self.other[:2] not in keys:
+            keys.append(self.other[:2])
+        return keys
+
+    def measure(self, values: Values) -> Optional[float]:
+        """The value this rule watches, or None if any input is missing"""
+        value = values.get(self.asset, {}).get(self.symbol, {}).get(self.field)
+        if value is None or self.other is None:
+            return value
+
+        other_asset, other_symbol, other_field = self.other
+        other = values.get(other_asset, {}).get(other_symbol, {}).get(other_field)
+        if other is None:
+            return None
+        return value - self.factor * other
+
+    def reference(self, values: Values) -> Optional[float]:
+        """Base of a pct_move from the symbol's own values, or None if the service has none"""
+        fields = values.get(self.asset, {}).get(self.symbol, {})
+        for field in REFERENCE_FIELDS:
+            if fields.get(field):
+                return fields[field]
+        return None
+
+class Alert:
+    """A fired rule ready to be sent"""
+    __slots__ = ('rule_id', 'chat_id', 'text')
+
+    def __init__(self, rule_id: str, chat_id: Optional[str], text: str):
+        self.rule_id = rule_id
+        self.chat_id = chat_id
+        self.text = text
+
+class AlertEngine:
+    """
+    Evaluates rules against collected values.
+
+    Rules are indexed by (asset, symbol); each evaluation only looks at the
+    rules of symbols whose values changed since the previous one. Level
+    rules re-arm only after the value moves back past the level by
+    `hysteresis` percent, and no rule fires twice within `cooldown` seconds.
+    Rule state is persisted so one-shot runs behave like the daemon.
+    """
+
+    def __init__(self, rules: List[AlertRule], state_path: Optional[str] = None,
+                 cooldown: float = 3600, hysteresis: float = 0.5):
+        self.rules = rules
+        self.state_path = state_path
+        self.cooldown = cooldown
+        self.hysteresis = hysteresis
+        self.index: Dict[Key, List[AlertRule]] = {}
+        for rule in rules:
+            for key in rule.keys:
+                self.index.setdefault(key, []).append(rule)
+
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self._seen: Dict[Key, Dict[str, float]] = {}
+        self._load()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'AlertEngine':
+        """Load rules from a JSON list; invalid rules are reported and skipped"""
+        with open(path, encoding='utf-8') as f:
+            specs = json.load(f)
+
+        rules = []
+        for position, spec in enumerate(specs):
+            try:
+                rules.append(AlertRule(spec))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping alert rule #{position + 1} in {path}: {e}")
+
+        print(f"Loaded {len(rules)} alert rules from {path}")
+        return cls(rules, **kwargs)
+
+    def _load(self):
+        """Restore rule state from disk"""
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable alert state {self.state_path}: {e}")
+
+    def _save(self):
+        """Persist rule state atomically"""
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def changed_keys(self, values: Values) -> List[Key]:
+        """Indexed symbols whose values differ from the previous evaluation"""
+        changed = []
+        for asset, symbols in values.items():
+            for symbol, fields in symbols.items():
+                key = (asset, symbol)
+                if key in self.index and self._seen.get(key) != fields:
+                    changed.append(key)
+                    self._seen[key] = dict(fields)
+        return changed
+
+    def evaluate(self, values: Values, now: Optional[float] = None) -> List[Alert]:
+        """Alerts fired by the symbols that changed in `values`"""
+        now = time.time() if now is None else now
+        alerts = []
+        evaluated = set()
+        dirty = False
+
+        for key in self.changed_keys(values):
+            for rule in self.index[key]:
+                if rule.id in evaluated:
+                    continue
+                evaluated.add(rule.id)
+
+                value = rule.measure(values)
+                if value is None:
+                    continue
+
+                state = self.state.setdefault(rule.id, {})
+                before = dict(state)
+                if rule.type == 'pct_move':
+                    text = self._check_move(rule, value, rule.reference(values), state, now)
+                else:
+                    text = self._check(rule, value, state, now)
+                dirty = dirty or state != before
+
+                if text:
+                    alerts.append(Alert(rule.id, rule.chat_id, text))
+
+        if dirty:
+            self._save()
+        return alerts
+
+    def _check(self, rule: AlertRule, value: float, state: Dict[str, Any], now: float) -> Optional[str]:
+        """Update one level rule's state with a new value; returns the alert text if it fired"""
+        side = state.get('side')
+        new_side = self._next_side(side, value, rule.level, rule.targets)
+
+        # A cross needs a known starting side; a threshold fires as soon as it holds
+        if new_side == side or new_side not in rule.targets or (side is None and rule.type == 'cross'):
+            state['side'] = new_side
+            return None
+        if self._cooling(state, now):
+            # Keep the old side so the move is still reported once the cooldown ends
+            return None
+
+        state['side'] = new_side
+        state['last_fired'] = now
+        verb = 'crossed' if rule.type == 'cross' else 'is'
+        return f"{rule.name} {value:,.2f} {verb} {new_side} {rule.level:,.2f}"
+
+    def _check_move(self, rule: AlertRule, value: float, reference: Optional[float],
+                    state: Dict[str, Any], now: float) -> Optional[str]:
+        """Update a pct_move rule: the move from its reference is checked like a level at `pct` percent"""
+        # Market date (UTC+7); the fallback reference and the rule's side start over each day
+        session = (datetime.utcfromtimestamp(now) + timedelta(hours=7)).strftime('%Y-%m-%d')
+        if state.get('session') != session:
+            state.pop('reference', None)
+            state.pop('side', None)
+            state['session'] = session
+
+        if not reference:
+            reference = state.setdefault('reference', value)
+            if not reference:
+                return None
+
+        move = (value - reference) / abs(reference) * 100
+        targets = ('below',) if rule.pct < 0 else ('above',)
+        side = state.get('side')
+        new_side = self._next_side(side, move, rule.pct, targets)
+
+        if new_side == side or new_side not in targets:
+            state['side'] = new_side
+            return None
+        if self._cooling(state, now):
+            return None
+
+        state['side'] = new_side
+        state['last_fired'] = now
+        return f"{rule.name} {value:,.2f} ({move:+.2f}% from {reference:,.2f})"
+
+    def _cooling(self, state: Dict[str, Any], now: float) -> bool:
+        return now - state.get('last_fired', 0) < self.cooldown
+
+    def _next_side(self, side: Optional[str], value: float, level: float, targets: Tuple[str, ...]) -> str:
+        """Which side of the level the value is on, leaving a target side only past the hysteresis band"""
+        margin = abs(level) * self.hysteresis / 100
+
+        if side == 'above':
+            limit = level - (margin if 'above' in targets else 0)
+            return 'below' if value < limit else 'above'
+        if side == 'below':
+            limit = level + (margin if 'below' in targets else 0)
+            return 'above' if value > limit else 'below'
+        return 'above' if value >= level else 'below'
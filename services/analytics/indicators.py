@@ -0,0 +1,250 @@
+"""
+Incremental technical indicators over a (symbol x time) price matrix
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+def align_bars(bars_by_symbol: Dict[str, List[Dict]], symbols: Sequence[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Align daily bars of many symbols on one date axis.
+
+    Returns (dates, closes, volumes) with closes/volumes shaped
+    (len(symbols), len(dates)); days a symbol did not trade are NaN.
+    """
+    dates = sorted({bar['date'] for bars in bars_by_symbol.values() for bar in bars})
+    column = {date: i for i, date in enumerate(dates)}
+    closes = np.full((len(symbols), len(dates)), np.nan)
+    volumes = np.full((len(symbols), len(dates)), np.nan)
+
+    for row, symbol in enumerate(symbols):
+        for bar in bars_by_symbol.get(symbol, []):
+            i = column[bar['date']]
+            closes[row, i] = bar['close'] if bar.get('close') is not None else np.nan
+            volumes[row, i] = bar['volume'] if bar.get('volume') is not None else np.nan
+
+    return dates, closes, volumes
+
+class IndicatorEngine:
+    """
+    SMA, EMA, RSI, MACD, Bollinger bands and average volume for many symbols.
+
+    Every indicator is kept as running state (rolling sums over a ring buffer,
+    EMA and Wilder averages), so a new bar costs one vectorized step across
+    all symbols instead of recomputing the window. The newest bar stays
+    pending while it is still trading: update() previews it with the latest
+    price and only commits it once a bar with a later date arrives.
+    """
+
+    def __init__(self, symbols: Sequence[str], sma_periods: Iterable[int] = (20, 50),
+                 ema_periods: Iterable[int] = (12, 26), rsi_period: int = 14,
+                 macd_periods: Tuple[int, int, int] = (12, 26, 9), bollinger_period: int = 20,
+                 bollinger_std: float = 2.0, volume_period: int = 20):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.sma_periods = sorted(set(sma_periods))
+        self.ema_periods = sorted(set(ema_periods))
+        self.rsi_period = rsi_period
+        self.macd_periods = macd_periods
+        self.bollinger_period = bollinger_period
+        self.bollinger_std = bollinger_std
+        self.volume_period = volume_period
+
+        self.rolling_periods = sorted(set(self.sma_periods) | {bollinger_period})
+        self.ema_all = sorted(set(self.ema_periods) | set(macd_periods[:2]))
+        # Bars kept in the ring buffer: enough to drop the oldest value of any window
+        self.window = max(self.rolling_periods + [volume_period])
+
+        n = len(self.symbols)
+        self._closes = np.full((n, self.window), np.nan)
+        self._volumes = np.full((n, self.window), np.nan)
+        self._pos = 0
+        self._state = self._empty_state(n)
+
+        self.as_of: Optional[str] = None
+        self.pending_date: Optional[str] = None
+        self._pending_closes: Optional[np.ndarray] = None
+        self._pending_volumes: Optional[np.ndarray] = None
+
+    @property
+    def warmup_bars(self) -> int:
+        """Bars needed before every indicator is defined"""
+        slow, signal = self.macd_periods[1], self.macd_periods[2]
+        return max(self.window, slow + signal, self.rsi_period + 1)
+
+    def _empty_state(self, n: int) -> Dict[str, np.ndarray]:
+        nan = np.full(n, np.nan)
+        zero = np.zeros(n)
+        state = {
+            'prev_close': nan.copy(), 'avg_gain': zero.copy(), 'avg_loss': zero.copy(), 'rsi_n': zero.copy(),
+            'macd_signal': nan.copy(), 'vol_sum': zero.copy(), 'vol_cnt': zero.copy(),
+        }
+        for p in self.rolling_periods:
+            state[f'sum_{p}'] = zero.copy()
+            state[f'sumsq_{p}'] = zero.copy()
+            state[f'cnt_{p}'] = zero.copy()
+        for p in self.ema_all:
+            state[f'ema_{p}'] = nan.copy()
+        return state
+
+    def seed(self, closes: np.ndarray, volumes: Optional[np.ndarray] = None, as_of: Optional[str] = None):
+        """Load closed history (symbols x time, oldest first) one vectorized step per bar"""
+        closes = np.asarray(closes, dtype=float)
+        volumes = np.full_like(closes, np.nan) if volumes is None else np.asarray(volumes, dtype=float)
+
+        for t in range(closes.shape[1]):
+            self.append(closes[:, t], volumes[:, t])
+        self.as_of = as_of
+
+    def append(self, closes: np.ndarray, volumes: Optional[np.ndarray] = None, date: Optional[str] = None):
+        """Commit one closed bar for every symbol"""
+        closes = np.asarray(closes, dtype=float)
+        volumes = np.full_like(closes, np.nan) if volumes is None else np.asarray(volumes, dtype=float)
+
+        self._state, _ = self._step(closes, volumes)
+        self._closes[:, self._pos] = closes
+        self._volumes[:, self._pos] = volumes
+        self._pos = (self._pos + 1) % self.window
+        if date is not None:
+            self.as_of = date
+
+        # Rebuild the rolling sums from the buffer once per lap so float error never accumulates
+        if self._pos == 0:
+            self._resync_sums()
+
+    def update(self, closes: np.ndarray, volumes: Optional[np.ndarray] = None,
+               date: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Indicators with `closes` as the current (still open) bar.
+
+        A later `date` than the pending bar's commits the pending bar first;
+        the same or no date replaces the pending bar. NaN keeps the pending
+        value for that symbol.
+        """
+        closes = np.asarray(closes, dtype=float)
+        volumes = np.full_like(closes, np.nan) if volumes is None else np.asarray(volumes, dtype=float)
+
+        if self._pending_closes is not None and date is not None and self.pending_date is not None \
+                and date > self.pending_date:
+            self.append(self._pending_closes, self._pending_volumes, self.pending_date)
+            self._pending_closes = None
+            self._pending_volumes = None
+
+        if self._pending_closes is not None:
+            closes = np.where(np.isnan(closes), self._pending_closes, closes)
+            volumes = np.where(np.isnan(volumes), self._pending_volumes, volumes)
+
+        self._pending_closes = closes
+        self._pending_volumes = volumes
+        if date is not None or self.pending_date is None:
+            self.pending_date = date
+
+        _, outputs = self._step(closes, volumes)
+        return outputs
+
+    def values(self, outputs: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """Per-symbol dicts of the defined indicators from update()'s output"""
+        result = {}
+        for symbol, i in self.index.items():
+            fields = {name: float(column[i]) for name, column in outputs.items() if not np.isnan(column[i])}
+            if fields:
+                result[symbol] = fields
+        return result
+
+    def _oldest(self, buffer: np.ndarray, period: int) -> np.ndarray:
+        """Values leaving a `period` window when the next bar is added"""
+        return buffer[:, (self._pos - period) % self.window]
+
+    def _step(self, closes: np.ndarray, volumes: np.ndarray) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Advance every indicator by one bar without touching the committed state"""
+        state = self._state
+        new = {}
+        out = {}
+
+        valid = ~np.isnan(closes)
+        x = np.where(valid, closes, 0.0)
+
+        # Rolling windows: add the new bar, drop the one leaving the window
+        for p in self.rolling_periods:
+            old = self._oldest(self._closes, p)
+            old_valid = ~np.isnan(old)
+            old_x = np.where(old_valid, old, 0.0)
+            new[f'sum_{p}'] = state[f'sum_{p}'] + x - old_x
+            new[f'sumsq_{p}'] = state[f'sumsq_{p}'] + x * x - old_x * old_x
+            new[f'cnt_{p}'] = state[f'cnt_{p}'] + valid - old_valid
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for p in self.sma_periods:
+                full = new[f'cnt_{p}'] == p
+                out[f'sma_{p}'] = np.where(full, new[f'sum_{p}'] / p, np.nan)
+
+            b = self.bollinger_period
+            mean = new[f'sum_{b}'] / b
+            std = np.sqrt(np.maximum(new[f'sumsq_{b}'] / b - mean * mean, 0.0))
+            full = new[f'cnt_{b}'] == b
+            out['bb_mid'] = np.where(full, mean, np.nan)
+            out['bb_upper'] = np.where(full, mean + self.bollinger_std * std, np.nan)
+            out['bb_lower'] = np.where(full, mean - self.bollinger_std * std, np.nan)
+
+            # Average volume; an unknown volume for the open bar keeps the committed average
+            v = self.volume_period
+            v_valid = ~np.isnan(volumes)
+            old = self._oldest(self._volumes, v)
+            old_valid = ~np.isnan(old)
+            new['vol_sum'] = state['vol_sum'] + np.where(v_valid, volumes, 0.0) - np.where(old_valid, old, 0.0)
+            new['vol_cnt'] = state['vol_cnt'] + v_valid - old_valid
+            stepped = np.where(new['vol_cnt'] == v, new['vol_sum'] / v, np.nan)
+            committed = np.where(state['vol_cnt'] == v, state['vol_sum'] / v, np.nan)
+            out['vol_avg'] = np.where(v_valid, stepped, committed)
+
+        # Exponential averages seeded with the first price
+        for p in self.ema_all:
+            new[f'ema_{p}'] = self._ema(state[f'ema_{p}'], closes, 2.0 / (p + 1))
+        for p in self.ema_periods:
+            out[f'ema_{p}'] = new[f'ema_{p}']
+
+        fast, slow, signal = self.macd_periods
+        macd = new[f'ema_{fast}'] - new[f'ema_{slow}']
+        new['macd_signal'] = self._ema(state['macd_signal'], macd, 2.0 / (signal + 1))
+        out['macd'] = macd
+        out['macd_signal'] = new['macd_signal']
+        out['macd_hist'] = macd - new['macd_signal']
+
+        # RSI with Wilder smoothing (simple mean over the first period)
+        diff = closes - state['prev_close']
+        has_diff = ~np.isnan(diff)
+        gain = np.where(has_diff, np.maximum(diff, 0.0), 0.0)
+        loss = np.where(has_diff, np.maximum(-diff, 0.0), 0.0)
+        n = state['rsi_n']
+        divisor = np.where(n < self.rsi_period, n + 1, self.rsi_period)
+        new['avg_gain'] = np.where(has_diff, state['avg_gain'] + (gain - state['avg_gain']) / divisor, state['avg_gain'])
+        new['avg_loss'] = np.where(has_diff, state['avg_loss'] + (loss - state['avg_loss']) / divisor, state['avg_loss'])
+        new['rsi_n'] = n + has_diff
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(new['avg_loss'] == 0, 100.0, 100.0 - 100.0 / (1.0 + new['avg_gain'] / new['avg_loss']))
+        out['rsi'] = np.where(new['rsi_n'] >= self.rsi_period, rsi, np.nan)
+        new['prev_close'] = np.where(valid, closes, state['prev_close'])
+
+        return new, out
+
+    @staticmethod
+    def _ema(previous: np.ndarray, values: np.ndarray, alpha: float) -> np.ndarray:
+        """One EMA step; NaN inputs keep the previous value, the first value seeds it"""
+        stepped = np.where(np.isnan(previous), values, previous + alpha * (values - previous))
+        return np.where(np.isnan(values), previous, stepped)
+
+    def _resync_sums(self):
+        """Recompute rolling sums exactly from the ring buffer"""
+        for p in self.rolling_periods:
+            window = self._window(self._closes, p)
+            self._state[f'sum_{p}'] = np.nansum(window, axis=1)
+            self._state[f'sumsq_{p}'] = np.nansum(window * window, axis=1)
+            self._state[f'cnt_{p}'] = np.sum(~np.isnan(window), axis=1).astype(float)
+
+        window = self._window(self._volumes, self.volume_period)
+        self._state['vol_sum'] = np.nansum(window, axis=1)
+        self._state['vol_cnt'] = np.sum(~np.isnan(window), axis=1).astype(float)
+
+    def _window(self, buffer: np.ndarray, period: int) -> np.ndarray:
+        """The last `period` committed columns of a ring buffer"""
+        columns = [(self._pos - k) % self.window for k in range(1, period + 1)]
+        return buffer[:, columns]
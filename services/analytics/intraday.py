@@ -0,0 +1,176 @@
+"""
+Intraday OHLCV bars built on the fly from ticks or 1-minute bars
+"""
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+# Bar fields in each ring buffer entry: [start, open, high, low, close, volume, time of the close]
+START, OPEN, HIGH, LOW, CLOSE, VOLUME, CLOSE_TIME = range(7)
+Tick = Tuple[float, float, float]  # (epoch seconds, price, volume)
+
+class _SymbolBars:
+    __slots__ = ('day', 'series')
+
+    def __init__(self, timeframes: Tuple[int, ...], capacity: int):
+        self.day: Optional[str] = None
+        self.series: Dict[int, Deque[list]] = {seconds: deque(maxlen=capacity) for seconds in timeframes}
+
+class IntradayBars:
+    """
+    1m, 5m and 15m (configurable) bars per symbol in bounded ring buffers.
+
+    1-minute bars are the source of truth: ticks update them, and each
+    touched 5m/15m bucket is re-rolled from its 1-minute bars once per
+    batch. Late ticks still land in their minute while it is buffered.
+    Everything is cleared when a new trading day starts.
+    """
+
+    def __init__(self, timeframes: Iterable[int] = (60, 300, 900), capacity: int = 400):
+        self.timeframes = tuple(sorted(set(timeframes) | {60}))
+        # The 1m buffer must hold at least one bucket of the longest timeframe
+        self.capacity = max(capacity, max(self.timeframes) // 60)
+        self._symbols: Dict[str, _SymbolBars] = {}
+
+    def _bars_for(self, symbol: str, ts: float) -> _SymbolBars:
+        bars = self._symbols.get(symbol)
+        if bars is None:
+            bars = self._symbols[symbol] = _SymbolBars(self.timeframes, self.capacity)
+
+        day = datetime.utcfromtimestamp(ts).strftime('%Y-%m-%d')
+        if bars.day != day:
+            for series in bars.series.values():
+                series.clear()
+            bars.day = day
+        return bars
+
+    def add_ticks(self, symbol: str, ticks: Iterable[Tick]) -> int:
+        """Fold trades into the 1-minute bars; returns how many were applied"""
+        applied = 0
+        touched: Set[float] = set()
+        bars = None
+
+        for ts, price, volume in ticks:
+            if price != price or price <= 0:
+                continue
+            bars = self._bars_for(symbol, ts)
+            minute = ts - ts % 60
+            bar = self._find(bars.series[60], minute)
+
+            if bar is None:
+                if not self._insert(bars.series[60], [minute, price, price, price, price, volume or 0.0, ts]):
+                    continue
+            else:
+                bar[HIGH] = max(bar[HIGH], price)
+                bar[LOW] = min(bar[LOW], price)
+                # A late tick never replaces a newer close
+                if ts >= bar[CLOSE_TIME]:
+                    bar[CLOSE], bar[CLOSE_TIME] = price, ts
+                bar[VOLUME] += volume or 0.0
+            touched.add(minute)
+            applied += 1
+
+        if bars is not None:
+            self._roll_up(bars, touched)
+        return applied
+
+    def upsert_minutes(self, symbol: str, minutes: Iterable[Tuple[float, float, float, float, float, float]]) -> int:
+        """Insert or replace whole 1-minute bars (start, open, high, low, close, volume)"""
+        written = 0
+        touched: Set[float] = set()
+        bars = None
+
+        for start, open_, high, low, close, volume in minutes:
+            if close != close:
+                continue
+            bars = self._bars_for(symbol, start)
+            minute = start - start % 60
+            row = [minute, open_, high, low, close, volume if volume == volume else 0.0, minute]
+            bar = self._find(bars.series[60], minute)
+            if bar is not None:
+                bar[:] = row
+            elif not self._insert(bars.series[60], row):
+                continue
+            touched.add(minute)
+            written += 1
+
+        if bars is not None:
+            self._roll_up(bars, touched)
+        return written
+
+    @staticmethod
+    def _find(series: Deque[list], start: float) -> Optional[list]:
+        """The bar starting at `start`, searching from the newest"""
+        for bar in reversed(series):
+            if bar[START] == start:
+                return bar
+            if bar[START] < start:
+                return None
+        return None
+
+    @staticmethod
+    def _insert(series: Deque[list], bar: list) -> bool:
+        """Append a bar, or slot an out-of-order one into place; False if it is older than the buffer"""
+        if not series or series[-1][START] < bar[START]:
+            series.append(bar)
+            return True
+        if len(series) == series.maxlen and bar[START] < series[0][START]:
+            return False
+
+        position = len(series)
+        while position > 0 and series[position - 1][START] > bar[START]:
+            position -= 1
+        series.insert(position, bar)
+        return True
+
+    def _roll_up(self, bars: _SymbolBars, minutes: Set[float]):
+        """Rebuild every longer bar that contains a touched minute"""
+        minute_bars = bars.series[60]
+        for seconds in self.timeframes:
+            if seconds == 60:
+                continue
+            for bucket in sorted({minute - minute % seconds for minute in minutes}):
+                members = [bar for bar in minute_bars if bucket <= bar[START] < bucket + seconds]
+                if not members:
+                    continue
+                row = [bucket, members[0][OPEN], max(bar[HIGH] for bar in members),
+                       min(bar[LOW] for bar in members), members[-1][CLOSE], sum(bar[VOLUME] for bar in members)]
+                bar = self._find(bars.series[seconds], bucket)
+                if bar is not None:
+                    bar[:] = row
+                else:
+                    self._insert(bars.series[seconds], row)
+
+    def bars(self, symbol: str, seconds: int = 60, limit: Optional[int] = None) -> List[Dict[str, float]]:
+        """Buffered bars of one timeframe, oldest first (the last one may still be forming)"""
+        bars = self._symbols.get(symbol)
+        if bars is None or seconds not in bars.series:
+            return []
+        rows = list(bars.series[seconds])[-limit:] if limit else list(bars.series[seconds])
+        return [dict(zip(('start', 'open', 'high', 'low', 'close', 'volume'), row)) for row in rows]
+
+    def last_time(self, symbol: str) -> Optional[float]:
+        """Start of the newest 1-minute bar"""
+        bars = self._symbols.get(symbol)
+        if bars is None or not bars.series[60]:
+            return None
+        return bars.series[60][-1][START]
+
+    def summary(self, symbol: str) -> Dict[str, float]:
+        """Session price, range and volume plus the move within the current 5m/15m bars"""
+        bars = self._symbols.get(symbol)
+        if bars is None or not bars.series[60]:
+            return {}
+
+        minute_bars = bars.series[60]
+        values = {
+            'price': minute_bars[-1][CLOSE],
+            'day_open': minute_bars[0][OPEN],
+            'day_high': max(bar[HIGH] for bar in minute_bars),
+            'day_low': min(bar[LOW] for bar in minute_bars),
+            'day_volume': sum(bar[VOLUME] for bar in minute_bars),
+        }
+        for seconds, series in bars.series.items():
+            if seconds != 60 and series and series[-1][OPEN]:
+                values[f"move_{seconds // 60}m"] = (series[-1][CLOSE] / series[-1][OPEN] - 1) * 100
+        return values
@@ -0,0 +1,83 @@
+"""
+Minimal HTTP server for metrics and read-only endpoints
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+# handler(path, request_headers) -> (status, response_headers, body)
+RouteHandler = Callable[[str, Mapping[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+class ApiServer:
+    """Serves registered routes on a background thread"""
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 8080):
+        self.host = host
+        self.port = port
+        self.routes: Dict[str, RouteHandler] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def add_route(self, path: str, handler: RouteHandler):
+        """Register a handler for an exact path, or for a prefix when path ends with '/'"""
+        self.routes[path] = handler
+
+    def resolve(self, path: str) -> Optional[RouteHandler]:
+        """Exact match first, then the longest matching prefix route"""
+        if path in self.routes:
+            return self.routes[path]
+
+        prefixes = [route for route in self.routes if route.endswith('/') and path.startswith(route)]
+        return self.routes[max(prefixes, key=len)] if prefixes else None
+
+    def start(self):
+        """Start serving in a daemon thread"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                handler = server.resolve(path)
+
+                if handler is None:
+                    status, headers, body = 404, {'Content-Type': 'text/plain'}, b'Not found\n'
+                else:
+                    try:
+                        status, headers, body = handler(path, self.headers)
+                    except Exception as e:
+                        print(f"HTTP handler for {path} failed: {e}")
+                        status, headers, body = 500, {'Content-Type': 'text/plain'}, b'Internal error\n'
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the console
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="api-server", daemon=True).start()
+        print(f"HTTP server listening on {self.host}:{self.port}")
+
+    def stop(self):
+        """Stop serving"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+def metrics_route(path: str, headers: Mapping[str, str]):
+    """GET /metrics in Prometheus text format"""
+    from utils.metrics import render_metrics
+
+    content_type, body = render_metrics()
+    return 200, {'Content-Type': content_type}, body
+
+def health_route(path: str, headers: Mapping[str, str]):
+    """GET /healthz liveness probe"""
+    return 200, {'Content-Type': 'text/plain'}, b'ok\n'
@@ -0,0 +1,132 @@
+"""
+Latest collected snapshot served as JSON with ETag revalidation
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+ROUTE = '/api/snapshot'
+
+class SnapshotCache:
+    """
+    In-memory JSON views of the latest data, one per asset plus a combined one.
+
+    Bodies and ETags are built once when new data is published, so requests
+    only look up bytes. Requests never fetch: when an entry is older than
+    its max age the stale copy is served and `revalidate(assets)` is asked
+    (once until fresh data arrives) to refresh it in the background.
+    """
+
+    def __init__(self, assets: Optional[List[str]] = None, max_age: Optional[Dict[str, float]] = None,
+                 default_max_age: float = 300, revalidate: Optional[Callable[[List[str]], None]] = None):
+        # Enabled assets answer 503 until their first data instead of 404
+        self.assets = set(assets or [])
+        self.max_age = max_age or {}
+        self.default_max_age = default_max_age
+        self.revalidate = revalidate
+        self._lock = threading.Lock()
+        self._assets: Dict[str, Dict[str, Any]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._revalidating = set()
+
+    def publish(self, results: Dict[str, Any], values: Dict[str, Dict[str, Dict[str, float]]],
+                ts: Optional[float] = None):
+        """Replace the snapshot of every asset in `results` that has data"""
+        ts = time.time() if ts is None else ts
+
+        with self._lock:
+            for asset, data in results.items():
+                if data is None:
+                    continue
+                lines = data if isinstance(data, list) else [data]
+                self._assets[asset] = {
+                    'asset': asset,
+                    'updated_at': _iso(ts),
+                    'values': values.get(asset, {}),
+                    'lines': lines,
+                }
+                self._entries[asset] = self._entry(self._assets[asset], ts)
+                self._revalidating.discard(asset)
+
+            if self._assets:
+                newest = max(entry['updated_at'] for name, entry in self._entries.items() if name != '')
+                combined = {'updated_at': _iso(newest), 'assets': self._assets}
+                self._entries[''] = self._entry(combined, newest)
+
+    @staticmethod
+    def _entry(document: Dict[str, Any], ts: float) -> Dict[str, Any]:
+        """Serialize a document once and fingerprint it"""
+        body = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        return {'body': body, 'etag': etag, 'updated_at': ts}
+
+    def route(self, path: str, headers: Mapping[str, str]):
+        """GET /api/snapshot and /api/snapshot/<asset>"""
+        asset = path[len(ROUTE):].strip('/')
+
+        with self._lock:
+            entry = self._entries.get(asset)
+            known = asset == '' or asset in self.assets
+
+        if entry is None:
+            if known:
+                return 503, {'Content-Type': 'text/plain', 'Retry-After': '5'}, b'No data collected yet\n'
+            return 404, {'Content-Type': 'text/plain'}, b'Unknown asset\n'
+
+        age = max(0.0, time.time() - entry['updated_at'])
+        max_age = self._max_age(asset)
+        # The combined view checks each of its assets
+        if age > max_age or not asset:
+            self._request_refresh(asset)
+
+        response_headers = {
+            'ETag': entry['etag'],
+            'Age': str(int(age)),
+            'Cache-Control': f"max-age={int(max(0, max_age - age))}, stale-while-revalidate={int(max_age)}",
+        }
+
+        if _matches(headers.get('If-None-Match'), entry['etag']):
+            return 304, response_headers, b''
+
+        response_headers['Content-Type'] = 'application/json; charset=utf-8'
+        return 200, response_headers, entry['body']
+
+    def _max_age(self, asset: str) -> float:
+        """Max age of one asset; the combined view is as fresh as its fastest source"""
+        if asset:
+            return self.max_age.get(asset, self.default_max_age)
+        return min([self.max_age.get(name, self.default_max_age) for name in self._assets] or [self.default_max_age])
+
+    def _request_refresh(self, asset: str):
+        """Ask for a background refresh of stale assets, once until new data is published"""
+        if self.revalidate is None:
+            return
+
+        with self._lock:
+            if asset:
+                stale = [asset]
+            else:
+                now = time.time()
+                stale = [name for name in self._assets
+                         if now - self._entries[name]['updated_at'] > self._max_age(name)]
+            stale = [name for name in stale if name not in self._revalidating]
+            self._revalidating.update(stale)
+
+        if stale:
+            try:
+                self.revalidate(stale)
+            except Exception as e:
+                print(f"Snapshot refresh request failed: {e}")
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers this ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.replace('W/', '', 1) == etag for tag in tags)
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec='seconds')
@@ -2,7 +2,7 @@
 Abstract base class for market data services
 """
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from .exceptions import DataFetchError
 
 class BaseMarketDataService(ABC):
@@ -10,6 +10,8 @@ class BaseMarketDataService(ABC):
     
     def __init__(self, service_name: str):
         self.service_name = service_name
+        # Numeric values behind the last formatted result: {symbol: {field: value}}
+        self.last_values: Dict[str, Dict[str, float]] = {}
     
     @abstractmethod
     def fetch_data(self, *args, **kwargs) -> Any:
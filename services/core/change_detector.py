@@ -0,0 +1,94 @@
+"""
+Change detection between collected values and the last snapshot sent
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from services.analytics import INDICATOR_FIELD_PREFIXES, INTRADAY_FIELD_PREFIXES
+
+Values = Dict[str, Dict[str, Dict[str, float]]]
+
+# Fields derived from a price; they move whenever the price does
+DERIVED_FIELDS = {'change', 'change_pct'}
+
+class ChangeDetector:
+    """
+    Decides whether a new update is worth sending.
+
+    A section counts as changed when any of its values moved by at least the
+    section's threshold (in percent) since the last send, or when a symbol
+    appeared or disappeared. A heartbeat forces a send after a quiet period.
+    """
+
+    def __init__(self, state_path: str, thresholds: Optional[Dict[str, float]] = None,
+                 default_threshold: float = 0.0, heartbeat: float = 0):
+        self.state_path = state_path
+        self.thresholds = thresholds or {}
+        self.default_threshold = default_threshold
+        self.heartbeat = heartbeat
+        self.sent_values: Values = {}
+        self.last_sent_at = 0.0
+        self._load()
+
+    def _load(self):
+        """Restore the last sent snapshot from disk"""
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.sent_values = state.get('values', {})
+            self.last_sent_at = float(state.get('sent_at', 0))
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable change state {self.state_path}: {e}")
+
+    def _save(self):
+        """Persist the snapshot atomically so a crash never leaves half a file"""
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'values': self.sent_values, 'sent_at': self.last_sent_at}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def changed_sections(self, values: Values) -> List[str]:
+        """Sections whose values moved past their threshold since the last send"""
+        return [section for section, current in values.items() if self._section_changed(section, current)]
+
+    def _section_changed(self, section: str, current: Dict[str, Dict[str, float]]) -> bool:
+        previous = self.sent_values.get(section)
+        if previous is None or set(previous) != set(current):
+            return True
+
+        threshold = self.thresholds.get(section, self.default_threshold)
+        for symbol, fields in current.items():
+            for field, value in fields.items():
+                if field in DERIVED_FIELDS or field.startswith(INDICATOR_FIELD_PREFIXES + INTRADAY_FIELD_PREFIXES):
+                    continue
+                old = previous[symbol].get(field)
+                if old is None:
+                    return True
+                if value == old:
+                    continue
+                if old == 0 or abs(value - old) / abs(old) * 100 >= threshold:
+                    return True
+
+        return False
+
+    def heartbeat_due(self, now: Optional[float] = None) -> bool:
+        """True when nothing was sent for longer than the heartbeat interval"""
+        if not self.heartbeat:
+            return False
+        now = time.time() if now is None else now
+        return now - self.last_sent_at >= self.heartbeat
+
+    def commit(self, values: Values, sections: Optional[List[str]] = None):
+        """Record what was sent; only the given sections move their baseline"""
+        for section in (sections if sections is not None else list(values)):
+            if section in values:
+                self.sent_values[section] = values[section]
+        self.last_sent_at = time.time()
+        self._save()
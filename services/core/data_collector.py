@@ -1,57 +1,200 @@
 """
 Data collector that orchestrates fetching data from all sources
 """
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from utils.metrics import DATA_LAST_SUCCESS, FETCH_LATENCY, FETCH_TOTAL
 from .exceptions import DataFetchError
 
 class DataCollector:
     """Orchestrates data collection from multiple sources"""
-    
-    def __init__(self):
+
+    def __init__(self, parallel: bool = True, service_timeout: float = 20.0, deadline: float = 45.0):
         self.services = {}
         self.results = {}
-    
-    def register_service(self, name: str, service, enabled: bool = True):
-        """Register a data service"""
+        self.parallel = parallel
+        self.service_timeout = service_timeout
+        self.deadline = deadline
+        self.timed_out = []
+        self.values = {}
+
+    def register_service(self, name: str, service, enabled: bool = True, timeout: Optional[float] = None):
+        """Register a data service, optionally with its own timeout in seconds"""
         self.services[name] = {
             'service': service,
-            'enabled': enabled
+            'factory': None,
+            'enabled': enabled,
+            'timeout': timeout
+        }
+
+    def register_lazy_service(self, name: str, factory: Callable[[], Any], enabled: bool = True,
+                              timeout: Optional[float] = None):
+        """Register a service that is only built (and its module imported) on first use"""
+        self.services[name] = {
+            'service': None,
+            'factory': factory,
+            'enabled': enabled,
+            'timeout': timeout
         }
-    
-    def collect_all(self, service_configs: Dict[str, Any]) -> Dict[str, Any]:
-        """Collect data from all enabled services"""
+
+    def get_service(self, name: str):
+        """Get a registered service, building it first if it was registered lazily"""
+        config = self.services[name]
+        if config['service'] is None and config['factory'] is not None:
+            config['service'] = config['factory']()
+        return config['service']
+
+    def collect_all(self, service_configs: Dict[str, Any], parallel: Optional[bool] = None,
+                    only: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Collect data from all enabled services, or only the named ones"""
+        if parallel is None:
+            parallel = self.parallel
+
+        self.timed_out = []
+        selected = []
         results = {}
-        
+
         for name, config in self.services.items():
-            if not config['enabled']:
+            if not config['enabled'] or (only is not None and name not in only):
                 continue
-                
-            service = config['service']
-            service_config = service_configs.get(name, {})
-            
             try:
-                print(f"Fetching data from {service.service_name}...")
-                data = service.fetch_data(**service_config)
-                results[name] = data
-            except DataFetchError as e:
-                print(f"Failed to fetch from {service.service_name}: {e}")
-                results[name] = None
+                self.get_service(name)
+                selected.append((name, config))
             except Exception as e:
-                print(f"Unexpected error from {service.service_name}: {e}")
+                print(f"Failed to load service '{name}': {e}")
                 results[name] = None
-        
+
+        if parallel:
+            results.update(self._collect_parallel(selected, service_configs))
+        else:
+            results.update(self._collect_sequential(selected, service_configs))
+
+        # Keep registration order so consumers see the same layout as before
+        results = {name: results[name] for name in self.services if name in results}
+        self.results = results
+
+        # Numeric values behind each result, for change detection and alerts
+        self.values = {
+            name: dict(getattr(self.get_service(name), 'last_values', {}))
+            for name, data in results.items() if data is not None
+        }
+        return results
+
+    def _collect_sequential(self, selected, service_configs: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the selected services one after another"""
+        results = {}
+
+        for name, config in selected:
+            data, elapsed = self._fetch_one(name, config['service'], service_configs.get(name, {}))
+            self._record(name, config['service'], data, elapsed)
+            results[name] = data
+
         return results
-    
+
+    def _collect_parallel(self, selected, service_configs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch all selected services at once.
+
+        Each service gets its own timeout and the whole run is capped by the
+        global deadline. Services that miss their budget are reported as None
+        and listed in self.timed_out; the rest of the results are kept. A
+        timed-out fetch is only counted as a timeout, even if its thread
+        finishes later.
+        """
+        start = time.monotonic()
+        futures = {}
+        deadlines = {}
+
+        for name, config in selected:
+            future = self._spawn(name, config['service'], service_configs.get(name, {}))
+            timeout = config['timeout'] if config['timeout'] is not None else self.service_timeout
+            futures[future] = name
+            deadlines[future] = start + min(timeout, self.deadline)
+
+        collected = {}
+        pending = set(futures)
+
+        while pending:
+            now = time.monotonic()
+            expired = {future for future in pending if deadlines[future] <= now}
+
+            for future in expired:
+                name = futures[future]
+                service = self.services[name]['service']
+                print(f"Timed out waiting for {service.service_name} after {now - start:.1f}s")
+                FETCH_TOTAL.labels(name, 'timeout').inc()
+                self.timed_out.append(name)
+                future.cancel()
+
+            pending -= expired
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[future] for future in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                data, elapsed = future.result()
+                self._record(name, self.services[name]['service'], data, elapsed)
+                collected[name] = data
+            pending -= done
+
+        return {name: collected.get(name) for name in futures.values()}
+
+    def _spawn(self, name: str, service, service_config: Dict[str, Any]) -> Future:
+        """Run a fetch on a daemon thread so a hung upstream never blocks exit"""
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._fetch_one(name, service, service_config))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"collect-{name}", daemon=True).start()
+        return future
+
+    def _fetch_one(self, name: str, service, service_config: Dict[str, Any]) -> Tuple[Any, float]:
+        """Fetch a single service; returns its data (None on failure) and the seconds taken"""
+        start = time.monotonic()
+        data = None
+
+        try:
+            print(f"Fetching data from {service.service_name}...")
+            data = service.fetch_data(**service_config)
+        except DataFetchError as e:
+            print(f"Failed to fetch from {service.service_name}: {e}")
+        except Exception as e:
+            print(f"Unexpected error from {service.service_name}: {e}")
+
+        return data, time.monotonic() - start
+
+    def _record(self, name: str, service, data: Any, elapsed: float):
+        """Count a fetch whose result was kept (timeouts are counted where they are dropped)"""
+        FETCH_LATENCY.labels(name).observe(elapsed)
+
+        # Services report per-symbol errors inline, so success means real values came back
+        if data is not None and getattr(service, 'last_values', None):
+            FETCH_TOTAL.labels(name, 'success').inc()
+            DATA_LAST_SUCCESS.labels(name).set_to_current_time()
+        else:
+            FETCH_TOTAL.labels(name, 'error').inc()
+
     def get_service_names(self) -> List[str]:
         """Get list of all registered service names"""
         return list(self.services.keys())
-    
+
     def enable_service(self, name: str):
         """Enable a specific service"""
         if name in self.services:
             self.services[name]['enabled'] = True
-    
+
     def disable_service(self, name: str):
         """Disable a specific service"""
         if name in self.services:
-            self.services[name]['enabled'] = False
\ No newline at end of file
+            self.services[name]['enabled'] = False
@@ -0,0 +1,89 @@
+"""
+Full-market scan split across worker processes
+"""
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from utils.rate_limiter import TokenBucket
+
+Shard = Tuple[Dict[str, str], Dict[str, Dict[str, float]]]
+
+# Per-process state set up by the pool initializer
+_worker: Dict[str, Any] = {}
+
+def _init_worker(rate_limiter: TokenBucket, options: Dict[str, Any]):
+    """Build one StockService per worker process, throttled by the shared bucket"""
+    from services.data_sources.stock_service import StockService
+
+    bar_store = None
+    if options.get('bar_store_path'):
+        from utils.bar_store import BarStore
+        bar_store = BarStore(options['bar_store_path'])
+
+    _worker['service'] = StockService(
+        bulk_quotes=True,
+        batch_size=options.get('batch_size', 50),
+        history_workers=options.get('history_workers', 8),
+        bar_store=bar_store,
+        rate_limiter=rate_limiter
+    )
+
+def _scan_shard(symbols: List[str]) -> Shard:
+    """Price one shard; returns its lines and values by symbol"""
+    service = _worker['service']
+    lines = service.fetch_data(symbols)
+    return dict(zip(symbols, lines)), dict(service.last_values)
+
+class MarketScanner:
+    """
+    Prices a whole symbol universe with StockService in worker processes.
+
+    The universe is cut into shards of `shard_size` symbols and handed to
+    `workers` processes as they free up. Every worker draws from one
+    TokenBucket in shared memory, so the fleet as a whole stays within
+    `rate` vnstock requests per second. Shard results are merged back in
+    universe order.
+    """
+
+    def __init__(self, workers: int = 4, shard_size: int = 100, rate: float = 5, burst: Optional[float] = None,
+                 service_options: Optional[Dict[str, Any]] = None):
+        self.workers = max(1, workers)
+        self.shard_size = max(1, shard_size)
+        self.rate = rate
+        self.burst = burst
+        self.service_options = service_options or {}
+        self.failed: List[str] = []
+
+    def scan(self, symbols: List[str]) -> Tuple[List[str], Dict[str, Dict[str, float]]]:
+        """Lines (universe order) and values for every symbol"""
+        self.failed = []
+        if not symbols:
+            return [], {}
+
+        # spawn: workers must not inherit the parent's event loop and HTTP threads
+        context = mp.get_context('spawn')
+        bucket = TokenBucket(self.rate, self.burst, context=context)
+        shards = [symbols[start:start + self.shard_size] for start in range(0, len(symbols), self.shard_size)]
+        workers = min(self.workers, len(shards))
+
+        start = time.monotonic()
+        lines: Dict[str, str] = {}
+        values: Dict[str, Dict[str, float]] = {}
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(bucket, self.service_options)) as executor:
+            futures = {executor.submit(_scan_shard, shard): shard for shard in shards}
+            for done, future in enumerate(as_completed(futures), 1):
+                shard = futures[future]
+                try:
+                    shard_lines, shard_values = future.result()
+                    lines.update(shard_lines)
+                    values.update(shard_values)
+                except Exception as e:
+                    print(f"Scan shard {shard[0]}..{shard[-1]} failed: {str(e)[:80]}")
+                    self.failed.extend(shard)
+                print(f"Scanned {done}/{len(shards)} shards ({time.monotonic() - start:.1f}s)")
+
+        ordered = [lines.get(symbol, f"{symbol}: ERROR - scan shard failed") for symbol in symbols]
+        return ordered, {symbol: values[symbol] for symbol in symbols if symbol in values}
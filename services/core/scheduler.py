@@ -0,0 +1,82 @@
+"""
+Polling scheduler for the long-running daemon mode
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+class PollJob:
+    """
+    A source polled every `interval` seconds while `is_active()` holds.
+
+    `extra_run()`, if given, is checked every tick and makes the job run
+    right away even outside its window (e.g. once after the market close).
+    """
+
+    def __init__(self, name: str, interval: float, is_active: Optional[Callable[[], bool]] = None,
+                 extra_run: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.interval = interval
+        self.is_active = is_active or (lambda: True)
+        self.extra_run = extra_run
+        self.next_run = 0.0
+
+class PollScheduler:
+    """Runs due poll jobs on a fixed tick until stopped"""
+
+    def __init__(self, tick: float = 1.0):
+        self.tick = tick
+        self.jobs: Dict[str, PollJob] = {}
+        self._stop = threading.Event()
+
+    def add_job(self, name: str, interval: float, is_active: Optional[Callable[[], bool]] = None,
+                run_now: bool = True, extra_run: Optional[Callable[[], bool]] = None):
+        """Register a job, due immediately or only after its first interval"""
+        job = PollJob(name, interval, is_active, extra_run)
+        if not run_now:
+            job.next_run = time.monotonic() + interval
+        self.jobs[name] = job
+
+    def due_jobs(self, now: Optional[float] = None) -> List[str]:
+        """
+        Return names of jobs that are due and active, and schedule their next run.
+
+        Inactive jobs stay due, so they fire on the first tick after their
+        window opens (e.g. right at the start of a trading session).
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+
+        for job in self.jobs.values():
+            extra = job.extra_run is not None and job.extra_run()
+            if not extra and (job.next_run > now or not job.is_active()):
+                continue
+            due.append(job.name)
+            job.next_run = now + job.interval
+
+        return due
+
+    def request(self, name: str):
+        """Make a job due on the next tick (still subject to is_active)"""
+        job = self.jobs.get(name)
+        if job is not None:
+            job.next_run = 0.0
+
+    def run(self, on_due: Callable[[List[str]], None]):
+        """Call on_due with each batch of due jobs until stop() is called"""
+        while not self._stop.is_set():
+            due = self.due_jobs()
+            if due:
+                try:
+                    on_due(due)
+                except Exception as e:
+                    print(f"Poll failed for {', '.join(due)}: {e}")
+            self._stop.wait(self.tick)
+
+    def stop(self):
+        """Ask the run loop to exit after the current batch"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
@@ -1,36 +1,39 @@
 """
 Cryptocurrency price service using CryptoCompare API
 """
-from typing import List
-import requests
-from datetime import datetime
-from vnstock.explorer.misc import vcb_exchange_rate
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from utils.api_client import http_client
+from utils.async_runner import run_sync
 from ..core.base_service import BaseMarketDataService
+from .crypto_stream import CryptoStream
+from .vcb_rates import VCBRateProvider
 
 class CryptoService(BaseMarketDataService):
     """Service for fetching cryptocurrency prices from CryptoCompare API"""
     
-    def __init__(self):
+    def __init__(self, rate_provider: Optional[VCBRateProvider] = None,
+                 base_url: str = "https://min-api.cryptocompare.com",
+                 stream: Optional[CryptoStream] = None, quotes: Optional[List[str]] = None,
+                 max_fsyms_length: int = 300):
         super().__init__("Cryptocurrency")
+        self.rate_provider = rate_provider or VCBRateProvider()
+        self.base_url = base_url.rstrip('/')
+        # USD is always fetched: VND conversion and the 24h change are based on it
+        self.quotes = ['USD'] + [quote for quote in (quotes or []) if quote and quote != 'USD']
+        # pricemultifull rejects fsyms longer than this
+        self.max_fsyms_length = max_fsyms_length
+        # Optional streaming table; symbols it has fresh prices for skip the REST call
+        self.stream = stream
     
     def _get_usd_vnd_rate(self):
-        """Get USD/VND rate from VCB exchange service. Returns None if unavailable."""
+        """Get USD/VND rate from the shared VCB rate table. Returns None if unavailable."""
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            rate_data = vcb_exchange_rate(date=today)
+            table = self.rate_provider.get_cross_rates()
             
-            if rate_data is not None and len(rate_data) > 0:
-                usd_row = rate_data[rate_data['currency_code'] == 'USD']
-                
-                if len(usd_row) > 0:
-                    row = usd_row.iloc[0]
-                    # Use sell rate (what you pay in VND to buy USD)
-                    sell_rate = row.get('sell', 'N/A')
-                    
-                    if sell_rate != 'N/A':
-                        # Clean and convert to float
-                        sell_clean = str(sell_rate).replace(',', '')
-                        return float(sell_clean)
+            if table is not None:
+                # Use sell rate (what you pay in VND to buy USD)
+                return table.vnd_rate('USD', 'sell')
         except Exception:
             pass
         
@@ -38,58 +41,155 @@ class CryptoService(BaseMarketDataService):
     
     def fetch_data(self, symbols: List[str]) -> List[str]:
         """Get cryptocurrency prices from CryptoCompare API with VCB USD/VND rate"""
+        self.last_values = {}
         results = []
         
         try:
             # Get real USD to VND rate from VCB
             usd_to_vnd = self._get_usd_vnd_rate()
             
-            # Get prices for all symbols in one request
-            symbols_str = ','.join(symbols)
-            url = f"https://min-api.cryptocompare.com/data/pricemultifull?fsyms={symbols_str}&tsyms=USD"
+            # Streamed prices are read from memory; only the rest go over REST
+            records = self.stream.snapshot(symbols) if self.stream is not None else {}
+            missing = [symbol for symbol in symbols if symbol not in records]
             
-            response = requests.get(url, timeout=10)
+            if missing:
+                rest_records, error = self._fetch_rest_quotes(missing)
+                if error and not records and not rest_records:
+                    results.append(error)
+                    return results
+                records.update(rest_records)
             
-            if response.status_code != 200:
-                results.append(f"Crypto: CryptoCompare API error {response.status_code}")
-                return results
-            
-            data = response.json()
-            
-            if 'RAW' not in data:
-                results.append("Crypto: No data available")
-                return results
+            table = self._build_table(records, usd_to_vnd)
             
             # Process each symbol from .env
             for symbol in symbols:
-                if symbol in data['RAW']:
-                    crypto_data = data['RAW'][symbol]['USD']
-                    
-                    usd_price = float(crypto_data['PRICE'])
-                    change_24h = float(crypto_data['CHANGEPCT24HOUR'])
-                    
-                    change_sign = "+" if change_24h >= 0 else ""
-                    
-                    # Format output based on whether VCB rate is available
-                    if usd_to_vnd is not None:
-                        vnd_price = usd_price * usd_to_vnd
-                        
-                        # Format VND price
-                        if vnd_price > 1000000:
-                            vnd_formatted = f"{vnd_price/1000000:,.1f}M VND"
-                        elif vnd_price > 1000:
-                            vnd_formatted = f"{vnd_price/1000:,.0f}k VND"
-                        else:
-                            vnd_formatted = f"{vnd_price:,.0f} VND"
-                        
-                        results.append(f"{symbol}: ${usd_price:,.2f} / {vnd_formatted} ({change_sign}{change_24h:.2f}%)")
-                    else:
-                        # VCB rate unavailable, show only USD
-                        results.append(f"{symbol}: ${usd_price:,.2f} ({change_sign}{change_24h:.2f}%)")
+                if symbol in table.index:
+                    results.append(self._format_row(symbol, table.loc[symbol], usd_to_vnd is not None))
                 else:
                     results.append(f"{symbol}: Not available")
                 
         except Exception as e:
             results.append(f"Crypto: ERROR - {str(e)[:50]}")
         
-        return results
\ No newline at end of file
+        return results
+    
+    def _chunk_symbols(self, symbols: List[str]) -> List[List[str]]:
+        """Split symbols so each comma-joined fsyms value stays under the API's length limit"""
+        chunks = []
+        current = []
+        length = 0
+        
+        for symbol in symbols:
+            added = len(symbol) + (1 if current else 0)
+            if current and length + added > self.max_fsyms_length:
+                chunks.append(current)
+                current, length, added = [], 0, len(symbol)
+            current.append(symbol)
+            length += added
+        
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
+    def _fetch_rest_quotes(self, symbols: List[str]) -> Tuple[Dict[str, Dict[str, float]], Optional[str]]:
+        """
+        Get prices in every quote currency from pricemultifull; returns (records, error).
+        
+        Symbols are split into chunks under the URL limit and the chunks are
+        fetched concurrently over the pooled client.
+        """
+        url = f"{self.base_url}/data/pricemultifull"
+        chunks = self._chunk_symbols(symbols)
+        tsyms = ','.join(self.quotes)
+        
+        async def fetch_all():
+            requests = [http_client.aget(url, params={'fsyms': ','.join(chunk), 'tsyms': tsyms}) for chunk in chunks]
+            return await asyncio.gather(*requests, return_exceptions=True)
+        
+        responses = run_sync(fetch_all())
+        
+        records = {}
+        error = None
+        for response in responses:
+            if isinstance(response, Exception):
+                error = error or f"Crypto: ERROR - {str(response)[:50]}"
+                continue
+            if response.status_code != 200:
+                error = error or f"Crypto: CryptoCompare API error {response.status_code}"
+                continue
+            
+            data = response.json()
+            if 'RAW' not in data:
+                error = error or "Crypto: No data available"
+                continue
+            
+            for symbol, by_quote in data['RAW'].items():
+                record = {}
+                for quote, quote_data in by_quote.items():
+                    record[f"price_{quote.lower()}"] = quote_data.get('PRICE')
+                    record[f"open_{quote.lower()}"] = quote_data.get('OPEN24HOUR')
+                    record[f"change_{quote.lower()}"] = quote_data.get('CHANGEPCT24HOUR')
+                records[symbol] = record
+        
+        return records, error
+    
+    def _build_table(self, records: Dict[str, Dict[str, float]], usd_to_vnd: Optional[float]):
+        """
+        One row per symbol with USD price, 24h change and VND price.
+        
+        Conversion and change math run as column operations over the whole
+        watchlist instead of per symbol.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        table = pd.DataFrame.from_dict(records, orient='index', dtype=float)
+        if table.empty:
+            return table
+        
+        # Streamed records already carry usd/change_pct; REST records carry per-quote columns
+        for column in ('usd', 'change_pct', 'price_usd', 'open_usd', 'change_usd'):
+            if column not in table.columns:
+                table[column] = np.nan
+        
+        table['usd'] = table['usd'].fillna(table['price_usd'])
+        computed_change = (table['price_usd'] - table['open_usd']) / table['open_usd'] * 100
+        table['change_pct'] = table['change_pct'].fillna(table['change_usd']).fillna(computed_change).fillna(0.0)
+        table['vnd'] = table['usd'] * usd_to_vnd if usd_to_vnd is not None else np.nan
+        
+        return table[table['usd'].notna()]
+    
+    def _format_row(self, symbol: str, row, has_vnd: bool) -> str:
+        """Format one symbol's line and record its values"""
+        usd_price = float(row['usd'])
+        change_24h = float(row['change_pct'])
+        change_sign = "+" if change_24h >= 0 else ""
+        self.last_values[symbol] = {'usd': usd_price, 'change_pct': change_24h}
+        
+        # Prices in the other configured quote currencies
+        extra = ""
+        for quote in self.quotes:
+            column = f"price_{quote.lower()}"
+            if quote == 'USD' or column not in row.index or row[column] != row[column]:
+                continue
+            self.last_values[symbol][quote.lower()] = float(row[column])
+            extra += f" | {float(row[column]):,.8g} {quote}"
+        
+        # Format output based on whether VCB rate is available
+        if has_vnd:
+            vnd_price = float(row['vnd'])
+            self.last_values[symbol]['vnd'] = vnd_price
+            
+            # Format VND price
+            if vnd_price > 1000000:
+                vnd_formatted = f"{vnd_price/1000000:,.1f}M VND"
+            elif vnd_price > 1000:
+                vnd_formatted = f"{vnd_price/1000:,.0f}k VND"
+            else:
+                vnd_formatted = f"{vnd_price:,.0f} VND"
+            
+            return f"{symbol}: ${usd_price:,.2f} / {vnd_formatted} ({change_sign}{change_24h:.2f}%){extra}"
+        
+        # VCB rate unavailable, show only USD
+        return f"{symbol}: ${usd_price:,.2f} ({change_sign}{change_24h:.2f}%){extra}"
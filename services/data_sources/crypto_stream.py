@@ -0,0 +1,154 @@
+"""
+CryptoCompare streaming client keeping an in-memory latest-price table
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional
+from utils.async_runner import get_loop
+
+# CCCIAGG aggregate index message type and the server's error types
+AGGREGATE_INDEX = '5'
+ERROR_TYPES = {'401', '429', '500'}
+
+class PriceTick:
+    """Latest known values for one symbol"""
+    __slots__ = ('price', 'open_24h', 'updated_at', 'quotes')
+
+    def __init__(self):
+        self.price: Optional[float] = None
+        self.open_24h: Optional[float] = None
+        self.updated_at = 0.0
+        # Latest price in each extra quote currency (e.g. USDT, BTC)
+        self.quotes: Dict[str, float] = {}
+
+    @property
+    def change_pct_24h(self) -> Optional[float]:
+        if self.price is None or not self.open_24h:
+            return None
+        return (self.price - self.open_24h) / self.open_24h * 100
+
+class CryptoStream:
+    """
+    Subscribes to CryptoCompare's streaming API for a set of symbols.
+
+    Runs on the shared background loop, reconnects with backoff and
+    resubscribes after every reconnect. Readers call snapshot(), which only
+    touches the in-memory table. Besides the main `quote` (which carries the
+    24h change), each symbol is also subscribed in every `extra_quotes`
+    currency.
+    """
+
+    def __init__(self, symbols: List[str], url: str = "wss://streamer.cryptocompare.com/v2",
+                 api_key: str = "", quote: str = "USD", max_age: float = 120.0,
+                 max_reconnect_delay: float = 60.0, extra_quotes: Optional[List[str]] = None):
+        self.symbols = [symbol for symbol in symbols if symbol]
+        self.url = url
+        self.api_key = api_key
+        self.quote = quote
+        self.extra_quotes = [extra for extra in (extra_quotes or []) if extra and extra != quote]
+        self.max_age = max_age
+        self.max_reconnect_delay = max_reconnect_delay
+        self.table: Dict[str, PriceTick] = {symbol: PriceTick() for symbol in self.symbols}
+        self.connected = False
+        self._task: Optional[asyncio.Future] = None
+
+    @property
+    def subscriptions(self) -> List[str]:
+        return [f"{AGGREGATE_INDEX}~CCCIAGG~{symbol}~{quote}"
+                for symbol in self.symbols for quote in [self.quote] + self.extra_quotes if quote != symbol]
+
+    def start(self):
+        """Start streaming in the background (idempotent)"""
+        if self._task is None:
+            self._task = asyncio.run_coroutine_threadsafe(self._run(), get_loop())
+
+    def stop(self):
+        """Stop streaming and drop the connection"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    def snapshot(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Fresh prices for the requested symbols: {symbol: {'usd', 'change_pct'}},
+        plus 'price_<quote>' for each extra quote that has ticked.
+
+        While connected the last tick is current (the stream only sends
+        changes); after a disconnect ticks older than max_age are dropped.
+        """
+        now = time.time()
+        result = {}
+
+        for symbol in symbols or self.symbols:
+            tick = self.table.get(symbol)
+            if tick is None or tick.price is None:
+                continue
+            if not self.connected and now - tick.updated_at > self.max_age:
+                continue
+            change = tick.change_pct_24h
+            result[symbol] = {'usd': tick.price, 'change_pct': change if change is not None else 0.0}
+            for quote, price in tick.quotes.items():
+                result[symbol][f"price_{quote.lower()}"] = price
+
+        return result
+
+    async def _run(self):
+        """Connect, subscribe and consume messages; reconnect forever with backoff"""
+        import websockets
+
+        url = f"{self.url}?api_key={self.api_key}" if self.api_key else self.url
+        attempt = 0
+
+        while True:
+            try:
+                async with websockets.connect(url, ping_interval=20, ping_timeout=20) as ws:
+                    await ws.send(json.dumps({'action': 'SubAdd', 'subs': self.subscriptions}))
+                    self.connected = True
+                    attempt = 0
+                    print(f"Crypto stream connected, subscribed to {len(self.symbols)} symbols")
+
+                    async for raw in ws:
+                        self._handle(raw)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Crypto stream disconnected: {str(e)[:80]}")
+
+            self.connected = False
+            delay = random.uniform(0, min(self.max_reconnect_delay, 2 ** attempt))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _handle(self, raw):
+        """Apply one streaming message to the latest-price table"""
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+
+        message_type = str(message.get('TYPE', ''))
+
+        if message_type == AGGREGATE_INDEX:
+            tick = self.table.get(message.get('FROMSYMBOL'))
+            to_symbol = message.get('TOSYMBOL')
+            if tick is None:
+                return
+            if to_symbol in self.extra_quotes:
+                if 'PRICE' in message:
+                    tick.quotes[to_symbol] = float(message['PRICE'])
+                return
+            if to_symbol != self.quote:
+                return
+            # Updates are partial: only changed fields are sent
+            if 'PRICE' in message:
+                tick.price = float(message['PRICE'])
+            if 'OPEN24HOUR' in message:
+                tick.open_24h = float(message['OPEN24HOUR'])
+            tick.updated_at = time.time()
+
+        elif message_type in ERROR_TYPES:
+            print(f"Crypto stream error {message_type}: {message.get('MESSAGE', '')} {message.get('INFO', '')}")
@@ -1,56 +1,61 @@
 """
 VCB exchange rate service
 """
-from typing import List
-from datetime import datetime
-from vnstock.explorer.misc import vcb_exchange_rate
+from typing import List, Optional
 from ..core.base_service import BaseMarketDataService
+from .vcb_rates import VCBRateProvider
 
 class ExchangeService(BaseMarketDataService):
     """Service for fetching VCB exchange rates"""
-    
-    def __init__(self):
+
+    def __init__(self, rate_provider: Optional[VCBRateProvider] = None):
         super().__init__("VCB Exchange")
-    
-    def fetch_data(self, currencies: List[str]) -> List[str]:
-        """Get VCB exchange rates with buy/sell"""
+        self.rate_provider = rate_provider or VCBRateProvider()
+
+    def fetch_data(self, currencies: List[str], cross_pairs: Optional[List[str]] = None) -> List[str]:
+        """Get VCB exchange rates with buy/sell, plus cross rates such as EUR/JPY"""
+        self.last_values = {}
         results = []
-        
+
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            rate_data = vcb_exchange_rate(date=today)
-            
-            if rate_data is not None and len(rate_data) > 0:
+            table = self.rate_provider.get_cross_rates()
+
+            if table is not None:
                 for currency in currencies:
-                    currency_row = rate_data[rate_data['currency_code'] == currency]
-                    
-                    if len(currency_row) > 0:
-                        row = currency_row.iloc[0]
-                        buy = row.get('buy _transfer', 'N/A') 
-                        sell = row.get('sell', 'N/A')
-                        
-                        # Format exchange rates with k notation
-                        try:
-                            buy_clean = str(buy).replace(',', '') if buy != 'N/A' else '0'
-                            buy_num = float(buy_clean)
-                            buy_formatted = f"{buy_num/1000:,.1f}k VND" if buy_num > 0 else str(buy)
-                        except (ValueError, TypeError):
-                            buy_formatted = str(buy)
-                        
-                        try:
-                            sell_clean = str(sell).replace(',', '') if sell != 'N/A' else '0'
-                            sell_num = float(sell_clean)
-                            sell_formatted = f"{sell_num/1000:,.1f}k VND" if sell_num > 0 else str(sell)
-                        except (ValueError, TypeError):
-                            sell_formatted = str(sell)
-                        
-                        results.append(f"{currency}: Buy {buy_formatted} - Sell {sell_formatted}")
-                    else:
+                    if currency not in table.index:
                         results.append(f"{currency}: N/A")
+                        continue
+
+                    buy_num = table.vnd_rate(currency, 'transfer')
+                    sell_num = table.vnd_rate(currency, 'sell')
+
+                    # Format exchange rates with k notation
+                    buy_formatted = f"{buy_num/1000:,.1f}k VND" if buy_num else "N/A"
+                    sell_formatted = f"{sell_num/1000:,.1f}k VND" if sell_num else "N/A"
+
+                    if buy_num and sell_num:
+                        self.last_values[currency] = {'buy': buy_num, 'sell': sell_num}
+
+                    results.append(f"{currency}: Buy {buy_formatted} - Sell {sell_formatted}")
+
+                for pair in cross_pairs or []:
+                    results.append(self._format_cross(table, pair))
             else:
                 results.append("Exchange rates: No data available")
-                
+
         except Exception as e:
             results.append(f"Exchange rates: ERROR - {str(e)[:50]}")
-        
-        return results
\ No newline at end of file
+
+        return results
+
+    def _format_cross(self, table, pair: str) -> str:
+        """Format one BASE/QUOTE cross rate from the precomputed matrix"""
+        base, _, quote = pair.partition('/')
+        buy = table.rate(base, quote, 'buy')
+        sell = table.rate(base, quote, 'sell')
+
+        if buy is None or sell is None:
+            return f"{pair}: N/A"
+
+        self.last_values[pair] = {'buy': buy, 'sell': sell}
+        return f"{pair}: Buy {buy:,.4f} - Sell {sell:,.4f}"
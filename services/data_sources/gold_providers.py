@@ -0,0 +1,164 @@
+"""
+Domestic gold price providers (SJC, PNJ, DOJI, Bao Tin Minh Chau)
+
+Every provider returns quotes as {'product', 'branch', 'buy', 'sell'} with
+prices in VND, in the unit the brand publishes them.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from utils.api_client import http_client
+
+Quote = Dict[str, Any]
+
+PNJ_GOLD_URL = 'https://edge-api.pnj.io/ecom-frontend/v1/get-gold-price?zone=00'
+DOJI_GOLD_URL = 'http://update.giavang.doji.vn/banggia/doji_92411/92411'
+
+def _price(value: Any, scale: float = 1, grouped: bool = False) -> Optional[float]:
+    """
+    Parse a price like 118500000, '11,850' or '8.350.000'; None if missing.
+
+    With `grouped`, '.' and ',' in strings are always thousands separators
+    (the Vietnamese '11.850' is 11850, not 11.85).
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = str(value).strip()
+        if grouped:
+            text = text.replace('.', '').replace(',', '')
+        try:
+            number = float(text)
+        except ValueError:
+            # Thousands separators: drop everything but the digits
+            digits = ''.join(ch for ch in text if ch.isdigit())
+            if not digits:
+                return None
+            number = float(digits)
+    if number != number or number <= 0:
+        return None
+    return number * scale
+
+def _quote(product: Any, branch: Any, buy: Optional[float], sell: Optional[float]) -> Optional[Quote]:
+    if buy is None and sell is None:
+        return None
+    return {'product': str(product or '').strip(), 'branch': str(branch or '').strip(), 'buy': buy, 'sell': sell}
+
+class GoldProvider(ABC):
+    """One brand's price board"""
+    brand = ''
+
+    def __init__(self, response_cache=None, ttl: float = 30):
+        # Optional soft-TTL disk cache for the vnstock calls
+        self.response_cache = response_cache
+        self.ttl = ttl
+
+    @abstractmethod
+    def fetch(self) -> List[Quote]:
+        """Every quote on the brand's board. Must be implemented by subclasses."""
+        pass
+
+    def _load_frame(self, name: str, loader):
+        if self.response_cache is None:
+            return loader()
+        return self.response_cache.load_frame(f"vnstock:{name}", self.ttl, loader)
+
+class SJCProvider(GoldProvider):
+    """Every SJC product at every branch"""
+    brand = 'SJC'
+
+    def fetch(self) -> List[Quote]:
+        # vnstock is heavy to import, load it on first fetch
+        from vnstock.explorer.misc import sjc_gold_price
+
+        frame = self._load_frame('sjc_gold_price', sjc_gold_price)
+        if frame is None:
+            return []
+        quotes = (_quote(row.get('name'), row.get('branch'), _price(row.get('buy_price')), _price(row.get('sell_price')))
+                  for row in frame.to_dict('records'))
+        return [quote for quote in quotes if quote]
+
+class BTMCProvider(GoldProvider):
+    """Bao Tin Minh Chau board, one quote per product and karat"""
+    brand = 'BTMC'
+
+    def fetch(self) -> List[Quote]:
+        from vnstock.explorer.misc import btmc_goldprice
+
+        frame = self._load_frame('btmc_goldprice', btmc_goldprice)
+        if frame is None:
+            return []
+        quotes = []
+        for row in frame.to_dict('records'):
+            product = row.get('name')
+            if row.get('karat'):
+                product = f"{product} {row['karat']}"
+            quote = _quote(product, '', _price(row.get('buy_price')), _price(row.get('sell_price')))
+            if quote:
+                quotes.append(quote)
+        return quotes
+
+class PNJProvider(GoldProvider):
+    """PNJ storefront price API (prices in thousand VND)"""
+    brand = 'PNJ'
+
+    def __init__(self, url: str = PNJ_GOLD_URL):
+        super().__init__()
+        self.url = url
+
+    def fetch(self) -> List[Quote]:
+        response = http_client.get(self.url)
+        response.raise_for_status()
+
+        quotes = []
+        for item in response.json().get('data') or []:
+            quote = _quote(item.get('tensp') or item.get('masp'), '',
+                           _price(item.get('giamua'), 1000, grouped=True),
+                           _price(item.get('giaban'), 1000, grouped=True))
+            if quote:
+                quotes.append(quote)
+        return quotes
+
+class DOJIProvider(GoldProvider):
+    """DOJI XML price feed (prices in thousand VND)"""
+    brand = 'DOJI'
+
+    def __init__(self, url: str = DOJI_GOLD_URL):
+        super().__init__()
+        self.url = url
+
+    def fetch(self) -> List[Quote]:
+        import xml.etree.ElementTree as ET
+
+        response = http_client.get(self.url)
+        response.raise_for_status()
+
+        root = ET.fromstring(response.content)
+        # The feed also carries jewellery and world price lists; DGPlist is the retail board
+        board = root.find('.//DGPlist')
+        quotes = []
+        for row in (board if board is not None else root).iter('Row'):
+            quote = _quote(row.get('Name'), '', _price(row.get('Buy'), 1000, grouped=True),
+                           _price(row.get('Sell'), 1000, grouped=True))
+            if quote:
+                quotes.append(quote)
+        return quotes
+
+def build_providers(brands: List[str], pnj_url: str = PNJ_GOLD_URL, doji_url: str = DOJI_GOLD_URL,
+                    response_cache=None, cache_ttl: float = 30) -> List[GoldProvider]:
+    """Providers for the requested brands, in the requested order"""
+    # PNJ and DOJI go through the HTTP client, which has its own cache
+    factories = {
+        'SJC': lambda: SJCProvider(response_cache, cache_ttl),
+        'PNJ': lambda: PNJProvider(pnj_url),
+        'DOJI': lambda: DOJIProvider(doji_url),
+        'BTMC': lambda: BTMCProvider(response_cache, cache_ttl),
+    }
+    providers = []
+    for brand in dict.fromkeys(brand.strip().upper() for brand in brands if brand.strip()):
+        if brand in factories:
+            providers.append(factories[brand]())
+        else:
+            print(f"Unknown gold brand {brand}, expected one of {', '.join(factories)}")
+    return providers
@@ -1,33 +1,167 @@
 """
-SJC gold price service
+Domestic gold price service (SJC, PNJ, DOJI, Bao Tin Minh Chau)
 """
-from vnstock.explorer.misc import sjc_gold_price
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from ..core.base_service import BaseMarketDataService
+from .gold_providers import GoldProvider, Quote, build_providers
 
 class GoldService(BaseMarketDataService):
-    """Service for fetching SJC gold prices"""
-    
-    def __init__(self):
-        super().__init__("SJC Gold")
-    
-    def fetch_data(self) -> str:
-        """Get SJC gold prices with single attempt (fast for GitHub Actions)"""
+    """
+    Service for fetching gold prices from several brands at once.
+
+    Providers run in parallel, each with its own timeout. A provider that
+    fails or times out is shown with its last good quotes, marked stale;
+    those are kept on disk so one-shot runs have them too.
+    """
+
+    def __init__(self, brands: Optional[List[str]] = None, timeout: float = 8,
+                 state_path: Optional[str] = None, **provider_options):
+        super().__init__("Gold")
+        self.brands = brands or ['SJC']
+        self.timeout = timeout
+        self.state_path = state_path
+        # Passed on to build_providers (feed URLs, response cache)
+        self.provider_options = provider_options
+        self._providers: Dict[str, GoldProvider] = {}
+        self._last_good: Dict[str, Dict[str, Any]] = self._load()
+
+    def fetch_data(self, brands: Optional[List[str]] = None) -> str:
+        """Get every product of the requested brands, one line each"""
+        self.last_values = {}
+        providers = self._get_providers(brands or self.brands)
+        if not providers:
+            return "Gold: No brands configured"
+
+        start = time.monotonic()
+        futures = [(provider, self._spawn(provider)) for provider in providers]
+
+        lines = []
+        dirty = False
+        for provider, future in futures:
+            # Every provider started together, so each waits out only what is left of its budget
+            remaining = max(0.0, start + self.timeout - time.monotonic())
+            try:
+                quotes = future.result(timeout=remaining)
+                if not quotes:
+                    raise ValueError("no quotes")
+            except FutureTimeoutError:
+                lines.extend(self._fallback(provider.brand, f"timed out after {self.timeout:g}s"))
+                continue
+            except Exception as e:
+                lines.extend(self._fallback(provider.brand, str(e)))
+                continue
+
+            self._last_good[provider.brand] = {'ts': time.time(), 'quotes': quotes}
+            dirty = True
+            lines.extend(self._render(provider.brand, quotes))
+
+        if dirty:
+            self._save()
+        return "\n".join(lines)
+
+    def _get_providers(self, brands: List[str]) -> List[GoldProvider]:
+        """Providers are built once per brand and reused"""
+        providers = []
+        for provider in build_providers([brand for brand in brands if brand.strip().upper() not in self._providers],
+                                        **self.provider_options):
+            self._providers[provider.brand] = provider
+        for brand in dict.fromkeys(brand.strip().upper() for brand in brands):
+            if brand in self._providers:
+                providers.append(self._providers[brand])
+        return providers
+
+    @staticmethod
+    def _spawn(provider: GoldProvider) -> Future:
+        """Fetch on a daemon thread so a hung site never blocks the run or exit"""
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(provider.fetch())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"gold-{provider.brand}", daemon=True).start()
+        return future
+
+    def _fallback(self, brand: str, reason: str) -> List[str]:
+        """Last good quotes of a failed provider, marked stale"""
+        print(f"[{self.service_name}] {brand} failed: {reason[:80]}")
+        cached = self._last_good.get(brand)
+        if not cached:
+            return [f"{brand}: ERROR - {reason[:50]}"]
+
+        # Same clock as the message footer (UTC+7)
+        fetched = datetime.utcfromtimestamp(cached['ts']) + timedelta(hours=7)
+        return self._render(brand, cached['quotes'], stale=f" (stale {fetched.strftime('%d/%m %H:%M')})")
+
+    def _render(self, brand: str, quotes: List[Quote], stale: str = '') -> List[str]:
+        """
+        One line per product, also filling last_values for fresh quotes.
+
+        Products are listed for the first branch; other branches only get a
+        line where their prices differ. The first quote of a brand is also
+        stored under the bare brand (e.g. SJC). Stale quotes are shown but
+        left out of last_values, so change detection, history and alerts
+        never read them as current prices.
+        """
+        first_branch = quotes[0]['branch']
+        main_prices = {quote['product']: (quote['buy'], quote['sell'])
+                       for quote in quotes if quote['branch'] == first_branch}
+
+        lines = []
+        for position, quote in enumerate(quotes):
+            product = quote['product'] or brand
+            name = product if brand in product.upper() else f"{brand} {product}"
+            # Other branches mostly repeat the first one's prices; only list those that differ
+            listed = True
+            if quote['branch'] != first_branch:
+                name = f"{name} ({quote['branch']})"
+                listed = main_prices.get(quote['product']) != (quote['buy'], quote['sell'])
+
+            if not stale:
+                fields = {field: quote[field] for field in ('buy', 'sell') if quote[field] is not None}
+                self.last_values[name] = fields
+                if position == 0:
+                    self.last_values[brand] = fields
+
+            if listed:
+                lines.append(f"{name}: Buy {_format_price(quote['buy'])} - Sell {_format_price(quote['sell'])}{stale}")
+        return lines
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Restore the last good quotes of every brand"""
+        if not self.state_path:
+            return {}
         try:
-            gold_data = sjc_gold_price()
-            
-            if gold_data is not None and len(gold_data) > 0:
-                sjc_row = gold_data.iloc[0]
-                buy_price = sjc_row.get('buy_price', 'N/A')
-                sell_price = sjc_row.get('sell_price', 'N/A')
-                
-                if buy_price != 'N/A' and sell_price != 'N/A':
-                    buy_formatted = f"{buy_price/1000:,.0f}k VND"
-                    sell_formatted = f"{sell_price/1000:,.0f}k VND"
-                    return f"SJC Gold: Buy {buy_formatted} - Sell {sell_formatted}"
-                else:
-                    return f"SJC Gold: Buy {buy_price} - Sell {sell_price}"
-            else:
-                return "SJC Gold: No data available"
-                
-        except Exception as e:
-            return f"SJC Gold: ERROR - {str(e)[:50]}"
\ No newline at end of file
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable gold cache {self.state_path}: {e}")
+            return {}
+
+    def _save(self):
+        """Persist the last good quotes atomically"""
+        if not self.state_path:
+            return
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._last_good, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Could not save gold cache {self.state_path}: {e}")
+
+def _format_price(price: Optional[float]) -> str:
+    return f"{price / 1000:,.0f}k VND" if price is not None else "N/A"
@@ -1,39 +1,136 @@
 """
 VN-Index service
 """
-from vnstock import Vnstock
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from utils.bar_store import BarStore
+from utils.formatters import format_indicators
+from utils.market_calendar import vietnam_now
 from ..core.base_service import BaseMarketDataService
 
 class IndexService(BaseMarketDataService):
     """Service for fetching VN-Index data"""
-    
-    def __init__(self):
+
+    def __init__(self, bar_store: Optional[BarStore] = None, indicator_factory: Optional[Callable[[List[str]], Any]] = None,
+                 indicator_fields: Optional[List[str]] = None, intraday_feed=None,
+                 intraday_fields: Optional[List[str]] = None):
         super().__init__("VN-Index")
-    
+        self.bar_store = bar_store
+        # Builds an IndicatorEngine; None disables indicators
+        self.indicator_factory = indicator_factory
+        self.indicator_fields = indicator_fields or []
+        self._indicators = None
+        # Live 1-minute bars while the market is open; None disables
+        self.intraday_feed = intraday_feed
+        self.intraday_fields = intraday_fields or []
+        self._intraday_quote = None
+
     def fetch_data(self) -> str:
         """Get VN-Index with daily changes"""
+        self.last_values = {}
+
         try:
-            from datetime import datetime, timedelta
-            
-            # Dynamic date range - last 30 days to today
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            
+            # vnstock is heavy to import, load it on first fetch
+            from vnstock import Vnstock
+
             index_obj = Vnstock().world_index(symbol='VNI', source='MSN')
-            data = index_obj.quote.history(start=start_date, end=end_date, interval='1D')
-            
-            if data is not None and len(data) > 0:
-                latest = data.iloc[-1]
-                prev = data.iloc[-2] if len(data) > 1 else latest
-                
-                value = latest['close']
-                change = latest['close'] - prev['close'] 
-                change_percent = (change / prev['close']) * 100
-                
+
+            def fetch(start: str, end: str):
+                return index_obj.quote.history(start=start, end=end, interval='1D')
+
+            # Enough history to warm up the indicators, otherwise just the last two closes
+            lookback_days = 30
+            if self.indicator_factory is not None:
+                if self._indicators is None:
+                    self._indicators = self.indicator_factory(['VNINDEX'])
+                lookback_days = max(lookback_days, self._indicators.warmup_bars * 7 // 5 + 14)
+
+            if self.bar_store is not None:
+                # Only the missing or still-open days are downloaded
+                bars = self.bar_store.sync('VNI', 'MSN', fetch, lookback_days=lookback_days, limit=lookback_days)
+            else:
+                # Dynamic date range - last `lookback_days` days to today
+                end_date = datetime.now().strftime('%Y-%m-%d')
+                start_date = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+                data = fetch(start_date, end_date)
+                bars = [
+                    {'date': str(record['time'])[:10], 'close': record.get('close'), 'volume': record.get('volume')}
+                    for record in data.to_dict('records')
+                ] if data is not None and len(data) > 0 else []
+
+            closes = [bar['close'] for bar in bars[-2:]]
+            intraday = self._fetch_intraday(bars)
+            if intraday:
+                # Today's live value against the last finished session
+                today = vietnam_now().strftime('%Y-%m-%d')
+                finished = [bar for bar in bars if bar['date'] < today]
+                closes = [bar['close'] for bar in finished[-1:]] + [intraday['price']]
+                bars = finished + [{'date': today, 'close': intraday['price'], 'volume': intraday.get('day_volume')}]
+            indicators = self._update_indicators(bars) if self._indicators is not None else {}
+
+            if closes:
+                value = closes[-1]
+                prev_close = closes[-2] if len(closes) > 1 else value
+
+                change = value - prev_close
+                change_percent = (change / prev_close) * 100
+
+                intraday.pop('price', None)
+                self.last_values['VNINDEX'] = {
+                    **intraday, 'close': float(value), 'prev_close': float(prev_close),
+                    'change': float(change), 'change_pct': float(change_percent),
+                    **indicators
+                }
+
                 change_sign = "+" if change >= 0 else ""
-                return f"VN-Index: {value:,.2f} ({change_sign}{change:,.2f}, {change_percent:+.2f}%)"
+                line = f"VN-Index: {value:,.2f} ({change_sign}{change:,.2f}, {change_percent:+.2f}%)"
+                return (line + format_indicators(intraday, self.intraday_fields)
+                        + format_indicators(indicators, self.indicator_fields))
             else:
                 return "VN-Index: N/A"
-                
+
+        except Exception as e:
+            return f"VN-Index: ERROR - {str(e)[:50]}"
+
+    def _fetch_intraday(self, bars: List[Dict[str, Any]]) -> Dict[str, float]:
+        """New 1-minute bars since the last poll while the market is open; the session summary or {}"""
+        feed = self.intraday_feed
+        if feed is None or not feed.is_open():
+            return {}
+
+        try:
+            if self._intraday_quote is None:
+                from vnstock import Vnstock
+                self._intraday_quote = Vnstock().stock(symbol='VNINDEX', source='VCI').quote
+            feed.poll_minutes('VNINDEX', self._intraday_quote)
         except Exception as e:
-            return f"VN-Index: ERROR - {str(e)[:50]}"
\ No newline at end of file
+            print(f"[{self.service_name}] {self.handle_error(e, 'intraday bars')}")
+        return feed.bars.summary('VNINDEX')
+
+    def _update_indicators(self, bars: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Seed the engine on first use, then feed it only the newest bar"""
+        import numpy as np
+
+        if not bars:
+            return {}
+
+        engine = self._indicators
+        if engine.pending_date is None:
+            # The newest bar may still be trading: seed the rest, keep it pending
+            history, bars = bars[:-1], bars[-1:]
+            closes = np.array([[bar['close'] for bar in history]], dtype=float)
+            volumes = np.array([[self._volume(bar) for bar in history]], dtype=float)
+            engine.seed(closes, volumes, as_of=history[-1]['date'] if history else None)
+        else:
+            # Only bars from the pending one onwards are new (more than one if polls were missed)
+            bars = [bar for bar in bars if bar['date'] >= engine.pending_date]
+
+        outputs = {}
+        for bar in bars:
+            outputs = engine.update(np.array([bar['close']], dtype=float), np.array([self._volume(bar)], dtype=float),
+                                    date=bar['date'])
+        return engine.values(outputs).get('VNINDEX', {}) if outputs else {}
+
+    @staticmethod
+    def _volume(bar: Dict[str, Any]) -> float:
+        return bar['volume'] if bar.get('volume') is not None else float('nan')
@@ -0,0 +1,151 @@
+"""
+Incremental intraday fetching for stocks and VN-Index
+"""
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from services.analytics.intraday import IntradayBars
+from utils.market_calendar import vietnam_now
+
+class IntradayFeed:
+    """
+    Pulls only what is new since the previous poll into IntradayBars.
+
+    Stocks read VCI matched trades: the newest page is fetched and older
+    pages are only requested (by the oldest trade seen) until the cursor
+    from the previous poll is reached, so a poll downloads just the new
+    trades. VN-Index has no trade feed; its 1-minute bars for the day are
+    requested and only those from the newest stored minute on are written
+    (that minute is replaced with its final values).
+
+    Times are exchange wall-clock seconds (UTC+7 read as UTC), so a
+    timestamp's UTC date is the trading day.
+    """
+
+    def __init__(self, bars: Optional[IntradayBars] = None, page_size: int = 500, max_pages: int = 40,
+                 is_open: Optional[Callable[[], bool]] = None):
+        self.bars = bars or IntradayBars()
+        self.page_size = page_size
+        self.max_pages = max_pages
+        # Intraday polling only runs while the market is open
+        self.is_open = is_open or (lambda: True)
+        # symbol -> (time of the newest trade, ids of the trades at that time)
+        self._cursors: Dict[str, Tuple[float, Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def poll_trades(self, symbol: str, quote) -> int:
+        """Fetch the trades since the cursor from a vnstock VCI quote; returns how many were new"""
+        with self._lock:
+            cursor = self._cursors.get(symbol)
+
+        trades: Dict[str, Tuple[float, float, float]] = {}
+        pages = []
+        before = None
+        for _ in range(self.max_pages):
+            page = self._trades(quote.intraday(page_size=self.page_size, last_time=before))
+            if not page:
+                break
+
+            # Pages overlap by a second; trades already taken this poll are not new
+            unseen = [trade for trade in page if trade[3] not in trades]
+            fresh = [trade for trade in unseen if self._after(trade, cursor)]
+            for ts, price, volume, trade_id, _ in fresh:
+                trades[trade_id] = (ts, price, volume)
+            pages.append(fresh)
+
+            oldest = page[0]
+            newest_day = int(page[-1][0] // 86400)
+            # Stop at the cursor, at the start of the session or when paging makes no progress
+            if (not fresh or len(fresh) < len(unseen) or len(page) < self.page_size
+                    or int(oldest[0] // 86400) != newest_day):
+                break
+            before = oldest[4]
+
+        if not trades:
+            return 0
+
+        # Pages come newest first; keep the feed's order for trades within the same second
+        ticks = sorted((trade[:3] for page in reversed(pages) for trade in page), key=lambda tick: tick[0])
+        self.bars.add_ticks(symbol, ticks)
+
+        newest = ticks[-1][0]
+        ids = {trade_id for trade_id, (ts, _, _) in trades.items() if ts == newest}
+        with self._lock:
+            if cursor is not None and cursor[0] == newest:
+                ids |= cursor[1]
+            self._cursors[symbol] = (newest, ids)
+        return len(ticks)
+
+    @staticmethod
+    def _after(trade, cursor: Optional[Tuple[float, Set[str]]]) -> bool:
+        if cursor is None:
+            return True
+        return trade[0] > cursor[0] or (trade[0] == cursor[0] and trade[3] not in cursor[1])
+
+    @staticmethod
+    def _trades(frame) -> List[Tuple[float, float, float, str, Any]]:
+        """(wall seconds, price, volume, id, cursor value) per trade, oldest first"""
+        if frame is None or len(frame) == 0:
+            return []
+
+        seconds = _wall_seconds(frame['time'])
+        trades = []
+        for position, record in enumerate(frame.to_dict('records')):
+            raw = record['time']
+            trade_id = str(record.get('id') or f"{raw}:{record.get('price')}:{record.get('volume')}")
+            trades.append((seconds[position], float(record['price']), float(record.get('volume') or 0),
+                           trade_id, _cursor_value(raw)))
+        if trades[0][0] > trades[-1][0]:
+            # Newest-first feeds: flip so trades within one second stay in trading order
+            trades.reverse()
+        trades.sort(key=lambda trade: trade[0])
+        return trades
+
+    def poll_minutes(self, symbol: str, quote) -> int:
+        """Fetch today's 1-minute bars and write those from the newest stored minute on; returns how many"""
+        last = self.bars.last_time(symbol)
+        today = vietnam_now().strftime('%Y-%m-%d')
+
+        # VCI only takes a date as start, so the day is requested and trimmed here
+        frame = quote.history(start=today, interval='1m')
+        if frame is None or len(frame) == 0:
+            return 0
+
+        # The newest stored minute may have been partial; it is replaced with its final values
+        since = last if last is not None and _day(last) == today else None
+        seconds = _wall_seconds(frame['time'])
+        minutes = [
+            (seconds[position], float(record['open']), float(record['high']), float(record['low']),
+             float(record['close']), float(record.get('volume') or 0))
+            for position, record in enumerate(frame.to_dict('records'))
+            if _day(seconds[position]) == today and (since is None or seconds[position] >= since)
+        ]
+        return self.bars.upsert_minutes(symbol, minutes)
+
+def _wall_seconds(times) -> List[float]:
+    """Exchange wall-clock seconds for a column of timestamps"""
+    import pandas as pd
+
+    times = pd.to_datetime(times)
+    if getattr(times.dt, 'tz', None) is not None:
+        times = times.dt.tz_convert('Asia/Ho_Chi_Minh').dt.tz_localize(None)
+    return ((times - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).astype(float).tolist()
+
+def _cursor_value(raw) -> Any:
+    """
+    vnstock's last_time for the page before a trade: epoch seconds when the
+    zone is known, else the wall-clock string. One second later so trades
+    sharing that second are not skipped; the overlap is dropped by id.
+    """
+    import pandas as pd
+
+    raw = pd.Timestamp(raw) + pd.Timedelta(seconds=1)
+    if raw.tzinfo is not None:
+        return int(raw.timestamp())
+    return str(raw)[:19]
+
+def _day(seconds: float) -> str:
+    return _wall_string(seconds)[:10]
+
+def _wall_string(seconds: float) -> str:
+    return datetime.utcfromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
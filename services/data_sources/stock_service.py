@@ -1,40 +1,287 @@
 """
 Vietnamese stock price service
 """
-from typing import List
-from vnstock import Vnstock
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.bar_store import BarStore
+from utils.formatters import format_indicators
+from utils.market_calendar import MarketCalendar, vietnam_now
 from ..core.base_service import BaseMarketDataService
 
 class StockService(BaseMarketDataService):
     """Service for fetching Vietnamese stock prices"""
-    
-    def __init__(self):
+
+    def __init__(self, bulk_quotes: bool = True, batch_size: int = 50, history_workers: int = 8,
+                 bar_store: Optional[BarStore] = None, indicator_factory: Optional[Callable[[List[str]], Any]] = None,
+                 indicator_fields: Optional[List[str]] = None, intraday_feed=None,
+                 intraday_fields: Optional[List[str]] = None, rate_limiter=None,
+                 calendar: Optional[MarketCalendar] = None):
         super().__init__("Vietnamese Stocks")
-    
+        self.bulk_quotes = bulk_quotes
+        self.batch_size = max(1, batch_size)
+        self.history_workers = max(1, history_workers)
+        self.bar_store = bar_store
+        # Builds an IndicatorEngine for a watchlist; None disables indicators
+        self.indicator_factory = indicator_factory
+        self.indicator_fields = indicator_fields or []
+        self._indicators = None
+        # Live trades aggregated into intraday bars while the market is open; None disables
+        self.intraday_feed = intraday_feed
+        self.intraday_fields = intraday_fields or []
+        self._quotes: Dict[str, Any] = {}
+        # Shared TokenBucket taken before every vnstock request (scan mode); None for no limit
+        self.rate_limiter = rate_limiter
+        # Decides whether today's prices are a new daily bar (holidays come from MARKET_HOLIDAYS)
+        self.calendar = calendar or MarketCalendar()
+        self._client = None
+
+    def _throttle(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _get_client(self):
+        """Reuse a single vnstock client for every request"""
+        if self._client is None:
+            # vnstock is heavy to import, load it on first fetch
+            from vnstock import Vnstock
+            self._client = Vnstock()
+        return self._client
+
     def fetch_data(self, symbols: List[str]) -> List[str]:
         """Get Vietnamese stock prices with full precision"""
+        self.last_values = {}
+        prices = {}
+        # Previous session's close (the board's reference price), the base for percent moves
+        prev_closes = {}
+
+        # During the session, new trades since the last poll give live prices and bars
+        intraday = {}
+        if self.intraday_feed is not None and self.intraday_feed.is_open():
+            intraday = self._fetch_intraday(symbols)
+            prices.update({symbol: values['price'] for symbol, values in intraday.items()})
+
+        # Latest prices for the rest of the watchlist from the price board
+        if self.bulk_quotes:
+            board_prices, board_refs = self._fetch_price_board([symbol for symbol in symbols if symbol not in prices])
+            prices.update(board_prices)
+            prev_closes.update(board_refs)
+
+        # Anything the board did not cover falls back to daily history
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        errors = {}
+        if missing:
+            history_prices, history_prev, errors = self._fetch_history_prices(missing)
+            prices.update(history_prices)
+            prev_closes.update(history_prev)
+
+        indicators = {}
+        if self.indicator_factory is not None and prices:
+            try:
+                indicators = self._update_indicators(symbols, prices)
+            except Exception as e:
+                print(f"[{self.service_name}] {self.handle_error(e, 'computing indicators')}")
+
         results = []
-        
         for symbol in symbols:
+            if symbol in prices:
+                symbol_indicators = indicators.get(symbol, {})
+                symbol_intraday = intraday.get(symbol, {})
+                self.last_values[symbol] = {**symbol_intraday, 'price': prices[symbol], **symbol_indicators}
+                if symbol in prev_closes:
+                    self.last_values[symbol]['prev_close'] = prev_closes[symbol]
+                results.append(
+                    f"{symbol}: {prices[symbol]:,.1f}k VND"
+                    f"{format_indicators(symbol_intraday, self.intraday_fields)}"
+                    f"{format_indicators(symbol_indicators, self.indicator_fields)}"
+                )
+            elif symbol in errors:
+                results.append(f"{symbol}: ERROR - {errors[symbol][:30]}")
+            else:
+                results.append(f"{symbol}: N/A")
+
+        return results
+
+    def _fetch_intraday(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        """Pull new trades for every symbol concurrently; returns the session summary per symbol"""
+        feed = self.intraday_feed
+        if not symbols:
+            return {}
+
+        def poll(symbol: str) -> Dict[str, float]:
+            try:
+                if symbol not in self._quotes:
+                    self._quotes[symbol] = self._get_client().stock(symbol=symbol, source='VCI').quote
+                self._throttle()
+                feed.poll_trades(symbol, self._quotes[symbol])
+            except Exception as e:
+                print(f"[{self.service_name}] {self.handle_error(e, f'intraday trades for {symbol}')}")
+            return feed.bars.summary(symbol)
+
+        self._get_client()
+        with ThreadPoolExecutor(max_workers=min(self.history_workers, len(symbols))) as executor:
+            summaries = dict(zip(symbols, executor.map(poll, symbols)))
+        return {symbol: summary for symbol, summary in summaries.items() if summary}
+
+    def _fetch_price_board(self, symbols: List[str]) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Get latest and reference prices (in thousand VND) for all symbols in batched price board calls"""
+        prices = {}
+        refs = {}
+
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+
             try:
-                from datetime import datetime, timedelta
-                
-                # Dynamic date range - last 30 days to today
-                end_date = datetime.now().strftime('%Y-%m-%d')
-                start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                
-                stock = Vnstock().stock(symbol=symbol, source='VCI')
-                data = stock.quote.history(start=start_date, end=end_date, interval='1D')
-                
-                if data is not None and len(data) > 0:
-                    price = data.iloc[-1]['close']
-                    price_formatted = f"{price:,.1f}k VND"
-                    results.append(f"{symbol}: {price_formatted}")
-                else:
-                    results.append(f"{symbol}: N/A")
-                    
+                stock = self._get_client().stock(symbol=batch[0], source='VCI')
+                self._throttle()
+                board = stock.trading.price_board(batch)
+                batch_prices, batch_refs = self._parse_price_board(board)
+                prices.update(batch_prices)
+                refs.update(batch_refs)
             except Exception as e:
-                error_msg = self.handle_error(e, f"fetching {symbol}")
-                results.append(f"{symbol}: ERROR - {str(e)[:30]}")
-        
-        return results
\ No newline at end of file
+                error_msg = self.handle_error(e, f"price board for {len(batch)} symbols")
+                print(f"[{self.service_name}] {error_msg}")
+
+        return prices, refs
+
+    @staticmethod
+    def _parse_price_board(board) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Extract symbol -> price and symbol -> reference price (thousand VND) from a VCI price board"""
+        if board is None or len(board) == 0:
+            return {}, {}
+
+        def column(name: str):
+            # Price board columns are a MultiIndex like ('match', 'match_price')
+            for position, col in enumerate(board.columns):
+                label = col[-1] if isinstance(col, tuple) else col
+                if label == name:
+                    return board.iloc[:, position]
+            return None
+
+        symbol_col = column('symbol')
+        match_col = column('match_price')
+        ref_col = column('ref_price')
+        if symbol_col is None or (match_col is None and ref_col is None):
+            return {}, {}
+
+        prices = {}
+        refs = {}
+        for row in range(len(board)):
+            symbol = str(symbol_col.iloc[row])
+            price = match_col.iloc[row] if match_col is not None else 0
+            ref = ref_col.iloc[row] if ref_col is not None else 0
+
+            # Before the first match of the session fall back to the reference price
+            if not price or price != price:
+                price = ref
+
+            # Board prices are in VND, history closes are in thousand VND
+            if price and price == price:
+                prices[symbol] = float(price) / 1000
+            if ref and ref == ref:
+                refs[symbol] = float(ref) / 1000
+
+        return prices, refs
+
+    def _fetch_history_prices(self, symbols: List[str]) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]:
+        """Get the last and previous close for each symbol from daily history, concurrently"""
+        prices = {}
+        prev_closes = {}
+        errors = {}
+
+        self._get_client()
+        workers = min(self.history_workers, len(symbols))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(self._fetch_last_close, symbols)
+
+            for symbol, (price, prev_close, error) in zip(symbols, outcomes):
+                if price is not None:
+                    prices[symbol] = price
+                    if prev_close is not None:
+                        prev_closes[symbol] = prev_close
+                elif error:
+                    errors[symbol] = error
+
+        return prices, prev_closes, errors
+
+    def _fetch_last_close(self, symbol: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+        """Get the last and previous daily close for one symbol"""
+        try:
+            bars = self._fetch_bars(symbol, lookback_days=30, limit=2)
+            if bars:
+                prev_close = float(bars[-2]['close']) if len(bars) > 1 else None
+                return float(bars[-1]['close']), prev_close, None
+            return None, None, None
+
+        except Exception as e:
+            error_msg = self.handle_error(e, f"fetching {symbol}")
+            print(f"[{self.service_name}] {error_msg}")
+            return None, None, str(e)
+
+    def _fetch_bars(self, symbol: str, lookback_days: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Daily bars (date, close, volume; oldest first) covering the last `lookback_days`"""
+        stock = self._get_client().stock(symbol=symbol, source='VCI')
+
+        def fetch(start: str, end: str):
+            self._throttle()
+            return stock.quote.history(start=start, end=end, interval='1D')
+
+        if self.bar_store is not None:
+            # Only the missing or still-open days are downloaded
+            return self.bar_store.sync(symbol, 'VCI', fetch, lookback_days=lookback_days, limit=limit or lookback_days)
+
+        # Dynamic date range - last `lookback_days` to today
+        end_date = datetime.now().strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+        data = fetch(start_date, end_date)
+
+        if data is None or len(data) == 0:
+            return []
+        bars = [
+            {'date': str(record['time'])[:10], 'close': record.get('close'), 'volume': record.get('volume')}
+            for record in data.to_dict('records')
+        ]
+        return bars[-limit:] if limit else bars
+
+    def _update_indicators(self, symbols: List[str], prices: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """Indicators for the whole watchlist with the latest prices as today's bar"""
+        import numpy as np
+
+        if self._indicators is None or self._indicators.symbols != symbols:
+            self._indicators = self._seed_indicators(symbols)
+
+        # Before the open, on weekends and on holidays the board still shows the last
+        # session's prices: they update that bar instead of starting one for today
+        now = vietnam_now()
+        date = now.strftime('%Y-%m-%d') if self.calendar.has_opened(now) else None
+
+        closes = np.array([prices.get(symbol, np.nan) for symbol in symbols], dtype=float)
+        outputs = self._indicators.update(closes, date=date)
+        return self._indicators.values(outputs)
+
+    def _seed_indicators(self, symbols: List[str]):
+        """Build the indicator engine from stored daily history, fetching histories concurrently"""
+        from services.analytics.indicators import align_bars
+
+        engine = self.indicator_factory(symbols)
+        # Calendar days that hold enough trading days for the longest warm-up
+        lookback_days = engine.warmup_bars * 7 // 5 + 14
+
+        def load(symbol: str) -> List[Dict[str, Any]]:
+            try:
+                return self._fetch_bars(symbol, lookback_days)
+            except Exception as e:
+                print(f"[{self.service_name}] {self.handle_error(e, f'history for {symbol}')}")
+                return []
+
+        self._get_client()
+        with ThreadPoolExecutor(max_workers=min(self.history_workers, len(symbols))) as executor:
+            bars_by_symbol = dict(zip(symbols, executor.map(load, symbols)))
+
+        dates, closes, volumes = align_bars(bars_by_symbol, symbols)
+        if dates:
+            # The newest bar may still be trading: seed the rest, keep it pending
+            engine.seed(closes[:, :-1], volumes[:, :-1], as_of=dates[-2] if len(dates) > 1 else None)
+            engine.update(closes[:, -1], volumes[:, -1], date=dates[-1])
+
+        return engine
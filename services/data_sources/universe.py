@@ -0,0 +1,33 @@
+"""
+Listed stock universe from vnstock
+"""
+from typing import List, Optional
+
+# VCI reports HOSE as HSX
+EXCHANGE_ALIASES = {'HSX': 'HOSE', 'HOSE': 'HOSE', 'HNX': 'HNX', 'UPCOM': 'UPCOM'}
+
+def load_universe(exchanges: Optional[List[str]] = None, response_cache=None, ttl: float = 86400) -> List[str]:
+    """
+    Every listed stock (no funds, bonds or warrants) on the given exchanges, sorted.
+
+    The listing changes rarely, so it is kept in the response cache for
+    `ttl` seconds when one is given.
+    """
+    from vnstock import Listing
+
+    def fetch():
+        return Listing(source='VCI').symbols_by_exchange()
+
+    frame = response_cache.load_frame('vnstock:symbols_by_exchange', ttl, fetch) if response_cache else fetch()
+    if frame is None or len(frame) == 0:
+        return []
+
+    wanted = {EXCHANGE_ALIASES.get(exchange.upper(), exchange.upper()) for exchange in exchanges or EXCHANGE_ALIASES}
+    symbols = set()
+    for record in frame.to_dict('records'):
+        exchange = EXCHANGE_ALIASES.get(str(record.get('exchange', '')).upper())
+        kind = str(record.get('type', 'STOCK')).upper()
+        symbol = str(record.get('symbol', '')).strip().upper()
+        if symbol and exchange in wanted and kind == 'STOCK':
+            symbols.add(symbol)
+    return sorted(symbols)
@@ -0,0 +1,124 @@
+"""
+Shared VCB exchange rate table
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from utils.cache import TTLCache
+
+# VCB column for each side of a quote (the column name really contains a space)
+SIDE_COLUMNS = {'cash': 'buy _cash', 'transfer': 'buy _transfer', 'sell': 'sell'}
+
+class CrossRates:
+    """
+    VCB rates parsed into numeric arrays with a precomputed cross-rate matrix.
+
+    rate(base, quote, side) is the price of one `base` in `quote` via VND:
+    - buy: what the bank pays, buy_transfer(base) / sell(quote)
+    - sell: what the bank charges, sell(base) / buy_transfer(quote)
+    - transfer: the transfer rate ratio, buy_transfer(base) / buy_transfer(quote)
+    VND is included with a rate of 1 on every side.
+    """
+    SIDES = ('buy', 'transfer', 'sell')
+
+    def __init__(self, rows: Dict[str, Dict[str, Any]], codes: List[str], cash, transfer, sell):
+        import numpy as np
+
+        self.rows = rows
+        self.codes = list(codes) + ['VND']
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        one = np.ones(1)
+        self.cash = np.concatenate([np.asarray(cash, dtype=float), one])
+        self.transfer = np.concatenate([np.asarray(transfer, dtype=float), one])
+        self.sell = np.concatenate([np.asarray(sell, dtype=float), one])
+
+        # Non-positive rates ('-' in the VCB table) become NaN so they never divide
+        for column in (self.cash, self.transfer, self.sell):
+            column[~(column > 0)] = np.nan
+
+        # Outer division: one n x n matrix per side
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.matrix = {
+                'buy': self.transfer[:, None] / self.sell[None, :],
+                'transfer': self.transfer[:, None] / self.transfer[None, :],
+                'sell': self.sell[:, None] / self.transfer[None, :],
+            }
+
+    @classmethod
+    def from_frame(cls, rate_data) -> 'CrossRates':
+        """Parse the VCB DataFrame's comma-formatted columns in one vectorized pass"""
+        import pandas as pd
+
+        rate_data = rate_data.drop_duplicates(subset='currency_code')
+        numeric = {}
+        for side, column in SIDE_COLUMNS.items():
+            values = rate_data[column] if column in rate_data.columns else pd.Series(index=rate_data.index, dtype=object)
+            numeric[side] = pd.to_numeric(values.astype(str).str.replace(',', '', regex=False), errors='coerce').to_numpy()
+
+        rows = rate_data.set_index('currency_code').to_dict('index')
+        return cls(rows, rate_data['currency_code'].tolist(), numeric['cash'], numeric['transfer'], numeric['sell'])
+
+    def vnd_rate(self, currency: str, side: str) -> Optional[float]:
+        """One currency's VND rate for 'cash', 'transfer' or 'sell', or None if not quoted"""
+        i = self.index.get(currency)
+        if i is None:
+            return None
+        value = getattr(self, side)[i]
+        return None if value != value else float(value)
+
+    def rate(self, base: str, quote: str, side: str = 'transfer') -> Optional[float]:
+        """Cross rate of base in quote for 'buy', 'transfer' or 'sell', or None if not quoted"""
+        i = self.index.get(base)
+        j = self.index.get(quote)
+        if i is None or j is None:
+            return None
+        value = self.matrix[side][i, j]
+        return None if value != value else float(value)
+
+    def to_frame(self, side: str = 'transfer'):
+        """The whole matrix for one side as a DataFrame (rows: base, columns: quote)"""
+        import pandas as pd
+        return pd.DataFrame(self.matrix[side], index=self.codes, columns=self.codes)
+
+class VCBRateProvider:
+    """Fetches the VCB rate table once and shares it between services"""
+
+    def __init__(self, ttl: float = 300, response_cache=None):
+        self.ttl = ttl
+        self._cache = TTLCache(ttl=ttl, max_entries=2)
+        # Optional disk cache so separate runs within the TTL share one download
+        self.response_cache = response_cache
+
+    def get_cross_rates(self) -> Optional[CrossRates]:
+        """
+        Get today's parsed rate table, or None if VCB returned nothing.
+
+        Concurrent callers wait on a single download; the parsed table is
+        reused until the TTL expires or the date changes.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        return self._cache.get_or_load(today, lambda: self._load(today))
+
+    def get_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Get today's raw rate rows indexed by currency code"""
+        table = self.get_cross_rates()
+        return table.rows if table is not None else {}
+
+    def get_rate(self, currency: str) -> Optional[Dict[str, Any]]:
+        """Get the raw VCB row for one currency, or None if it is not listed"""
+        return self.get_rates().get(currency)
+
+    def _load(self, date: str) -> Optional[CrossRates]:
+        """Download the VCB table and parse it into numeric columns"""
+        from vnstock.explorer.misc import vcb_exchange_rate
+
+        if self.response_cache is not None:
+            rate_data = self.response_cache.load_frame(
+                f"vnstock:vcb_exchange_rate:{date}", self.ttl, lambda: vcb_exchange_rate(date=date))
+        else:
+            rate_data = vcb_exchange_rate(date=date)
+
+        if rate_data is None or len(rate_data) == 0:
+            return None
+
+        return CrossRates.from_frame(rate_data)
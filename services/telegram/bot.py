@@ -1,44 +1,59 @@
-import asyncio
-from telegram import Bot
-from telegram.constants import ParseMode
-from config.settings import TOKEN, CHAT_ID
+import atexit
+import threading
+from typing import Dict, List, Optional
+from config.settings import TOKEN, CHAT_IDS, TELEGRAM_API_URL
 
-def send_to_telegram(message, parse_mode="Markdown"):
+_delivery = None
+_delivery_lock = threading.Lock()
+
+def get_delivery():
+    """Shared delivery queue; the bot session lives as long as the process"""
+    global _delivery
+
+    with _delivery_lock:
+        if _delivery is None:
+            from .delivery import TelegramDelivery
+            _delivery = TelegramDelivery(TOKEN, base_url=TELEGRAM_API_URL)
+            atexit.register(close_telegram)
+
+    return _delivery
+
+def send_to_telegram(message, parse_mode="Markdown", chat_ids: Optional[List[str]] = None):
     """
     Gửi tin nhắn đến Telegram sử dụng python-telegram-bot library
     """
-    if not message or not TOKEN or not CHAT_ID:
+    results = send_to_chats(message, parse_mode, chat_ids)
+    return bool(results) and all(results.values())
+
+def send_to_chats(message, parse_mode="Markdown", chat_ids: Optional[List[str]] = None) -> Dict[str, bool]:
+    """Send a message to every chat; returns success per chat (empty if nothing could be sent)"""
+    chat_ids = chat_ids or CHAT_IDS
+    if not message or not TOKEN or not chat_ids:
         print("Missing message, token, or chat_id")
-        return
-        
-    print(f"Sending message to Telegram: {message[:50]}...")
-    
-    # Run async function in sync context
-    asyncio.run(_send_message_async(message, parse_mode))
-
-async def _send_message_async(message, parse_mode):
-    """
-    Async function to send message using telegram bot
-    """
-    try:
-        bot = Bot(token=TOKEN)
-        
-        # Convert parse_mode string to ParseMode enum
-        telegram_parse_mode = ParseMode.MARKDOWN if parse_mode == "Markdown" else None
-        
-        await bot.send_message(
-            chat_id=CHAT_ID,
-            text=message,
-            parse_mode=telegram_parse_mode
-        )
-        
+        return {}
+
+    print(f"Sending message to Telegram ({len(chat_ids)} chat(s)): {message[:50]}...")
+
+    # Run on the shared background loop so the bot session is reused
+    from utils.async_runner import run_sync
+    results = run_sync(get_delivery().send(chat_ids, message, parse_mode))
+
+    failed = [chat_id for chat_id, ok in results.items() if not ok]
+    if failed:
+        print(f"Failed to deliver to: {', '.join(failed)}")
+    else:
         print("Message sent successfully.")
-        
-    except Exception as e:
-        print(f"Error sending message to Telegram: {e}")
-    finally:
-        # Clean up bot session
+
+    return results
+
+def close_telegram():
+    """Close the shared bot session"""
+    global _delivery
+
+    if _delivery is not None:
+        from utils.async_runner import run_sync
         try:
-            await bot.close()
-        except:
+            run_sync(_delivery.close(), timeout=5)
+        except Exception:
             pass
+        _delivery = None
@@ -0,0 +1,173 @@
+"""
+Interactive Telegram commands answered from a shared cache
+"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.cache import TTLCache
+from services.core.exceptions import DataFetchError
+
+# command -> (service name, takes symbols)
+COMMANDS = {
+    'price': ('stock', True),
+    'crypto': ('crypto', True),
+    'fx': ('exchange', True),
+    'gold': ('gold', False),
+    'vnindex': ('vnindex', False),
+}
+
+# Symbols answered per command message
+MAX_SYMBOLS = 10
+
+HELP_TEXT = (
+    "Commands:\n"
+    "/price VCB HPG - stock prices\n"
+    "/crypto BTC ETH - crypto prices\n"
+    "/fx USD EUR/JPY - VCB rates and cross rates\n"
+    "/gold - gold prices\n"
+    "/vnindex - VN-Index"
+)
+
+def _is_error(line: str) -> bool:
+    """Service lines that report a failure rather than a price (a single N/A price is still an answer)"""
+    value = line.split(':', 1)[1].strip() if ':' in line else line.strip()
+    return value.startswith('ERROR') or value in ('N/A', 'Not available')
+
+class MarketQueryCache:
+    """
+    Per-symbol answers in front of the data services.
+
+    Each (service, symbol) line is cached for `ttl` seconds; concurrent
+    lookups of the same key share one fetch. Failures are not cached.
+    Regular collections can prime the cache so commands rarely fetch.
+    """
+
+    def __init__(self, get_service: Callable[[str], Any], ttl: float = 60, max_entries: int = 2000):
+        self.get_service = get_service
+        self._cache = TTLCache(ttl=ttl, max_entries=max_entries)
+
+    def lookup(self, name: str, symbol: Optional[str] = None) -> str:
+        """Cached line for one symbol (or the whole section when symbol is None)"""
+        return self._cache.get_or_load((name, symbol), lambda: self._load(name, symbol))
+
+    def _load(self, name: str, symbol: Optional[str]) -> str:
+        """Fetch one symbol through its service; raises DataFetchError so failures are not cached"""
+        service = self.get_service(name)
+        if service is None:
+            raise DataFetchError(name, f"{symbol or name}: not enabled")
+
+        if name == 'exchange':
+            cross = '/' in symbol
+            data = service.fetch_data(currencies=[] if cross else [symbol], cross_pairs=[symbol] if cross else None)
+        elif symbol is not None:
+            data = service.fetch_data(symbols=[symbol])
+        else:
+            data = service.fetch_data()
+
+        text = '\n'.join(data) if isinstance(data, list) else str(data)
+        if _is_error(text):
+            raise DataFetchError(name, text)
+        return text
+
+    def prime(self, results: Dict[str, Any]):
+        """Fill the cache from a regular collection ({service: lines or text})"""
+        for name, data in results.items():
+            if data is None or name not in {service for service, _ in COMMANDS.values()}:
+                continue
+
+            if not isinstance(data, list):
+                if not _is_error(str(data)):
+                    self._cache.set((name, None), str(data))
+                continue
+
+            for line in data:
+                symbol = line.split(':', 1)[0].strip()
+                if symbol and not _is_error(line):
+                    self._cache.set((name, symbol), line)
+
+def parse_command(text: str) -> Tuple[Optional[str], List[str]]:
+    """Split '/price@bot vcb hpg' into ('price', ['VCB', 'HPG'])"""
+    parts = text.strip().split()
+    if not parts or not parts[0].startswith('/'):
+        return None, []
+
+    command = parts[0][1:].split('@', 1)[0].lower()
+    symbols = [part.upper().strip(',') for part in parts[1:] if part.strip(',')]
+    return command, list(dict.fromkeys(symbols))[:MAX_SYMBOLS]
+
+class CommandListener:
+    """
+    Long-polls Telegram for commands and replies through the delivery queue.
+
+    Runs on the shared background loop with the delivery's bot session;
+    lookups run in worker threads so slow fetches never block polling.
+    """
+
+    def __init__(self, queries: MarketQueryCache, delivery):
+        self.queries = queries
+        self.delivery = delivery
+        self._application = None
+
+    async def start(self):
+        """Register handlers and start long polling"""
+        from telegram.ext import Application, MessageHandler, filters
+
+        bot = await self.delivery.get_bot()
+        application = Application.builder().bot(bot).build()
+        application.add_handler(MessageHandler(filters.COMMAND, self._handle))
+
+        await application.initialize()
+        await application.start()
+        await application.updater.start_polling(drop_pending_updates=True)
+        self._application = application
+        print("Listening for Telegram commands")
+
+    async def stop(self):
+        """Stop polling and the application"""
+        application, self._application = self._application, None
+        if application is None:
+            return
+
+        try:
+            await application.updater.stop()
+            await application.stop()
+            await application.shutdown()
+        except Exception as e:
+            print(f"Error stopping Telegram commands: {e}")
+
+    async def _handle(self, update, context):
+        """Answer one command message"""
+        message = update.effective_message
+        if message is None or not message.text:
+            return
+
+        reply = await self.answer(message.text)
+        if reply:
+            await self.delivery.send([str(message.chat_id)], reply)
+
+    async def answer(self, text: str) -> Optional[str]:
+        """Reply text for a command, or None for commands this bot does not know"""
+        command, symbols = parse_command(text)
+
+        if command in ('start', 'help'):
+            return HELP_TEXT
+        if command not in COMMANDS:
+            return None
+
+        name, takes_symbols = COMMANDS[command]
+        if takes_symbols and not symbols:
+            return f"Usage: /{command} SYMBOL [SYMBOL ...]"
+
+        loop = asyncio.get_running_loop()
+        keys = symbols if takes_symbols else [None]
+        lines = await asyncio.gather(
+            *[loop.run_in_executor(None, self._lookup, name, symbol) for symbol in keys]
+        )
+        return "```\n" + "\n".join(lines) + "\n```"
+
+    def _lookup(self, name: str, symbol: Optional[str]) -> str:
+        try:
+            return self.queries.lookup(name, symbol)
+        except DataFetchError as e:
+            return e.message
+        except Exception as e:
+            return f"{symbol or name}: ERROR - {str(e)[:50]}"
@@ -0,0 +1,170 @@
+"""
+Pinned per-chat dashboard kept current with editMessageText
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+from .delivery import GROUP_CHAT_INTERVAL, PRIVATE_CHAT_INTERVAL, split_message
+from .formatter import MESSAGE_HEADER, SECTION_TITLES, format_footer, format_section
+
+class Dashboard:
+    """
+    One pinned message per chat, edited in place instead of posting updates.
+
+    Sections are rendered one by one and reused while their data is
+    unchanged. A chat is only edited when its text (without the timestamp
+    footer) differs from what it shows, and at most once per `interval`
+    seconds: updates arriving sooner replace the pending text, which is
+    sent when the interval is up. The message id and shown text of each
+    chat persist in `state_path`, so restarts keep editing the same message.
+    """
+
+    def __init__(self, delivery, state_path: str, interval: float = 10.0):
+        self.delivery = delivery
+        self.state_path = state_path
+        self.interval = interval
+        # chat id -> {'message_id': int, 'body': str}
+        self.chats: Dict[str, Dict[str, Any]] = {}
+        # (section, data) -> rendered text, kept for the sections of the latest update
+        self._rendered: Dict[Tuple[str, Any], str] = {}
+        # Touched only on the delivery loop
+        self._pending: Dict[str, str] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._last_edit: Dict[str, float] = {}
+        self._load()
+
+    def _load(self):
+        """Restore the dashboard message of each chat"""
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.chats = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable dashboard state {self.state_path}: {e}")
+
+    def _save(self):
+        """Persist the state atomically so a crash never leaves half a file"""
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.chats, f)
+        os.replace(tmp_path, self.state_path)
+
+    def render(self, sections: Dict[str, Any], cache: Optional[Dict[Tuple[str, Any], str]] = None) -> str:
+        """Dashboard text without the footer; '' when every section is empty"""
+        cache = self._rendered if cache is None else cache
+        body = ""
+        for name in SECTION_TITLES:
+            data = sections.get(name)
+            if not data:
+                continue
+            key = (name, data if isinstance(data, str) else tuple(data))
+            text = cache.get(key) or self._rendered.get(key)
+            if text is None:
+                text = format_section(name, data)
+            cache[key] = text
+            body += text
+
+        return MESSAGE_HEADER + body if body else ""
+
+    def update(self, chat_sections: Dict[str, Dict[str, Any]]):
+        """Queue each chat's sections; edits happen on the delivery loop"""
+        rendered: Dict[Tuple[str, Any], str] = {}
+        bodies = {str(chat_id): self.render(sections, rendered) for chat_id, sections in chat_sections.items()}
+        self._rendered = rendered
+
+        from utils.async_runner import run_sync
+        run_sync(self._submit(bodies), timeout=10)
+
+    async def _submit(self, bodies: Dict[str, str]):
+        now = time.monotonic()
+        for chat_id, body in bodies.items():
+            if not body:
+                continue
+            if chat_id not in self._pending and body == self.chats.get(chat_id, {}).get('body'):
+                continue
+
+            # A newer update replaces the pending one
+            self._pending[chat_id] = body
+            if chat_id not in self._timers:
+                delay = max(0.0, self._last_edit.get(chat_id, 0.0) + self._interval_for(chat_id) - now)
+                self._timers[chat_id] = asyncio.create_task(self._flush_later(chat_id, delay))
+
+    def _interval_for(self, chat_id: str) -> float:
+        # Group and channel ids are negative and have a stricter limit
+        limit = GROUP_CHAT_INTERVAL if chat_id.startswith('-') else PRIVATE_CHAT_INTERVAL
+        return max(self.interval, limit)
+
+    async def _flush_later(self, chat_id: str, delay: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            body = self._pending.pop(chat_id, None)
+            if body is not None and body != self.chats.get(chat_id, {}).get('body'):
+                await self._publish(chat_id, body)
+                self._last_edit[chat_id] = time.monotonic()
+        except Exception as e:
+            print(f"Error updating dashboard in chat {chat_id}: {e}")
+        finally:
+            self._timers.pop(chat_id, None)
+            if chat_id in self._pending:
+                # An update arrived during the edit; it goes out one interval later
+                self._timers[chat_id] = asyncio.create_task(self._flush_later(chat_id, self._interval_for(chat_id)))
+
+    async def _publish(self, chat_id: str, body: str):
+        """Edit the chat's dashboard, posting and pinning a new one when there is none to edit"""
+        from telegram.constants import ParseMode
+        from telegram.error import BadRequest
+
+        parts = split_message(body + format_footer())
+        if len(parts) > 1:
+            print(f"Dashboard for chat {chat_id} is too long, showing the first {len(parts[0])} characters")
+        text = parts[0]
+
+        message_id = self.chats.get(chat_id, {}).get('message_id')
+        if message_id:
+            try:
+                await self.delivery.call('edit_message_text', chat_id=chat_id, message_id=message_id,
+                                         text=text, parse_mode=ParseMode.MARKDOWN)
+            except BadRequest as e:
+                error = str(e).lower()
+                if 'not modified' in error:
+                    pass
+                elif 'not found' in error or "can't be edited" in error:
+                    # Deleted (or too old to edit): start a new dashboard
+                    print(f"Dashboard message in chat {chat_id} is gone, posting a new one")
+                    message_id = None
+                else:
+                    raise
+
+        if not message_id:
+            message = await self.delivery.call('send_message', chat_id=chat_id, text=text,
+                                               parse_mode=ParseMode.MARKDOWN)
+            message_id = message.message_id
+            try:
+                await self.delivery.call('pin_chat_message', chat_id=chat_id, message_id=message_id,
+                                         disable_notification=True)
+            except Exception as e:
+                # Groups need the pin permission; the dashboard still updates unpinned
+                print(f"Could not pin dashboard in chat {chat_id}: {e}")
+
+        self.chats[chat_id] = {'message_id': message_id, 'body': body}
+        self._save()
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until every pending edit has been sent"""
+        async def drain():
+            while self._timers:
+                await asyncio.gather(*list(self._timers.values()), return_exceptions=True)
+
+        from utils.async_runner import run_sync
+        try:
+            run_sync(drain(), timeout=timeout)
+        except Exception as e:
+            print(f"Dashboard edits still pending after {timeout}s: {e!r}")
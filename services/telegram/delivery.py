@@ -0,0 +1,244 @@
+"""
+Telegram delivery queue with a persistent bot session and rate limiting
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+from utils.metrics import TELEGRAM_SEND_LATENCY
+
+# Telegram rejects messages longer than this
+TELEGRAM_MAX_LENGTH = 4096
+
+# Telegram limits: ~30 messages/s overall, 1/s per private chat, 20/min per group
+GLOBAL_RATE = 30
+PRIVATE_CHAT_INTERVAL = 1.0
+GROUP_CHAT_INTERVAL = 3.0
+
+CODE_FENCE = "```"
+
+def split_message(message: str, limit: int = TELEGRAM_MAX_LENGTH) -> List[str]:
+    """
+    Split a message into parts no longer than `limit`.
+
+    Sections (separated by a blank line) are kept whole where possible; a
+    section that is too long on its own is split by lines, closing and
+    reopening its code block so the Markdown stays valid.
+    """
+    if len(message) <= limit:
+        return [message]
+
+    parts = []
+    current = ""
+
+    for section in message.split("\n\n"):
+        pieces = [section] if len(section) <= limit else _split_section(section, limit)
+
+        for piece in pieces:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                if current:
+                    parts.append(current)
+                current = piece
+
+    if current:
+        parts.append(current)
+
+    return parts
+
+def _split_section(section: str, limit: int) -> List[str]:
+    """Split one oversized section by lines, keeping code fences balanced"""
+    pieces = []
+    current = ""
+    in_code = False
+    reserve = len(CODE_FENCE) + 1
+
+    for line in section.split("\n"):
+        # Hard-wrap single lines that could never fit
+        while len(line) > limit - 2 * reserve:
+            head, line = line[:limit - 2 * reserve], line[limit - 2 * reserve:]
+            pieces, current = _flush(pieces, current, head, in_code, limit, reserve)
+
+        pieces, current = _flush(pieces, current, line, in_code, limit, reserve)
+        if line.strip().startswith(CODE_FENCE):
+            in_code = not in_code
+
+    if current:
+        pieces.append(current)
+
+    return pieces
+
+def _flush(pieces: List[str], current: str, line: str, in_code: bool, limit: int, reserve: int):
+    """Append a line to the current piece, starting a new piece when it would overflow"""
+    candidate = f"{current}\n{line}" if current else line
+    if len(candidate) + (reserve if in_code else 0) <= limit:
+        return pieces, candidate
+
+    if in_code:
+        pieces.append(f"{current}\n{CODE_FENCE}")
+        return pieces, f"{CODE_FENCE}\n{line}"
+
+    pieces.append(current)
+    return pieces, line
+
+class AsyncRateLimiter:
+    """Spaces out calls so at most `rate` happen per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class TelegramDelivery:
+    """
+    Delivers messages through one long-lived bot session.
+
+    Each chat has its own queue and worker so chats are served concurrently
+    while messages to the same chat stay in order and respect the per-chat
+    limit. All workers share the global rate limiter.
+    """
+
+    def __init__(self, token: str, base_url: Optional[str] = None, max_retries: int = 3,
+                 connection_pool_size: int = 16):
+        self.token = token
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.connection_pool_size = connection_pool_size
+        self._bot = None
+        self._global_limiter: Optional[AsyncRateLimiter] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    async def get_bot(self):
+        """Create and initialize the bot session on first use"""
+        if self._bot is None:
+            from telegram import Bot
+            from telegram.request import HTTPXRequest
+
+            kwargs = {'base_url': self.base_url} if self.base_url else {}
+            bot = Bot(
+                token=self.token,
+                request=HTTPXRequest(connection_pool_size=self.connection_pool_size),
+                **kwargs
+            )
+            await bot.initialize()
+            self._bot = bot
+            self._global_limiter = AsyncRateLimiter(GLOBAL_RATE)
+        return self._bot
+
+    async def send(self, chat_ids: List[str], message: str, parse_mode: Optional[str] = "Markdown") -> Dict[str, bool]:
+        """Send a message (split if needed) to every chat concurrently; returns success per chat"""
+        await self.get_bot()
+        parts = split_message(message)
+
+        futures = {}
+        for chat_id in chat_ids:
+            futures[chat_id] = [self._enqueue(str(chat_id), part, parse_mode) for part in parts]
+
+        results = {}
+        for chat_id, chat_futures in futures.items():
+            outcomes = await asyncio.gather(*chat_futures)
+            results[chat_id] = all(outcomes)
+
+        return results
+
+    def _enqueue(self, chat_id: str, text: str, parse_mode: Optional[str]) -> asyncio.Future:
+        """Queue one message part for a chat, starting its worker if needed"""
+        if chat_id not in self._queues:
+            self._queues[chat_id] = asyncio.Queue()
+            self._workers[chat_id] = asyncio.create_task(self._worker(chat_id))
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[chat_id].put_nowait((text, parse_mode, future))
+        return future
+
+    async def _worker(self, chat_id: str):
+        """Send queued parts for one chat, spaced by the per-chat limit"""
+        queue = self._queues[chat_id]
+        # Group and channel ids are negative and have a stricter limit
+        interval = GROUP_CHAT_INTERVAL if chat_id.startswith('-') else PRIVATE_CHAT_INTERVAL
+        next_send = 0.0
+
+        while True:
+            text, parse_mode, future = await queue.get()
+
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = time.monotonic()
+            ok = await self._send_with_retry(chat_id, text, parse_mode)
+            TELEGRAM_SEND_LATENCY.labels('success' if ok else 'error').observe(time.monotonic() - started)
+            next_send = time.monotonic() + interval
+
+            if not future.done():
+                future.set_result(ok)
+            queue.task_done()
+
+    async def _send_with_retry(self, chat_id: str, text: str, parse_mode: Optional[str]) -> bool:
+        """Send one message; False once it cannot be delivered"""
+        from telegram.constants import ParseMode
+
+        # Convert parse_mode string to ParseMode enum
+        telegram_parse_mode = ParseMode.MARKDOWN if parse_mode == "Markdown" else None
+
+        try:
+            await self.call('send_message', chat_id=chat_id, text=text, parse_mode=telegram_parse_mode)
+            return True
+        except Exception as e:
+            print(f"Error sending message to chat {chat_id}: {e}")
+            return False
+
+    async def call(self, method: str, **kwargs):
+        """
+        Call a Bot method under the global rate limit, waiting out RetryAfter
+        and retrying transient network errors. Other errors are raised.
+        """
+        from telegram.error import BadRequest, NetworkError, RetryAfter
+
+        bot = await self.get_bot()
+        chat_id = kwargs.get('chat_id')
+
+        for attempt in range(self.max_retries + 1):
+            await self._global_limiter.wait()
+            try:
+                return await getattr(bot, method)(**kwargs)
+            except RetryAfter as e:
+                if attempt >= self.max_retries:
+                    print(f"Giving up on chat {chat_id} after {self.max_retries + 1} attempts")
+                    raise
+                retry_after = e.retry_after
+                delay = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+                print(f"Telegram rate limit for chat {chat_id}, retrying in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+            except BadRequest:
+                # A malformed request will not succeed on retry
+                raise
+            except NetworkError:
+                # Includes TimedOut; transient, so back off and retry
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    async def close(self):
+        """Stop workers and close the bot session"""
+        for task in self._workers.values():
+            task.cancel()
+        self._workers.clear()
+        self._queues.clear()
+
+        if self._bot is not None:
+            try:
+                await self._bot.shutdown()
+            except Exception:
+                pass
+            self._bot = None
@@ -3,50 +3,57 @@ Telegram message formatter - Single message with English format
 """
 from datetime import datetime
 
-def format_combined_message(gold_data, stock_data, vnindex_data, exchange_data, crypto_data):
-    """Format all market data into single English message"""
-    message = "*📊 VIETNAM MARKET UPDATE*\n\n"
-    
-    # 1. Gold prices first
-    if gold_data:
-        message += "🥇 *GOLD PRICES*\n```\n"
-        message += f"{gold_data}\n"
-        message += "```\n\n"
-    
-    # 2. Stock prices second  
-    if stock_data:
-        message += "📈 *VIETNAMESE STOCKS*\n```\n"
-        for stock_info in stock_data:
-            message += f"{stock_info}\n"
-        message += "```\n\n"
-    
-    # 3. VN-Index third
-    if vnindex_data:
-        message += "📊 *MARKET INDEX*\n```\n"
-        message += f"{vnindex_data}\n"
-        message += "```\n\n"
-    
-    # 4. Exchange rates fourth
-    if exchange_data:
-        message += "💱 *VCB EXCHANGE RATES*\n```\n"
-        for rate_info in exchange_data:
-            message += f"{rate_info}\n"
-        message += "```\n\n"
-    
-    # 5. Cryptocurrency fifth
-    if crypto_data:
-        message += "₿ *CRYPTOCURRENCY*\n```\n"
-        for crypto_info in crypto_data:
-            message += f"{crypto_info}\n"
-        message += "```\n\n"
-    
-    # Add timestamp in UTC+7
+# Section titles in message order
+SECTION_TITLES = {
+    'gold': "🥇 *GOLD PRICES*",
+    'stock': "📈 *VIETNAMESE STOCKS*",
+    'vnindex': "📊 *MARKET INDEX*",
+    'exchange': "💱 *VCB EXCHANGE RATES*",
+    'crypto': "₿ *CRYPTOCURRENCY*",
+}
+
+MESSAGE_HEADER = "*📊 VIETNAM MARKET UPDATE*\n\n"
+
+def format_section(name, data):
+    """One titled code block; gold and vnindex are one string, the rest lists of lines"""
+    if not data:
+        return ""
+
+    lines = [data] if isinstance(data, str) else data
+    section = f"{SECTION_TITLES[name]}\n```\n"
+    for line in lines:
+        section += f"{line}\n"
+    section += "```\n\n"
+    return section
+
+def format_footer():
+    """Update time in UTC+7"""
     from datetime import timedelta
     utc_now = datetime.utcnow()
     vietnam_time = utc_now + timedelta(hours=7)
     now = vietnam_time.strftime('%d/%m/%Y %H:%M:%S')
-    message += f"_Updated: {now} (UTC+7)_"
-    
+    return f"_Updated: {now} (UTC+7)_"
+
+def format_combined_message(gold_data, stock_data, vnindex_data, exchange_data, crypto_data):
+    """Format all market data into single English message"""
+    message = MESSAGE_HEADER
+
+    # Gold -> Stocks -> VN-Index -> Exchange -> Crypto
+    message += format_section('gold', gold_data)
+    message += format_section('stock', stock_data)
+    message += format_section('vnindex', vnindex_data)
+    message += format_section('exchange', exchange_data)
+    message += format_section('crypto', crypto_data)
+
+    message += format_footer()
+    return message
+
+def format_alert_message(alert_texts):
+    """Format fired price alerts into one message"""
+    message = "*🔔 PRICE ALERTS*\n```\n"
+    for text in alert_texts:
+        message += f"{text}\n"
+    message += "```"
     return message
 
 # Keep individual formatters for compatibility if needed
@@ -0,0 +1,123 @@
+"""
+Per-chat watchlists rendered from one shared collection
+"""
+import json
+from typing import Any, Dict, List, Optional
+from .formatter import format_combined_message
+
+# Sections in message order; the symbol-keyed ones and their service parameter
+SECTIONS = ('gold', 'stock', 'vnindex', 'exchange', 'crypto')
+SYMBOL_PARAMS = {'stock': 'symbols', 'crypto': 'symbols', 'exchange': 'currencies'}
+
+class Subscriber:
+    """One chat with its own sections and symbol lists"""
+    __slots__ = ('chat_id', 'sections', 'watchlists')
+
+    def __init__(self, chat_id: str, sections: Optional[List[str]] = None,
+                 watchlists: Optional[Dict[str, List[str]]] = None):
+        self.chat_id = str(chat_id)
+        self.sections = [section for section in (sections or SECTIONS) if section in SECTIONS]
+        self.watchlists = watchlists or {}
+
+class SubscriberRegistry:
+    """
+    All subscribers of this bot.
+
+    Collection fetches the union of every watchlist once; each chat's
+    message is then cut from the shared results. Chats whose messages come
+    out identical are sent together.
+    """
+
+    def __init__(self, subscribers: List[Subscriber]):
+        self.subscribers = subscribers
+
+    @classmethod
+    def from_file(cls, path: str, defaults: Dict[str, List[str]], default_chat_ids: Optional[List[str]] = None):
+        """
+        Load subscribers from a JSON list like
+        [{"chat_id": "-100123", "sections": ["stock", "crypto"], "stock": ["VCB"], "crypto": ["BTC"]}].
+
+        Sections default to all and symbol lists to the global ones; the
+        default chats (CHAT_ID) are subscribed with the global lists.
+        """
+        with open(path, encoding='utf-8') as f:
+            specs = json.load(f)
+
+        subscribers = [cls._default(chat_id, defaults) for chat_id in default_chat_ids or []]
+        for position, spec in enumerate(specs):
+            try:
+                watchlists = {
+                    section: [symbol.strip().upper() for symbol in spec.get(section, defaults.get(section, []))]
+                    for section in SYMBOL_PARAMS
+                }
+                subscribers.append(Subscriber(spec['chat_id'], spec.get('sections'), watchlists))
+            except (KeyError, TypeError, AttributeError) as e:
+                print(f"Skipping subscriber #{position + 1} in {path}: {e}")
+
+        print(f"Loaded {len(subscribers)} subscribers from {path}")
+        return cls(subscribers)
+
+    @staticmethod
+    def _default(chat_id: str, defaults: Dict[str, List[str]]) -> Subscriber:
+        return Subscriber(chat_id, watchlists={section: list(defaults.get(section, [])) for section in SYMBOL_PARAMS})
+
+    def service_configs(self, base_configs: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Service parameters covering the union of every subscriber's symbols"""
+        configs = {name: dict(config) for name, config in base_configs.items()}
+
+        for section, param in SYMBOL_PARAMS.items():
+            union = {}
+            for subscriber in self.subscribers:
+                if section in subscriber.sections:
+                    union.update(dict.fromkeys(subscriber.watchlists.get(section, [])))
+
+            symbols = list(union)
+            if section == 'exchange':
+                # Pairs like EUR/JPY are cross rates, not VCB currencies
+                configs[section]['cross_pairs'] = [symbol for symbol in symbols if '/' in symbol]
+                symbols = [symbol for symbol in symbols if '/' not in symbol]
+            configs.setdefault(section, {})[param] = symbols
+
+        return configs
+
+    def chat_sections(self, results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Chat id -> that chat's sections, cut from one shared set of results"""
+        # Index every line by its symbol once
+        lines_by_symbol = {
+            section: {line.split(':', 1)[0].strip(): line for line in results.get(section) or []}
+            for section in SYMBOL_PARAMS
+        }
+        # Lines not about a watched symbol (e.g. "Crypto: ERROR - ...") concern the whole section
+        watched = {
+            section: {symbol for subscriber in self.subscribers for symbol in subscriber.watchlists.get(section, [])}
+            for section in SYMBOL_PARAMS
+        }
+        section_lines = {
+            section: [line for key, line in lines.items() if key not in watched[section]]
+            for section, lines in lines_by_symbol.items()
+        }
+
+        chats: Dict[str, Dict[str, Any]] = {}
+        for subscriber in self.subscribers:
+            sections = {}
+            for section in subscriber.sections:
+                if section in SYMBOL_PARAMS:
+                    lines = lines_by_symbol[section]
+                    picked = [lines[symbol] for symbol in subscriber.watchlists.get(section, []) if symbol in lines]
+                    sections[section] = picked + section_lines[section] or None
+                else:
+                    sections[section] = results.get(section)
+
+            if any(sections.values()):
+                chats[subscriber.chat_id] = sections
+
+        return chats
+
+    def render(self, results: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Message text -> chat ids, from one shared set of results"""
+        messages: Dict[str, List[str]] = {}
+        for chat_id, sections in self.chat_sections(results).items():
+            message = format_combined_message(*(sections.get(section) for section in SECTIONS))
+            messages.setdefault(message, []).append(chat_id)
+
+        return messages
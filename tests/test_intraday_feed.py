@@ -0,0 +1,47 @@
+"""
+IntradayFeed against a VCI quote stub that parses `start` like vnstock does
+"""
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from services.analytics.intraday import IntradayBars
+from services.data_sources.intraday_feed import IntradayFeed
+from utils.market_calendar import vietnam_now
+
+class MinuteQuote:
+    """1-minute VN-Index bars for today; `start` must be a plain date (vnstock/explorer/vci/quote.py)"""
+
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.starts = []
+
+    def history(self, start, end=None, interval='1D', **kwargs):
+        datetime.strptime(start, '%Y-%m-%d')
+        self.starts.append(start)
+        session = datetime.strptime(start, '%Y-%m-%d') + timedelta(hours=9)
+        times = [session + timedelta(minutes=minute) for minute in range(self.minutes)]
+        return pd.DataFrame({
+            'time': times,
+            'open': [1000.0 + minute for minute in range(self.minutes)],
+            'high': [1001.0 + minute for minute in range(self.minutes)],
+            'low': [999.0 + minute for minute in range(self.minutes)],
+            'close': [1000.5 + minute for minute in range(self.minutes)],
+            'volume': [10.0] * self.minutes,
+        })
+
+def test_poll_minutes_twice_sends_dates_and_writes_only_new_minutes():
+    feed = IntradayFeed(IntradayBars())
+    quote = MinuteQuote(5)
+
+    assert feed.poll_minutes('VNINDEX', quote) == 5
+
+    quote.minutes = 8
+    # The newest stored minute is rewritten with its final values, then the 3 new ones
+    assert feed.poll_minutes('VNINDEX', quote) == 4
+
+    today = vietnam_now().strftime('%Y-%m-%d')
+    assert quote.starts == [today, today]
+    bars = feed.bars.bars('VNINDEX', 60)
+    assert len(bars) == 8
+    assert bars[-1]['close'] == 1007.5
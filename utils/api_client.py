@@ -1,57 +1,240 @@
 """
-Common HTTP client with retry logic
+Common HTTP client with connection pooling, retries and circuit breaking
 """
-import requests
-from time import sleep
-from typing import Optional, Dict, Any
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any
+from urllib.parse import urlsplit
+import httpx
+from .async_runner import run_sync
+from .metrics import RESPONSE_CACHE_TOTAL, UPSTREAM_RESPONSES
+
+if TYPE_CHECKING:
+    from .response_cache import ResponseCache
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx when installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Status codes worth retrying: rate limited or a transient server failure
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised when a host's circuit breaker is open and requests are short-circuited"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s")
+
+class CircuitBreaker:
+    """Per-host breaker: opens after consecutive failures, probes again after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def check(self, host: str):
+        """Raise CircuitOpenError while open; let one probe through once the cool-down passes"""
+        if self.opened_at is None:
+            return
+
+        elapsed = time.monotonic() - self.opened_at
+        if elapsed < self.reset_timeout:
+            raise CircuitOpenError(host, self.reset_timeout - elapsed)
+
+        # Half-open: allow this request, re-open immediately if it fails
+        self.failures = self.failure_threshold - 1
+        self.opened_at = None
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
 
 class APIClient:
-    """HTTP client with retry logic and common headers"""
-    
-    def __init__(self, timeout: int = 10, max_retries: int = 3):
+    """Pooled async HTTP client with retry logic and common headers"""
+
+    def __init__(self, timeout: float = 10, max_retries: int = 3, max_connections: int = 100,
+                 max_connections_per_host: int = 10, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 breaker_threshold: int = 5, breaker_reset: float = 30.0):
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
         self.headers = {'User-Agent': 'Mozilla/5.0 (compatible; MarketBot/1.0)'}
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-    
-    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
-        """GET request with retry logic"""
-        return self._request('GET', url, params=params, headers=headers)
-    
-    def post(self, url: str, data: Optional[Dict] = None, json: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
-        """POST request with retry logic"""
-        return self._request('POST', url, data=data, json=json, headers=headers)
-    
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Execute request with retry logic"""
-        last_exception = None
-        
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # Disk cache for GET responses, installed at startup when enabled
+        self.cache: Optional['ResponseCache'] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled client lazily inside the running loop"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    def _host_state(self, host: str):
+        """Connection slots and circuit breaker for one host"""
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+            self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return self._host_slots[host], self._breakers[host]
+
+    async def aget(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                   cache: bool = True) -> httpx.Response:
+        """Async GET request with retry logic, answered from the response cache when possible"""
+        if self.cache is None or not cache:
+            return await self._request('GET', url, params=params, headers=headers)
+        return await self._cached_get(url, params, headers)
+
+    async def apost(self, url: str, data: Optional[Dict] = None, json: Optional[Dict] = None, headers: Optional[Dict] = None) -> httpx.Response:
+        """Async POST request with retry logic"""
+        return await self._request('POST', url, data=data, json=json, headers=headers)
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            cache: bool = True) -> httpx.Response:
+        """GET request with retry logic (blocking wrapper for sync callers)"""
+        return run_sync(self.aget(url, params=params, headers=headers, cache=cache))
+
+    def post(self, url: str, data: Optional[Dict] = None, json: Optional[Dict] = None, headers: Optional[Dict] = None) -> httpx.Response:
+        """POST request with retry logic (blocking wrapper for sync callers)"""
+        return run_sync(self.apost(url, data=data, json=json, headers=headers))
+
+    async def _cached_get(self, url: str, params: Optional[Dict], headers: Optional[Dict]) -> httpx.Response:
+        """
+        GET through the response cache.
+
+        Fresh entries are returned without a request; stale ones with
+        validators are revalidated and a 304 reuses the stored body. The
+        SQLite reads and writes run on the default executor so a slow or
+        locked cache never stalls the shared event loop.
+        """
+        loop = asyncio.get_running_loop()
+        key = self.cache.key(url, params)
+        entry = await loop.run_in_executor(None, self.cache.lookup, key)
+        if entry is not None and self.cache.is_fresh(entry):
+            RESPONSE_CACHE_TOTAL.labels('hit').inc()
+            return self._cached_response(entry, url, params)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.cache.validators(entry))
+
+        response = await self._request('GET', url, params=params, headers=request_headers)
+
+        if response.status_code == 304 and entry is not None:
+            RESPONSE_CACHE_TOTAL.labels('revalidated').inc()
+            await loop.run_in_executor(None, self.cache.refresh, key, entry['url'], response.headers.multi_items())
+            return self._cached_response(entry, url, params)
+
+        RESPONSE_CACHE_TOTAL.labels('miss').inc()
+        if response.status_code == 200:
+            await loop.run_in_executor(None, self.cache.store, key, str(response.url), response.status_code,
+                                       response.headers.multi_items(), response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(entry: Dict[str, Any], url: str, params: Optional[Dict]) -> httpx.Response:
+        """Rebuild a response from a cache entry"""
+        return httpx.Response(
+            entry['status'],
+            headers=[tuple(header) for header in entry['headers']],
+            content=entry['body'],
+            request=httpx.Request('GET', url, params=params)
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Execute request with retries, jittered backoff and per-host circuit breaking"""
+        host = urlsplit(url).netloc
+        slots, breaker = self._host_state(host)
+        client = self._get_client()
+
         for attempt in range(self.max_retries + 1):
+            breaker.check(host)
+            retry_after = None
+
             try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    timeout=self.timeout,
-                    **kwargs
-                )
-                return response
-                
-            except requests.exceptions.RequestException as e:
-                last_exception = e
-                
-                if attempt < self.max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"Request failed (attempt {attempt + 1}/{self.max_retries + 1}), retrying in {wait_time}s...")
-                    sleep(wait_time)
-                else:
-                    print(f"Request failed after {self.max_retries + 1} attempts")
-        
-        raise last_exception
-    
+                async with slots:
+                    response = await client.request(method, url, **kwargs)
+                UPSTREAM_RESPONSES.labels(host, str(response.status_code)).inc()
+
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+
+                breaker.record_failure()
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                if attempt >= self.max_retries:
+                    print(f"Request to {host} failed with {response.status_code} after {attempt + 1} attempts")
+                    return response
+                reason = f"HTTP {response.status_code}"
+
+            except httpx.TransportError as e:
+                UPSTREAM_RESPONSES.labels(host, 'transport_error').inc()
+                breaker.record_failure()
+                if attempt >= self.max_retries:
+                    print(f"Request to {host} failed after {attempt + 1} attempts")
+                    raise
+                reason = type(e).__name__
+
+            wait_time = self._backoff(attempt, retry_after)
+            print(f"Request to {host} failed ({reason}, attempt {attempt + 1}/{self.max_retries + 1}), retrying in {wait_time:.1f}s...")
+            await asyncio.sleep(wait_time)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delta-seconds or an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def aclose(self):
+        """Close the pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def close(self):
         """Close the session"""
-        self.session.close()
+        run_sync(self.aclose())
 
 # Global instance for convenient access
-http_client = APIClient()
\ No newline at end of file
+http_client = APIClient()
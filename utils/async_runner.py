@@ -0,0 +1,37 @@
+"""
+Shared background event loop for running async code from sync services
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use"""
+    global _loop
+
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-runner", daemon=True)
+            thread.start()
+            _loop = loop
+
+    return _loop
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the background loop and wait for its result"""
+    loop = get_loop()
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    # Blocking here would deadlock the loop we are waiting on
+    if running is loop:
+        raise RuntimeError("run_sync() cannot be called from the background loop itself")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
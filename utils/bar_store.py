@@ -0,0 +1,148 @@
+"""
+Persistent daily OHLCV bar store backed by SQLite
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from .market_calendar import AFTERNOON_SESSION, vietnam_now
+
+# HOSE continuous trading ends at 14:45, ATC closes at 15:00 (UTC+7)
+SESSION_CLOSE_HOUR = AFTERNOON_SESSION[1].hour
+
+class BarStore:
+    """Stores daily bars per (symbol, source) and fetches only what is missing"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    symbol TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (symbol, source, date)
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection, commit on success and always close it"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def read(self, symbol: str, source: str, start: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read bars oldest first, optionally from a start date or only the last `limit` bars"""
+        query = "SELECT date, open, high, low, close, volume, fetched_at FROM bars WHERE symbol = ? AND source = ?"
+        params: List[Any] = [symbol, source]
+
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+
+        query += " ORDER BY date DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(row) for row in conn.execute(query, params)]
+
+        rows.reverse()
+        return rows
+
+    def upsert(self, symbol: str, source: str, data) -> int:
+        """Insert or replace bars from a vnstock history DataFrame. Returns rows written."""
+        if data is None or len(data) == 0:
+            return 0
+
+        fetched_at = vietnam_now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        for record in data.to_dict('records'):
+            rows.append((
+                symbol, source, str(record['time'])[:10],
+                record.get('open'), record.get('high'), record.get('low'),
+                record.get('close'), record.get('volume'), fetched_at
+            ))
+
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+        return len(rows)
+
+    def sync(self, symbol: str, source: str, fetch: Callable[[str, str], Any],
+             lookback_days: int = 30, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Bring the stored bars up to date and return them from disk.
+
+        fetch(start, end) is only called for the days after the last closed
+        bar: the first run (or a longer lookback than stored) backfills
+        `lookback_days`, later runs re-fetch the still-open bar and anything
+        newer.
+        """
+        now = vietnam_now()
+        today = now.strftime('%Y-%m-%d')
+        lookback_start = (now - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+        last = self.read(symbol, source, limit=1)
+
+        if not last or self._needs_backfill(symbol, source, lookback_start):
+            start = lookback_start
+        elif self._is_closed(last[0]):
+            start = (datetime.strptime(last[0]['date'], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        else:
+            start = last[0]['date']
+
+        if self._has_trading_day(start, today):
+            self.upsert(symbol, source, fetch(start, today))
+
+        return self.read(symbol, source, limit=limit or lookback_days)
+
+    def _needs_backfill(self, symbol: str, source: str, lookback_start: str) -> bool:
+        """True if stored history starts well after the requested lookback (a longer window was asked for)"""
+        with self._connect() as conn:
+            first = conn.execute(
+                "SELECT MIN(date) FROM bars WHERE symbol = ? AND source = ?", (symbol, source)
+            ).fetchone()[0]
+        # A week of slack covers weekends and holidays at the start of the window
+        slack = (datetime.strptime(lookback_start, '%Y-%m-%d') + timedelta(days=7)).strftime('%Y-%m-%d')
+        return first is not None and first > slack
+
+    @staticmethod
+    def _is_closed(bar: Dict[str, Any]) -> bool:
+        """A bar is final once it was fetched after its session closed"""
+        fetched_at = datetime.strptime(bar['fetched_at'], '%Y-%m-%d %H:%M:%S')
+        session_close = datetime.strptime(bar['date'], '%Y-%m-%d') + timedelta(hours=SESSION_CLOSE_HOUR)
+        return fetched_at >= session_close
+
+    @staticmethod
+    def _has_trading_day(start: str, end: str) -> bool:
+        """True if [start, end] contains a weekday"""
+        day = datetime.strptime(start, '%Y-%m-%d')
+        last = datetime.strptime(end, '%Y-%m-%d')
+        while day <= last:
+            if day.weekday() < 5:
+                return True
+            day += timedelta(days=1)
+        return False
@@ -0,0 +1,98 @@
+"""
+In-memory caching helpers shared across services
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution"""
+
+    class _Call:
+        def __init__(self):
+            self.event = threading.Event()
+            self.value = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, 'SingleFlight._Call'] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run func once for key; concurrent callers wait for and share its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+class TTLCache:
+    """Thread-safe cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float, max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value for ttl seconds"""
+        with self._lock:
+            if self.max_entries and key not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry to make room
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, loading it once if missing or expired"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def load():
+            # Another caller may have filled the entry while we waited
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            loaded = loader()
+            if loaded is not None:
+                self.set(key, loaded)
+            return loaded
+
+        return self._flight.do(key, load)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
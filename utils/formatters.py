@@ -30,6 +30,25 @@ def format_percentage(value: float, include_sign: bool = True) -> str:
     else:
         return f"{value:.2f}%"
 
+# Short labels for indicator fields without a period in their name
+INDICATOR_LABELS = {
+    'rsi': 'RSI', 'macd': 'MACD', 'macd_signal': 'Signal', 'macd_hist': 'Hist',
+    'bb_upper': 'BB+', 'bb_mid': 'BB', 'bb_lower': 'BB-', 'vol_avg': 'AvgVol',
+    'day_open': 'O', 'day_high': 'H', 'day_low': 'L', 'day_volume': 'Vol',
+    'move_5m': '5m%', 'move_15m': '15m%'
+}
+
+def format_indicators(values: dict, fields: list) -> str:
+    """Format selected indicators as ' | RSI 55.2 | SMA20 91.3'; missing ones are skipped"""
+    parts = []
+    for field in fields:
+        if field not in values:
+            continue
+        label = INDICATOR_LABELS.get(field) or field.replace('_', '').upper()
+        value = values[field]
+        parts.append(f"{label} {value:,.0f}" if abs(value) >= 100000 else f"{label} {value:,.1f}")
+    return ''.join(f" | {part}" for part in parts)
+
 def clean_numeric_string(value: str) -> float:
     """Clean numeric string by removing commas and converting to float"""
     if value == 'N/A' or not value:
@@ -0,0 +1,62 @@
+"""
+HOSE trading calendar helpers (all times in UTC+7)
+"""
+from datetime import datetime, time, timedelta
+from typing import Callable, Iterable, Optional, Set
+
+# Continuous trading sessions including ATO/ATC auctions
+MORNING_SESSION = (time(9, 0), time(11, 30))
+AFTERNOON_SESSION = (time(13, 0), time(15, 0))
+
+def vietnam_now() -> datetime:
+    """Current wall-clock time in Vietnam (UTC+7)"""
+    return datetime.utcnow() + timedelta(hours=7)
+
+class MarketCalendar:
+    """Knows when the Vietnamese stock market is open"""
+
+    def __init__(self, holidays: Optional[Iterable[str]] = None):
+        # Exchange holidays as YYYY-MM-DD strings
+        self.holidays: Set[str] = {day.strip() for day in (holidays or []) if day.strip()}
+
+    def is_trading_day(self, now: Optional[datetime] = None) -> bool:
+        """Weekday that is not an exchange holiday"""
+        now = now or vietnam_now()
+        return now.weekday() < 5 and now.strftime('%Y-%m-%d') not in self.holidays
+
+    def has_opened(self, now: Optional[datetime] = None) -> bool:
+        """True once today's session has started on a trading day (today has its own bar)"""
+        now = now or vietnam_now()
+        return self.is_trading_day(now) and now.time() >= MORNING_SESSION[0]
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """True during the morning or afternoon session of a trading day"""
+        now = now or vietnam_now()
+        if not self.is_trading_day(now):
+            return False
+
+        current = now.time()
+        return any(start <= current <= end for start, end in (MORNING_SESSION, AFTERNOON_SESSION))
+
+    def after_close(self, grace_minutes: float = 5) -> Callable[[], bool]:
+        """
+        A check that holds once per trading day, `grace_minutes` after the
+        afternoon close, for a final poll that picks up the ATC prices.
+        """
+        def passed(now: datetime) -> bool:
+            close = datetime.combine(now.date(), AFTERNOON_SESSION[1]) + timedelta(minutes=grace_minutes)
+            return self.is_trading_day(now) and now >= close
+
+        # Started after today's close: the first poll already has the closing prices
+        now = vietnam_now()
+        last = {'day': now.strftime('%Y-%m-%d') if passed(now) else None}
+
+        def due() -> bool:
+            now = vietnam_now()
+            day = now.strftime('%Y-%m-%d')
+            if last['day'] == day or not passed(now):
+                return False
+            last['day'] = day
+            return True
+
+        return due
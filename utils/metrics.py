@@ -0,0 +1,46 @@
+"""
+Prometheus metrics shared across services
+"""
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+FETCH_LATENCY = Histogram(
+    'market_fetch_duration_seconds',
+    'Time spent fetching one data source',
+    ['service'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45)
+)
+
+FETCH_TOTAL = Counter(
+    'market_fetch_total',
+    'Data source fetches by outcome (success, error, timeout)',
+    ['service', 'outcome']
+)
+
+DATA_LAST_SUCCESS = Gauge(
+    'market_data_last_success_timestamp_seconds',
+    'Unix time of the last successful fetch per data source',
+    ['service']
+)
+
+UPSTREAM_RESPONSES = Counter(
+    'market_upstream_responses_total',
+    'HTTP responses from upstream APIs by host and status code',
+    ['host', 'status']
+)
+
+RESPONSE_CACHE_TOTAL = Counter(
+    'market_response_cache_total',
+    'Upstream response cache lookups (hit, revalidated, miss)',
+    ['result']
+)
+
+TELEGRAM_SEND_LATENCY = Histogram(
+    'telegram_send_duration_seconds',
+    'Time to deliver one Telegram message part, including retries',
+    ['outcome'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+)
+
+def render_metrics():
+    """Current metrics in Prometheus text format: (content type, body)"""
+    return CONTENT_TYPE_LATEST, generate_latest()
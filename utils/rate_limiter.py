@@ -0,0 +1,43 @@
+"""
+Token bucket rate limiter shared across worker processes
+"""
+import multiprocessing as mp
+import time
+from typing import Optional
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second with bursts of up to `capacity`.
+
+    The bucket lives in shared memory (two mp.Values behind one lock), so
+    every process it is handed to (e.g. through a pool initializer) draws
+    from the same budget. time.monotonic() is system-wide, so all
+    processes refill against the same clock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, context=None):
+        ctx = context or mp.get_context()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._lock = ctx.Lock()
+        self._tokens = ctx.Value('d', self.capacity, lock=False)
+        self._updated = ctx.Value('d', time.monotonic(), lock=False)
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until `tokens` are available; False if that would take longer than timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                available = min(self.capacity, self._tokens.value + (now - self._updated.value) * self.rate)
+                self._updated.value = now
+                if available >= tokens:
+                    self._tokens.value = available - tokens
+                    return True
+                self._tokens.value = available
+                wait = (tokens - available) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
@@ -0,0 +1,216 @@
+"""
+Disk-backed cache for upstream responses with HTTP revalidation
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from .metrics import RESPONSE_CACHE_TOTAL
+
+# Describe the original transfer, not the decoded body we keep
+HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+class ResponseCache:
+    """
+    Response bodies and their validators in one SQLite file.
+
+    An entry is fresh for the Cache-Control max-age (or Expires) the server
+    sent; without either it gets the soft TTL of its host. Stale entries
+    carrying an ETag or Last-Modified are revalidated with a conditional
+    request instead of being downloaded again. The least recently used
+    entries are evicted once the bodies exceed max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, soft_ttl: float = 30,
+                 host_ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.soft_ttl = soft_ttl
+        self.host_ttls = host_ttls or {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection, commit on success and always close it"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key of a GET request"""
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()), doseq=True)}"
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored entry for key (fresh or not), marking it as recently used"""
+        with self._lock, self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        entry = dict(row)
+        entry['headers'] = json.loads(entry['headers'])
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        return entry['expires_at'] > (time.time() if now is None else now)
+
+    @staticmethod
+    def validators(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def freshness(self, url: str, headers: Iterable[Tuple[str, str]]) -> Optional[float]:
+        """
+        Seconds a response stays fresh, or None if it must not be stored.
+
+        Cache-Control max-age (less Age) wins over Expires; responses
+        without either get the soft TTL of their host.
+        """
+        headers = {name.lower(): value for name, value in headers}
+        directives = {}
+        for part in headers.get('cache-control', '').split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = value.strip('"')
+
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0.0
+        if 'max-age' in directives:
+            try:
+                age = float(headers.get('age', 0))
+            except ValueError:
+                age = 0.0
+            try:
+                return max(0.0, float(directives['max-age']) - age)
+            except ValueError:
+                pass
+        if 'expires' in headers:
+            try:
+                return max(0.0, parsedate_to_datetime(headers['expires']).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return 0.0
+
+        host = urlsplit(url).netloc
+        return self.host_ttls.get(host, self.soft_ttl)
+
+    def store(self, key: str, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes,
+              ttl: Optional[float] = None) -> bool:
+        """Save a response; returns False if its headers forbid storing it"""
+        headers = [(name, value) for name, value in headers if name.lower() not in HOP_HEADERS]
+        if ttl is None:
+            ttl = self.freshness(url, headers)
+            if ttl is None:
+                return False
+
+        lowered = {name.lower(): value for name, value in headers}
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(headers), body, len(body), now, now + ttl,
+                 lowered.get('etag'), lowered.get('last-modified'), now)
+            )
+            self._evict(conn)
+        return True
+
+    def refresh(self, key: str, url: str, headers: Iterable[Tuple[str, str]]):
+        """Extend an entry after a 304 using the freshness of the new headers"""
+        headers = list(headers)
+        ttl = self.freshness(url, headers) or 0.0
+        lowered = {name.lower(): value for name, value in headers}
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now + ttl, now, lowered.get('etag'), lowered.get('last-modified'), key)
+            )
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the bodies fit in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def load_records(self, name: str, ttl: float, loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Soft-TTL cache for sources without HTTP access (e.g. vnstock calls).
+
+        `loader` returns JSON-serializable records; they are reused for ttl
+        seconds, across runs.
+        """
+        key = self.key(name)
+        entry = self.lookup(key)
+        if entry is not None and self.is_fresh(entry):
+            RESPONSE_CACHE_TOTAL.labels('hit').inc()
+            return json.loads(entry['body'])
+
+        RESPONSE_CACHE_TOTAL.labels('miss').inc()
+        records = loader()
+        if records:
+            self.store(key, name, 200, [], json.dumps(records, ensure_ascii=False, default=str).encode('utf-8'),
+                       ttl=ttl)
+        return records
+
+    def load_frame(self, name: str, ttl: float, loader: Callable[[], Any]):
+        """load_records for a function returning a DataFrame"""
+        import pandas as pd
+
+        def records():
+            frame = loader()
+            return [] if frame is None else frame.to_dict('records')
+
+        return pd.DataFrame(self.load_records(name, ttl, records))
@@ -0,0 +1,182 @@
+"""
+Append-only columnar history of collected values in Arrow IPC files
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# One row per value: long format keeps the schema fixed as assets and fields change
+SCHEMA_FIELDS = ('ts', 'asset', 'symbol', 'field', 'value')
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('ts', pa.timestamp('ms', tz='UTC')),
+        ('asset', pa.string()),
+        ('symbol', pa.string()),
+        ('field', pa.string()),
+        ('value', pa.float64()),
+    ])
+
+class SnapshotStore:
+    """
+    Stores every run's values partitioned by UTC date.
+
+    Each append writes a new immutable file under date=YYYY-MM-DD/, so
+    writers never rewrite existing data. Reads memory-map the files of the
+    requested dates only; compact() merges a finished day into one file.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, values: Dict[str, Dict[str, Dict[str, float]]], ts: Optional[float] = None) -> int:
+        """Write one snapshot ({asset: {symbol: {field: value}}}); returns the number of rows"""
+        import pyarrow as pa
+
+        ts = time.time() if ts is None else ts
+        columns = {name: [] for name in SCHEMA_FIELDS}
+
+        for asset, symbols in values.items():
+            for symbol, fields in (symbols or {}).items():
+                for field, value in fields.items():
+                    if value is None:
+                        continue
+                    columns['asset'].append(asset)
+                    columns['symbol'].append(symbol)
+                    columns['field'].append(field)
+                    columns['value'].append(float(value))
+
+        if not columns['value']:
+            return 0
+
+        columns['ts'] = [int(ts * 1000)] * len(columns['value'])
+        table = pa.Table.from_pydict(columns, schema=_schema())
+
+        date = datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+        # Unique even for appends with the same timestamp; names still sort by time
+        name = f"part-{int(ts * 1000):013d}-{uuid.uuid4().hex}.arrow"
+        with self._lock:
+            self._write(os.path.join(self._partition(date), name), table)
+
+        return table.num_rows
+
+    def query(self, asset: Optional[str] = None, symbol: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None,
+              fields: Optional[List[str]] = None):
+        """
+        Rows for an asset/symbol in [start, end) as a pyarrow Table sorted by time.
+
+        Only partitions overlapping the range are opened, and each file is
+        memory-mapped so filtering does not copy whole files into RAM.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        tables = []
+        for path in self._files(start, end):
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+
+            mask = None
+            conditions = []
+            if asset is not None:
+                conditions.append(pc.equal(table['asset'], asset))
+            if symbol is not None:
+                conditions.append(pc.equal(table['symbol'], symbol))
+            if fields:
+                conditions.append(pc.is_in(table['field'], value_set=pa.array(fields)))
+            if start is not None:
+                conditions.append(pc.greater_equal(table['ts'], pa.scalar(_utc(start), type=table.schema.field('ts').type)))
+            if end is not None:
+                conditions.append(pc.less(table['ts'], pa.scalar(_utc(end), type=table.schema.field('ts').type)))
+
+            for condition in conditions:
+                mask = condition if mask is None else pc.and_(mask, condition)
+
+            tables.append(table.filter(mask) if mask is not None else table)
+
+        if not tables:
+            return _schema().empty_table()
+
+        return pa.concat_tables(tables).sort_by('ts')
+
+    def query_frame(self, *args, **kwargs):
+        """Same as query() but returns a pandas DataFrame"""
+        return self.query(*args, **kwargs).to_pandas()
+
+    def compact(self, date: str) -> int:
+        """Merge all files of one (finished) day into a single file; returns rows kept"""
+        import pyarrow as pa
+
+        directory = self._partition(date)
+        with self._lock:
+            parts = sorted(
+                os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.arrow')
+            )
+            if len(parts) <= 1:
+                return 0
+
+            tables = []
+            for path in parts:
+                with pa.memory_map(path, 'r') as source:
+                    tables.append(pa.ipc.open_file(source).read_all())
+            merged = pa.concat_tables(tables).sort_by('ts')
+
+            # Write the merged file first so a crash never loses rows
+            self._write(os.path.join(directory, f"compacted-{int(time.time() * 1000)}.arrow"), merged)
+            for path in parts:
+                os.remove(path)
+
+        return merged.num_rows
+
+    def compact_finished(self) -> int:
+        """Compact every partition before today's (UTC); returns rows rewritten"""
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        rows = 0
+        for entry in sorted(os.listdir(self.root)):
+            if entry.startswith('date=') and entry[len('date='):] < today:
+                rows += self.compact(entry[len('date='):])
+        return rows
+
+    def _partition(self, date: str) -> str:
+        directory = os.path.join(self.root, f"date={date}")
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _files(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        """Data files of every partition overlapping [start, end)"""
+        first = _utc(start).strftime('%Y-%m-%d') if start is not None else None
+        last = _utc(end).strftime('%Y-%m-%d') if end is not None else None
+        files = []
+
+        for entry in sorted(os.listdir(self.root)):
+            if not entry.startswith('date='):
+                continue
+            date = entry[len('date='):]
+            if (first and date < first) or (last and date > last):
+                continue
+            directory = os.path.join(self.root, entry)
+            files.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith('.arrow'))
+
+        return files
+
+    @staticmethod
+    def _write(path: str, table):
+        """Write an IPC file atomically so readers never see a partial file"""
+        import pyarrow as pa
+
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+def _utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)